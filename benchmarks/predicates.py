@@ -0,0 +1,213 @@
+"""Micro-benchmark of the lexer and parser predicate hooks.
+
+The grammar calls back into `JavaScriptBaseLexer` and `JavaScriptBaseParser` on almost every token: the lexer asks
+if a regex literal is possible and tracks strict mode, the parser checks for line terminators at every possible
+automatic semicolon. This script times every hook once per token of a file, both for the current implementation and
+for the previous one, which imported the generated module and rebuilt the token type lists on every call::
+
+    python benchmarks/predicates.py /usr/share/javascript/jquery-ui/jquery-ui.min.js
+"""
+
+import argparse
+import os
+import sys
+import time
+from typing import Callable, List
+
+from antlr4 import CommonTokenStream, FileStream, Lexer, Token
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from jasminesnake.lex.JavaScriptLexer import JavaScriptLexer
+from jasminesnake.lex.JavaScriptParser import JavaScriptParser
+
+
+class LegacyLexer(JavaScriptLexer):
+    """The lexer hooks as they were before the token types were cached."""
+
+    def processStringLiteral(self):
+        from jasminesnake.lex.JavaScriptLexer import JavaScriptLexer
+
+        if not self.lastToken or self.lastToken.type == JavaScriptLexer.OpenBrace:
+            text = self.text
+            if text == '"use strict"' or text == "'use strict'":
+                if self.scopeStrictModes:
+                    self.scopeStrictModes.pop(-1)
+                self.useStrictCurrent = True
+                self.scopeStrictModes.append(self.useStrictCurrent)
+
+    def isRegexPossible(self) -> bool:
+        from jasminesnake.lex.JavaScriptLexer import JavaScriptLexer
+
+        if not self.lastToken:
+            return True
+
+        if self.lastToken.type in [
+            JavaScriptLexer.Identifier,
+            JavaScriptLexer.NullLiteral,
+            JavaScriptLexer.BooleanLiteral,
+            JavaScriptLexer.This,
+            JavaScriptLexer.CloseBracket,
+            JavaScriptLexer.CloseParen,
+            JavaScriptLexer.OctalIntegerLiteral,
+            JavaScriptLexer.DecimalLiteral,
+            JavaScriptLexer.HexIntegerLiteral,
+            JavaScriptLexer.StringLiteral,
+            JavaScriptLexer.PlusPlus,
+            JavaScriptLexer.MinusMinus,
+        ]:
+            return False
+
+        return True
+
+
+class LegacyParser(JavaScriptParser):
+    """The parser hooks as they were before the token types were cached."""
+
+    @staticmethod
+    def parser():
+        from jasminesnake.lex.JavaScriptParser import JavaScriptParser
+
+        return JavaScriptParser
+
+    def notLineTerminator(self) -> bool:
+        JavaScriptParser = self.parser()
+
+        return not self.here(JavaScriptParser.LineTerminator)
+
+    def notOpenBraceAndNotFunction(self) -> bool:
+        JavaScriptParser = self.parser()
+
+        nextTokenType = self._input.LT(1).type
+        return (
+            nextTokenType != JavaScriptParser.OpenBrace
+            and nextTokenType != JavaScriptParser.Function
+        )
+
+    def closeBrace(self) -> bool:
+        JavaScriptParser = self.parser()
+
+        return self._input.LT(1).type == JavaScriptParser.CloseBrace
+
+    def here(self, tokenType: int) -> bool:
+        possibleIndexEosToken = self.getCurrentToken().tokenIndex - 1
+        ahead = self._input.get(possibleIndexEosToken)
+        return (ahead.channel == Lexer.HIDDEN) and (ahead.type == tokenType)
+
+    def lineTerminatorAhead(self) -> bool:
+        JavaScriptParser = self.parser()
+
+        possibleIndexEosToken = self.getCurrentToken().tokenIndex - 1
+        ahead = self._input.get(possibleIndexEosToken)
+
+        if ahead.channel != Lexer.HIDDEN:
+            return False
+
+        if ahead.type == JavaScriptParser.LineTerminator:
+            return True
+
+        if ahead.type == JavaScriptParser.WhiteSpaces:
+            possibleIndexEosToken = self.getCurrentToken().tokenIndex - 2
+            ahead = self._input.get(possibleIndexEosToken)
+
+        text = ahead.text
+        tokenType = ahead.type
+
+        # `str.contains` in the original, which crashed on multi-line comments
+        return (
+            tokenType == JavaScriptParser.MultiLineComment
+            and ("\r" in text or "\n" in text)
+        ) or (tokenType == JavaScriptParser.LineTerminator)
+
+
+def best_of(repeat: int, run: Callable[[], None]) -> float:
+    """Run the function several times and return the shortest time, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def lexer_hooks(lexer: JavaScriptLexer, tokens: List[Token], repeat: int) -> dict:
+    """Time the lexer hooks with the lexer state at every token."""
+
+    def run(hook):
+        def loop():
+            for token in tokens:
+                lexer.lastToken = token
+                lexer.lastTokenType = token.type
+                hook()
+
+        return loop
+
+    # The string literal hook reads the token text, so keep it off the
+    # "use strict" branch which would change the lexer state
+    lexer.text = ""
+    return {
+        "isRegexPossible": best_of(repeat, run(lexer.isRegexPossible)),
+        "processStringLiteral": best_of(repeat, run(lexer.processStringLiteral)),
+    }
+
+
+def parser_hooks(parser: JavaScriptParser, indices: List[int], repeat: int) -> dict:
+    """Time the parser hooks with the parser sitting at every token."""
+    stream = parser._input
+
+    def run(hook):
+        def loop():
+            for index in indices:
+                stream.index = index
+                hook()
+
+        return loop
+
+    return {
+        "notLineTerminator": best_of(repeat, run(parser.notLineTerminator)),
+        "lineTerminatorAhead": best_of(repeat, run(parser.lineTerminatorAhead)),
+        "notOpenBraceAndNotFunction": best_of(
+            repeat, run(parser.notOpenBraceAndNotFunction)
+        ),
+        "closeBrace": best_of(repeat, run(parser.closeBrace)),
+    }
+
+
+def main():
+    args = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    args.add_argument("file", help="JavaScript file to take the tokens from")
+    args.add_argument(
+        "-r", "--repeat", type=int, default=5, help="runs of every hook (default: 5)"
+    )
+    args = args.parse_args()
+
+    lexer = JavaScriptLexer(FileStream(args.file, encoding="utf-8"))
+    stream = CommonTokenStream(lexer)
+    stream.fill()
+    tokens = [t for t in stream.tokens if t.channel == Token.DEFAULT_CHANNEL]
+    # The first token has nothing in front of it, and the hooks are never called there
+    indices = [t.tokenIndex for t in tokens if t.tokenIndex > 0]
+
+    results = {}
+    for name, lexer_class, parser_class in (
+        ("before", LegacyLexer, LegacyParser),
+        ("after", JavaScriptLexer, JavaScriptParser),
+    ):
+        timings = lexer_hooks(lexer_class(lexer.inputStream), tokens, args.repeat)
+        timings.update(parser_hooks(parser_class(stream), indices, args.repeat))
+        results[name] = timings
+
+    count = len(tokens)
+    print("{} tokens on the default channel\n".format(count))
+    print("{:<28}{:>12}{:>12}{:>10}".format("ns/token", "before", "after", "speedup"))
+    for hook, before in results["before"].items():
+        after = results["after"][hook]
+        print(
+            "{:<28}{:>12.1f}{:>12.1f}{:>9.1f}x".format(
+                hook, before * 1e9 / count, after * 1e9 / count, before / after
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
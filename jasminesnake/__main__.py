@@ -3,25 +3,92 @@ So here it is.
 """
 import sys
 import argparse
+import functools
+import json
 import logging
+import os
 import colorama
 import coloredlogs
+from antlr4.error.Errors import ParseCancellationException
 
 from jasminesnake import __version__, __snake__, LOG_LEVELS
-from .js_stream import JSBaseStream, JSStringStream, JSFileStream
-from .lex.ErrorListeners import LogErrorListener
-from .ast import to_ascii_tree, from_parse_tree
+from .ast_cache import ASTCache, DEFAULT_CACHE_DIR
+from . import native
+from .batch import BACKENDS, collect_js_files, parse_many
+from .js_stream import (
+    JSBaseStream,
+    JSStringStream,
+    JSFileStream,
+    ParseMode,
+    ParserSession,
+)
+from .lex import load_dfa_cache, save_dfa_cache
+from .lex.ErrorListeners import JSSyntaxError, LogErrorListener
+from .lex.GrammarProfiler import profile_parser
+from .ast import to_ascii_tree, write_ascii_tree, from_parse_tree
+from .ast import binary as binary_ast
+from .ast import estree
 
 
 def create_argument_parser():
     _arg_parser = argparse.ArgumentParser(
         description="Jasmine Snake, another JS interpreter in Python",
-        epilog="I hope you don't use it, **especially** in production.",
+        epilog="Use `%(prog)s batch --help` to see how to parse many files at once, "
+        "and `%(prog)s warm-up --help` to see how to make a DFA cache. "
+        "I hope you don't use it, **especially** in production.",
     )
 
     _arg_parser.add_argument("--snake", action="store_true", help="print a snake")
     _arg_parser.add_argument(
-        "--ast", choices=["full", "short", "none"], default="none", help="print AST"
+        "--ast",
+        choices=["full", "short", "json", "binary", "none"],
+        default="none",
+        help="print AST. json prints ESTree JSON, binary writes the format of `jasminesnake.ast.binary` to stdout",
+    )
+    _arg_parser.add_argument(
+        "--check",
+        action="store_true",
+        help="only check the syntax without building AST. exits with 1 if there are syntax errors",
+    )
+    _arg_parser.add_argument(
+        "--parse-mode",
+        choices=[mode.value for mode in ParseMode],
+        default=ParseMode.SLL_LL.value,
+        help="parser prediction mode. sll-ll tries fast SLL first and falls back to LL on failure",
+    )
+    _arg_parser.add_argument(
+        "--backend",
+        choices=BACKENDS,
+        default="antlr",
+        help="parser backend. native is a hand-written parser, much faster than antlr, "
+        "but stops on the first syntax error. --check, --cache and --profile-grammar always use antlr",
+    )
+    _arg_parser.add_argument(
+        "--profile-grammar",
+        nargs="?",
+        type=int,
+        const=30,
+        default=None,
+        metavar="ROWS",
+        help="parse the input and print the grammar decisions taking the most prediction time "
+        "(%(const)s by default) instead of AST",
+    )
+    _arg_parser.add_argument(
+        "--cache",
+        action="store_true",
+        help="cache ASTs of input files on disk and reuse them for unchanged files",
+    )
+    _arg_parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=DEFAULT_CACHE_DIR,
+        help="AST cache directory (default: %(default)s)",
+    )
+    _arg_parser.add_argument(
+        "--dfa-cache",
+        type=str,
+        default=os.environ.get("JASMINESNAKE_DFA_CACHE"),
+        help="load lexer/parser DFA states from the file made by `warm-up` (default: $JASMINESNAKE_DFA_CACHE)",
     )
     _arg_parser.add_argument(
         "--verbose",
@@ -40,7 +107,140 @@ def create_argument_parser():
     return _arg_parser
 
 
-def main():
+def create_batch_argument_parser():
+    _arg_parser = argparse.ArgumentParser(
+        prog="jasminesnake batch",
+        description="Parse many JS files in parallel and print a JSON line per file",
+    )
+
+    _arg_parser.add_argument(
+        "--ast",
+        choices=["full", "short", "none"],
+        default="none",
+        help="add AST to the output",
+    )
+    _arg_parser.add_argument(
+        "--parse-mode",
+        choices=[mode.value for mode in ParseMode],
+        default=ParseMode.SLL_LL.value,
+        help="parser prediction mode. sll-ll tries fast SLL first and falls back to LL on failure",
+    )
+    _arg_parser.add_argument(
+        "--backend",
+        choices=BACKENDS,
+        default="antlr",
+        help="parser backend. native is a hand-written parser, much faster than antlr, "
+        "but stops on the first syntax error",
+    )
+    _arg_parser.add_argument(
+        "--workers",
+        "-j",
+        type=int,
+        default=None,
+        help="number of worker processes (default: number of CPUs)",
+    )
+    _arg_parser.add_argument(
+        "--dfa-cache",
+        type=str,
+        default=os.environ.get("JASMINESNAKE_DFA_CACHE"),
+        help="load lexer/parser DFA states from the file made by `warm-up` (default: $JASMINESNAKE_DFA_CACHE)",
+    )
+    _arg_parser.add_argument(
+        "--verbose",
+        "-v",
+        action="count",
+        default=0,
+        help="be more verbose. up to 4 (-vvvv) could be handled, more are ignored",
+    )
+    _arg_parser.add_argument(
+        "paths",
+        type=str,
+        nargs="+",
+        help="JS input files and directories. directories are searched for *.js files recursively",
+    )
+
+    return _arg_parser
+
+
+def batch_main(batch_args):
+    # Init logging
+    log_level = min(batch_args.verbose, 4)  # Ignore verbosity values more than 4
+    coloredlogs.install(
+        level=LOG_LEVELS[log_level]["level"], fmt=LOG_LEVELS[log_level]["format"]
+    )
+
+    postprocess = None
+    if batch_args.ast != "none":
+        postprocess = functools.partial(to_ascii_tree, ast_format=batch_args.ast)
+
+    failed = 0
+    results = parse_many(
+        collect_js_files(batch_args.paths),
+        batch_args.workers,
+        ParseMode(batch_args.parse_mode),
+        postprocess,
+        batch_args.dfa_cache,
+        batch_args.backend,
+    )
+    for result in results:
+        line = {"path": result.path, "ok": result.ok, "error": result.error}
+        if postprocess is not None:
+            line["ast"] = result.value
+        print(json.dumps(line), flush=True)
+        failed += not result.ok
+
+    sys.exit(1 if failed else 0)
+
+
+def create_warm_up_argument_parser():
+    _arg_parser = argparse.ArgumentParser(
+        prog="jasminesnake warm-up",
+        description="Parse JS files and save the DFA states learned by the lexer and the parser, "
+        "so that other runs don't have to learn them again",
+    )
+
+    _arg_parser.add_argument(
+        "--output",
+        "-o",
+        type=str,
+        required=True,
+        help="DFA cache file",
+    )
+    _arg_parser.add_argument(
+        "--verbose",
+        "-v",
+        action="count",
+        default=0,
+        help="be more verbose. up to 4 (-vvvv) could be handled, more are ignored",
+    )
+    _arg_parser.add_argument(
+        "paths",
+        type=str,
+        nargs="+",
+        help="JS input files and directories. directories are searched for *.js files recursively",
+    )
+
+    return _arg_parser
+
+
+def warm_up_main(warm_up_args):
+    from .lex.DFACache import warm_up
+
+    # Init logging
+    log_level = min(warm_up_args.verbose, 4)  # Ignore verbosity values more than 4
+    coloredlogs.install(
+        level=LOG_LEVELS[log_level]["level"], fmt=LOG_LEVELS[log_level]["format"]
+    )
+
+    files = collect_js_files(warm_up_args.paths)
+    warm_up(files)
+    save_dfa_cache(warm_up_args.output)
+    logging.info("Saved DFA cache of %d file(s) to %s", len(files), warm_up_args.output)
+
+    sys.exit(0)
+
+
+def interpreter_main(args):
     # Init colorama
     colorama.init()
 
@@ -61,25 +261,84 @@ def main():
             + colorama.Fore.RESET
         )
 
+    parse_mode = ParseMode(args.parse_mode)
+
+    if args.dfa_cache is not None:
+        load_dfa_cache(args.dfa_cache)
+
     # Read JS code from file or stdin
     if args.infile is not None:
         stream: JSBaseStream
 
-        if args.infile == "-":
-            input_str = sys.stdin.read()
-            stream = JSStringStream(input_str)
+        if args.profile_grammar is not None:
+            session = ParserSession(LogErrorListener(), parse_mode)
+            profile = profile_parser(session.parser)
+            try:
+                if args.infile == "-":
+                    session.parse_string(sys.stdin.read())
+                else:
+                    session.parse_file(args.infile)
+            except ParseCancellationException:  # Raised by LogErrorListener
+                sys.exit(1)
+
+            logging.info("Parsed in %s stage", session.parse_stage.value)
+            print(profile.report(args.profile_grammar))
+            sys.exit(0)
+
+        if args.check:
+            if args.infile == "-":
+                stream = JSStringStream(
+                    sys.stdin.read(), LogErrorListener(), parse_mode
+                )
+            else:
+                stream = JSFileStream(args.infile, LogErrorListener(), parse_mode)
+
+            try:
+                valid = stream.check()
+            except ParseCancellationException:  # Raised by LogErrorListener
+                valid = False
+
+            logging.info("Syntax is %s", "valid" if valid else "invalid")
+            sys.exit(0 if valid else 1)
+
+        if args.infile != "-" and args.cache:
+            cache = ASTCache(args.cache_dir)
+            ast_tree = cache.parse_file(args.infile, LogErrorListener(), parse_mode)
+            logging.info("AST cache: %d hit(s), %d miss(es)", cache.hits, cache.misses)
+
+        elif args.backend == "native":
+            try:
+                if args.infile == "-":
+                    ast_tree = native.parse(sys.stdin.read())
+                else:
+                    ast_tree = native.parse_file(args.infile)
+            except JSSyntaxError as e:
+                logging.critical("SyntaxError: %s", e)
+                sys.exit(1)
 
         else:
-            stream = JSFileStream(args.infile, LogErrorListener())
+            if args.infile == "-":
+                input_str = sys.stdin.read()
+                stream = JSStringStream(input_str, parse_mode=parse_mode)
+
+            else:
+                stream = JSFileStream(args.infile, LogErrorListener(), parse_mode)
 
-        tree = stream.parse()
+            tree = stream.parse()
+            logging.info("Parsed in %s stage", stream.parse_stage.value)
 
-        ast_tree = from_parse_tree(tree)
+            ast_tree = from_parse_tree(tree)
 
         logging.info("Got an AST!\n")
-        if args.ast != "none":
-            ascii_ast = to_ascii_tree(ast_tree, ast_format=args.ast)
-            print(ascii_ast)
+        if args.ast == "binary":
+            sys.stdout.buffer.write(binary_ast.dumps(ast_tree))
+            sys.stdout.flush()
+        elif args.ast == "json":
+            estree.dump(ast_tree, sys.stdout)
+            print()
+        elif args.ast != "none":
+            write_ascii_tree(ast_tree, sys.stdout, ast_format=args.ast)
+            print()
 
         # TODO: run logic
         sys.exit(0)
@@ -92,14 +351,16 @@ def main():
     )
     print()
 
+    # The lexer and the parser are reused for every line
+    session = ParserSession(LogErrorListener(), parse_mode)
+
     try:
         while True:
             input_str = input("> ")
             logging.debug("Got input %s", input_str)
 
-            stream = JSStringStream(input_str, LogErrorListener())
-            tree = stream.parse()
-            logging.debug("Got tree %s", tree.toStringTree(stream.parser.ruleNames))
+            tree = session.parse_string(input_str)
+            logging.debug("Got tree %s", tree.toStringTree(session.parser.ruleNames))
 
             ast_tree = from_parse_tree(tree)
             ascii_ast = to_ascii_tree(ast_tree)
@@ -112,7 +373,22 @@ def main():
         sys.exit(0)
 
 
+def main(argv=None):
+    """Run the command line interface, also the entry point of the `jasminesnake` script.
+
+    Args:
+        argv: The command line arguments without the program name. Uses `sys.argv` if not set or set to None.
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+
+    if argv[:1] == ["batch"]:
+        batch_main(create_batch_argument_parser().parse_args(argv[1:]))
+    if argv[:1] == ["warm-up"]:
+        warm_up_main(create_warm_up_argument_parser().parse_args(argv[1:]))
+
+    interpreter_main(create_argument_parser().parse_args(argv))
+
+
 if __name__ == "__main__":
-    arg_parser = create_argument_parser()
-    args = arg_parser.parse_args()
     main()
@@ -1,40 +1,58 @@
 """AST module."""
 
+import io
 from enum import Enum
-from typing import Union
-from antlr4 import ParseTreeWalker
+from typing import Optional, TextIO, Union
 
 import jasminesnake.lex.JavaScriptParser as Parser
 from . import nodes
-from .parse_tree_listeners import ASTListener
+from .builder import ASTBuilder
+from .index import ASTIndex
 
 JSP = Parser.JavaScriptParser
 
 
-def from_parse_tree(tree: JSP.ProgramContext) -> nodes.Program:
+def from_parse_tree(
+    tree: JSP.ProgramContext, index: Optional[ASTIndex] = None
+) -> nodes.Program:
     """Generate AST from ANTLR parse tree.
 
     Args:
         tree (JSP.ProgramContext): ANTLR parse tree.
+        index (Optional[ASTIndex]): If given, the nodes are added to the index as they're built.
 
     Returns:
         `Program` AST node, which is the root node.
     """
-    ast_listener = ASTListener()
-    ParseTreeWalker.DEFAULT.walk(ast_listener, tree)
-    return ast_listener.program_node
+    return ASTBuilder(index=index).build(tree)
 
 
-def to_ascii_tree(
+_FLUSH_LINES = 4096
+"""Number of lines buffered by `write_ascii_tree` before writing them to the stream."""
+
+
+def write_ascii_tree(
     node: Union[nodes.Position, nodes.SourceLocation, nodes.Node],
+    file: TextIO,
     name_prefix: str = "",
     nesting_lvl: int = 0,
     ast_format: str = "full",
 ):
+    """Write the ASCII tree of the node to the text stream as it's walked.
+
+    The lines are written in batches, so the memory used doesn't depend on the tree size.
+
+    Args:
+        node: The node to dump.
+        file (TextIO): The stream, e.g. `sys.stdout`.
+        name_prefix (str): The name of the node, printed before its value.
+        nesting_lvl (int): The nesting level of the node.
+        ast_format (str): ``full`` or ``short``, which skips ``loc`` and ``type`` fields.
+    """
     if nesting_lvl < 0:
         raise ValueError("Nesting level can't be below 0")
 
-    NODE_BLACKLIST = ["loc", "type"] if ast_format == "short" else []
+    NODE_BLACKLIST = ("loc", "type") if ast_format == "short" else ()
 
     FORK = "+"
     VERTICAL = "|"
@@ -43,34 +61,64 @@ def to_ascii_tree(
     SUBENTRY_PREFIX = f"{FORK}{HORIZONTAL}{HORIZONTAL} "
     NESTED_PREFIX = f"{VERTICAL}   "
 
-    value = str(node) if not isinstance(node, list) else ""
-    children = None
-
-    if isinstance(node, Enum):
-        value = str(node.value)
-
-    if isinstance(node, list):
-        children = [(index, val) for index, val in enumerate(node)]
+    # Line prefixes by nesting level, built once per level
+    indents = [""]
+
+    lines = []
+    # Nodes are dumped in pre-order using an explicit stack, so deeply nested trees don't hit the recursion limit
+    stack = [(node, name_prefix, nesting_lvl)]
+    while stack:
+        node, name_prefix, nesting_lvl = stack.pop()
+
+        children = None
+        if isinstance(node, list):
+            value = ""
+            children = enumerate(node)
+        elif isinstance(node, Enum):
+            value = str(node.value)
+        else:
+            value = str(node)
+            if hasattr(node, "fields"):
+                children = node.fields.items()
+
+        while len(indents) <= nesting_lvl:
+            indents.append(NESTED_PREFIX * (len(indents) - 1) + SUBENTRY_PREFIX)
+
+        if value and name_prefix:
+            lines.append(f"{indents[nesting_lvl]}{name_prefix} {value}\n")
+        else:
+            lines.append(f"{indents[nesting_lvl]}{name_prefix}{value}\n")
+
+        if children is not None:
+            children = [
+                (child_value, f"{child_name}:", nesting_lvl + 1)
+                for child_name, child_value in children
+                if child_name not in NODE_BLACKLIST
+            ]
+            children.reverse()
+            stack += children
+
+        if len(lines) >= _FLUSH_LINES:
+            file.write("".join(lines))
+            lines.clear()
+
+    file.write("".join(lines))
 
-    if hasattr(node, "fields"):
-        children = [(k, node.fields[k]) for k in node.fields.keys()]
 
-    result = f"{NESTED_PREFIX * (nesting_lvl - 1)}{SUBENTRY_PREFIX * (nesting_lvl > 0)}"
-    result += f"{name_prefix + ' '*(value!='' and name_prefix!='')}{value}\n"
-
-    if children is not None:
-        for (child_name, child_value) in children:
-            if child_name not in NODE_BLACKLIST:
-                result += to_ascii_tree(
-                    child_value,
-                    f"{child_name}:",
-                    nesting_lvl + 1,
-                    ast_format=ast_format,
-                )
-
-        # result += "\n"
+def to_ascii_tree(
+    node: Union[nodes.Position, nodes.SourceLocation, nodes.Node],
+    name_prefix: str = "",
+    nesting_lvl: int = 0,
+    ast_format: str = "full",
+) -> str:
+    """Get the ASCII tree of the node.
 
-    return result
+    See Also:
+        write_ascii_tree
+    """
+    file = io.StringIO()
+    write_ascii_tree(node, file, name_prefix, nesting_lvl, ast_format)
+    return file.getvalue()
 
 
 # Delete temporary imports
@@ -0,0 +1,470 @@
+"""Compact binary AST format.
+
+The format is meant for passing ASTs between processes and pipeline stages: it's several times smaller and faster to
+produce than `to_ascii_tree` text, and it can be loaded back.
+
+A file consists of a fixed-size header and four sections::
+
+    header   magic, format version, flags, offsets of the sections (u64 LE)
+    strings  varint count, then varint length + UTF-8 bytes of every interned string
+    kinds    varint count, then varint class name + varint `type` of every node kind (string indices)
+    body     the `Program` node
+    index    u64 LE offsets of the top-level statements in the body
+
+Nodes are written in pre-order: varint kind, the location if the file has locations, then the fields in the field
+order of the node class, excluding `type` and `loc`. A field value is a tag byte followed by its payload: a nested
+node, a list (varint length, then the values), a string or an enum (string indices), a number (zigzag varint for
+`int`, IEEE 754 double for `float`), or nothing (for `None` and booleans).
+
+`BinaryASTReader` reads the header, the string table and the kind table only. The statement index lets it decode
+top-level statements one by one straight from a memory-mapped file, so a single statement can be read without decoding
+the whole file.
+"""
+
+import mmap
+import struct
+from enum import Enum
+from typing import Any, BinaryIO, Dict, List, Optional, Tuple, Union
+
+from . import nodes
+
+MAGIC = b"JSAST"
+"""The magic bytes at the start of the file."""
+
+FORMAT_VERSION = 1
+"""The version of the binary AST format."""
+
+_HEADER = struct.Struct("<5sBBx4Q")
+_OFFSET = struct.Struct("<Q")
+_DOUBLE = struct.Struct("<d")
+
+_FLAG_LOCATIONS = 0x01
+
+_TAG_NONE = 0
+_TAG_FALSE = 1
+_TAG_TRUE = 2
+_TAG_NODE = 3
+_TAG_LIST = 4
+_TAG_STRING = 5
+_TAG_INT = 6
+_TAG_FLOAT = 7
+_TAG_ENUM = 8
+
+_NO_FIELDS = ("type", "loc")
+"""Fields stored in the node header."""
+
+_ENUMS: Dict[str, type] = {
+    name: value
+    for name, value in vars(nodes).items()
+    if isinstance(value, type) and issubclass(value, Enum) and value is not Enum
+}
+"""Enum classes that can be loaded, by name."""
+
+_OWN_ATTRS: Dict[type, Tuple[str, ...]] = {}
+
+
+def _own_attrs(cls: type) -> Tuple[str, ...]:
+    attrs = _OWN_ATTRS.get(cls)
+    if attrs is None:
+        attrs = _OWN_ATTRS[cls] = tuple(
+            attr for name, attr in cls._field_attrs.items() if name not in _NO_FIELDS
+        )
+    return attrs
+
+
+def _write_varint(out: bytearray, value: int):
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+class _Encoder:
+    def __init__(self, locations: bool):
+        self.locations = locations
+        self.strings: Dict[str, int] = {}
+        self.kinds: Dict[Tuple[type, str], int] = {}
+        self.body = bytearray()
+
+    def string(self, value: str) -> int:
+        index = self.strings.get(value)
+        if index is None:
+            index = self.strings[value] = len(self.strings)
+        return index
+
+    def node_header(self, node: nodes.Node):
+        out = self.body
+
+        key = (type(node), node.type)
+        kind = self.kinds.get(key)
+        if kind is None:
+            kind = self.kinds[key] = len(self.kinds)
+        _write_varint(out, kind)
+
+        if self.locations:
+            loc = node.loc
+            if loc is None:
+                out.append(0)
+            else:
+                start, end = loc.start, loc.end
+                _write_varint(out, start.line)
+                _write_varint(
+                    out, 0 if loc.source is None else self.string(loc.source) + 1
+                )
+                _write_varint(out, start.column)
+                _write_varint(out, end.line)
+                _write_varint(out, end.column)
+
+    def value(self, value):
+        """Write a value and everything nested in it."""
+        out = self.body
+
+        # Pre-order with an explicit stack, so deeply nested trees don't hit the recursion limit
+        stack = [value]
+        while stack:
+            value = stack.pop()
+            if isinstance(value, nodes.Node):
+                out.append(_TAG_NODE)
+                self.node_header(value)
+                stack.extend(
+                    getattr(value, attr) for attr in reversed(_own_attrs(type(value)))
+                )
+            elif isinstance(value, list):
+                out.append(_TAG_LIST)
+                _write_varint(out, len(value))
+                stack.extend(reversed(value))
+            elif value is None:
+                out.append(_TAG_NONE)
+            elif value is True:
+                out.append(_TAG_TRUE)
+            elif value is False:
+                out.append(_TAG_FALSE)
+            elif isinstance(value, str):
+                out.append(_TAG_STRING)
+                _write_varint(out, self.string(value))
+            elif isinstance(value, Enum):
+                out.append(_TAG_ENUM)
+                _write_varint(out, self.string(type(value).__name__))
+                _write_varint(out, self.string(value.value))
+            elif isinstance(value, int):
+                out.append(_TAG_INT)
+                _write_varint(out, value << 1 if value >= 0 else (-value << 1) - 1)
+            elif isinstance(value, float):
+                out.append(_TAG_FLOAT)
+                out += _DOUBLE.pack(value)
+            else:
+                raise TypeError(f"Can't serialize {type(value).__name__}")
+
+
+def dumps(program: nodes.Program, locations: bool = True) -> bytes:
+    """Serialize the AST to the binary format.
+
+    Args:
+        program (nodes.Program): The root node.
+        locations (bool): Whether to store the node locations.
+
+    Returns:
+        The serialized AST.
+    """
+    encoder = _Encoder(locations)
+
+    # The program node is written by hand to record the offsets of the statements
+    statements = []
+    encoder.body.append(_TAG_NODE)
+    encoder.node_header(program)
+    for attr in _own_attrs(type(program)):
+        if attr != "body":
+            encoder.value(getattr(program, attr))
+            continue
+
+        encoder.body.append(_TAG_LIST)
+        _write_varint(encoder.body, len(program.body))
+        for statement in program.body:
+            statements.append(len(encoder.body))
+            encoder.value(statement)
+
+    kinds = bytearray()
+    _write_varint(kinds, len(encoder.kinds))
+    for cls, node_type in encoder.kinds:
+        _write_varint(kinds, encoder.string(cls.__name__))
+        _write_varint(kinds, encoder.string(node_type))
+
+    strings = bytearray()  # After the kinds, which add strings too
+    _write_varint(strings, len(encoder.strings))
+    for string in encoder.strings:
+        data = string.encode("utf-8", "surrogatepass")
+        _write_varint(strings, len(data))
+        strings += data
+
+    strings_offset = _HEADER.size
+    kinds_offset = strings_offset + len(strings)
+    body_offset = kinds_offset + len(kinds)
+    index_offset = body_offset + len(encoder.body)
+    header = _HEADER.pack(
+        MAGIC,
+        FORMAT_VERSION,
+        _FLAG_LOCATIONS if locations else 0,
+        strings_offset,
+        kinds_offset,
+        body_offset,
+        index_offset,
+    )
+    index = b"".join(_OFFSET.pack(offset) for offset in statements)
+
+    return b"".join((header, strings, kinds, encoder.body, index))
+
+
+def dump(program: nodes.Program, file: BinaryIO, locations: bool = True):
+    """Serialize the AST to the binary format and write it to the file.
+
+    Args:
+        program (nodes.Program): The root node.
+        file (BinaryIO): The file opened in binary mode.
+        locations (bool): Whether to store the node locations.
+    """
+    file.write(dumps(program, locations))
+
+
+class BinaryASTReader:
+    """Reader of the binary AST format.
+
+    Only the header and the string and kind tables are decoded on creation. The nodes are decoded on demand.
+    """
+
+    def __init__(self, buffer: Union[bytes, bytearray, memoryview, mmap.mmap]):
+        """Open a serialized AST.
+
+        Args:
+            buffer: The serialized AST. Any bytes-like object, e.g. `mmap.mmap`.
+        """
+        self._buffer = memoryview(buffer)
+        self._mmap: Optional[mmap.mmap] = None
+
+        if len(self._buffer) < _HEADER.size:
+            raise ValueError("Not a binary AST: the file is too short")
+
+        magic, version, flags, *offsets = _HEADER.unpack_from(self._buffer)
+        if magic != MAGIC:
+            raise ValueError("Not a binary AST: wrong magic bytes")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported binary AST format version {version}")
+        if not all(_HEADER.size <= o <= len(self._buffer) for o in offsets):
+            raise ValueError("Corrupted binary AST: section offsets out of bounds")
+
+        self.locations = bool(flags & _FLAG_LOCATIONS)
+        strings_offset, kinds_offset, self._body_offset, self._index_offset = offsets
+
+        pos = strings_offset
+        count, pos = self._varint(pos)
+        self._strings: List[str] = []
+        for _ in range(count):
+            length, pos = self._varint(pos)
+            data = self._buffer[pos : pos + length]
+            self._strings.append(str(data, "utf-8", "surrogatepass"))
+            pos += length
+
+        pos = kinds_offset
+        count, pos = self._varint(pos)
+        self._kinds: List[Tuple[type, str]] = []
+        for _ in range(count):
+            name, pos = self._varint(pos)
+            node_type, pos = self._varint(pos)
+            cls = getattr(nodes, self._strings[name], None)
+            if not (isinstance(cls, type) and issubclass(cls, nodes.Node)):
+                raise ValueError(f"Unknown node class {self._strings[name]}")
+            self._kinds.append((cls, self._strings[node_type]))
+
+    @classmethod
+    def open(cls, path: str) -> "BinaryASTReader":
+        """Open a serialized AST file using a memory mapping.
+
+        Args:
+            path (str): The path to the file.
+
+        Returns:
+            The reader. Call `close` to release the mapping.
+        """
+        with open(path, "rb") as file:
+            buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            reader = cls(buffer)
+        except ValueError:
+            buffer.close()
+            raise
+        reader._mmap = buffer
+        return reader
+
+    def close(self):
+        """Release the memory mapping. Nodes can't be read afterwards."""
+        self._buffer.release()
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __len__(self):
+        """The number of top-level statements."""
+        return (len(self._buffer) - self._index_offset) // _OFFSET.size
+
+    def statement(self, index: int) -> Union[nodes.Statement, nodes.Directive]:
+        """Decode a top-level statement.
+
+        Args:
+            index (int): The statement index.
+
+        Returns:
+            The statement node.
+        """
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+
+        (offset,) = _OFFSET.unpack_from(
+            self._buffer, self._index_offset + index * _OFFSET.size
+        )
+        return self._value(self._body_offset + offset)
+
+    def program(self) -> nodes.Program:
+        """Decode the whole AST.
+
+        Returns:
+            `Program` AST node, which is the root node.
+        """
+        return self._value(self._body_offset)
+
+    def _varint(self, pos: int) -> Tuple[int, int]:
+        buffer = self._buffer
+        byte = buffer[pos]
+        if byte < 0x80:  # Most of the values fit into a byte
+            return byte, pos + 1
+
+        result = shift = 0
+        while True:
+            byte = buffer[pos]
+            pos += 1
+            result |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return result, pos
+            shift += 7
+
+    def _value(self, pos: int) -> Any:
+        """Decode a value and everything nested in it."""
+        buffer = self._buffer
+        varint = self._varint
+        strings = self._strings
+
+        # Nodes and lists being filled: [node, attributes, next attribute] or [list, length]
+        stack: List[list] = []
+        root = None
+        while True:
+            tag = buffer[pos]
+            pos += 1
+
+            frame = None
+            if tag == _TAG_NODE:
+                kind, pos = varint(pos)
+                cls, node_type = self._kinds[kind]
+                value = cls.__new__(cls)
+                value.type = node_type
+                value.loc, pos = self._loc(pos)
+                attrs = _own_attrs(cls)
+                if attrs:
+                    frame = [value, attrs, 0]
+            elif tag == _TAG_LIST:
+                length, pos = varint(pos)
+                value = []
+                if length:
+                    frame = [value, length]
+            elif tag == _TAG_NONE:
+                value = None
+            elif tag == _TAG_TRUE:
+                value = True
+            elif tag == _TAG_FALSE:
+                value = False
+            elif tag == _TAG_STRING:
+                index, pos = varint(pos)
+                value = strings[index]
+            elif tag == _TAG_ENUM:
+                enum, pos = varint(pos)
+                index, pos = varint(pos)
+                value = _ENUMS[strings[enum]](strings[index])
+            elif tag == _TAG_INT:
+                zigzag, pos = varint(pos)
+                value = zigzag >> 1 if not zigzag & 1 else -((zigzag + 1) >> 1)
+            elif tag == _TAG_FLOAT:
+                (value,) = _DOUBLE.unpack_from(buffer, pos)
+                pos += _DOUBLE.size
+            else:
+                raise ValueError(
+                    f"Corrupted binary AST: unknown tag {tag} at {pos - 1}"
+                )
+
+            # Put the value into its parent, dropping the completed parents
+            if stack:
+                parent = stack[-1]
+                if len(parent) == 3:
+                    setattr(parent[0], parent[1][parent[2]], value)
+                    parent[2] += 1
+                    done = parent[2] == len(parent[1])
+                else:
+                    parent[0].append(value)
+                    done = len(parent[0]) == parent[1]
+                if done:
+                    stack.pop()
+            else:
+                root = value
+
+            if frame is not None:
+                stack.append(frame)
+            elif not stack:
+                return root
+
+    def _loc(self, pos: int) -> Tuple[Optional[nodes.SourceLocation], int]:
+        if not self.locations:
+            return None, pos
+
+        start_line, pos = self._varint(pos)
+        if start_line == 0:
+            return None, pos
+
+        source, pos = self._varint(pos)
+        start_column, pos = self._varint(pos)
+        end_line, pos = self._varint(pos)
+        end_column, pos = self._varint(pos)
+        return (
+            nodes.SourceLocation(
+                None if source == 0 else self._strings[source - 1],
+                nodes.Position(start_line, start_column),
+                nodes.Position(end_line, end_column),
+            ),
+            pos,
+        )
+
+
+def loads(data: bytes) -> nodes.Program:
+    """Deserialize an AST.
+
+    Args:
+        data (bytes): The serialized AST.
+
+    Returns:
+        `Program` AST node, which is the root node.
+    """
+    return BinaryASTReader(data).program()
+
+
+def load(file: BinaryIO) -> nodes.Program:
+    """Deserialize an AST read from the file.
+
+    Args:
+        file (BinaryIO): The file opened in binary mode.
+
+    Returns:
+        `Program` AST node, which is the root node.
+    """
+    return loads(file.read())
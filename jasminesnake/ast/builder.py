@@ -0,0 +1,490 @@
+"""AST builder.
+
+Walks the ANTLR parse tree once and builds `nodes.*` objects. Every parse tree context class is mapped to the method
+handling it in a single dispatch table, so visiting a node costs one dictionary lookup instead of creating a listener
+object and going through `enterRule`.
+
+Handlers of nodes with children are generators: they yield child contexts and get the built child nodes back.
+`ASTBuilder.visit` drives them with an explicit stack, so deeply nested input (e.g. long `a + b + c + ...` chains
+in generated code) doesn't hit the recursion limit.
+
+Todo:
+    * Fill `source` field in SourceLocation by passing the source name to `LineTable`.
+    * Compare `SourceLocation` creation behavior with the one in Acorn/ESPrima
+"""
+
+import inspect
+import logging
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+import antlr4.ParserRuleContext
+
+from ..lex.JavaScriptParser import JavaScriptParser
+
+from . import nodes
+from .index import ASTIndex
+from .lines import LineTable
+
+JSP = JavaScriptParser
+
+
+def _get_source_location(
+    ctx: antlr4.ParserRuleContext, lines: LineTable
+) -> nodes.SourceLocation:
+    """Internal function to obtain `SourceObject` from parser context."""
+    return nodes.SourceLocation.from_tokens(lines, ctx.start, ctx.stop)
+
+
+_T = TypeVar("_T")
+
+_Builds = Generator[antlr4.ParserRuleContext, Any, _T]
+"""A handler building AST node of type `_T`: it yields child contexts and receives their AST nodes in return."""
+
+_DISPATCH: Dict[type, Tuple[Callable[["ASTBuilder", Any], Any], bool]] = {}
+"""Parse tree context class -> `ASTBuilder` method building its AST node and whether it's a generator."""
+
+
+def _visits(*ctx_types: type):
+    """Register the decorated method in the dispatch table for the context classes."""
+
+    def decorator(method):
+        for ctx_type in ctx_types:
+            _DISPATCH[ctx_type] = (method, inspect.isgeneratorfunction(method))
+        return method
+
+    return decorator
+
+
+_UNARY_EXPRESSIONS = {
+    JSP.PostIncrementExpressionContext: nodes.PostIncrementExpression,
+    JSP.PostDecreaseExpressionContext: nodes.PostDecrementExpression,
+    JSP.DeleteExpressionContext: nodes.DeleteExpression,
+    JSP.VoidExpressionContext: nodes.VoidExpression,
+    JSP.TypeofExpressionContext: nodes.TypeofExpression,
+    JSP.PreIncrementExpressionContext: nodes.PreIncrementExpression,
+    JSP.PreDecreaseExpressionContext: nodes.PreDecrementExpression,
+    JSP.UnaryPlusExpressionContext: nodes.UnaryPlusExpression,
+    JSP.UnaryMinusExpressionContext: nodes.UnaryMinusExpression,
+    JSP.BitNotExpressionContext: nodes.UnaryBitNotExpression,
+    JSP.NotExpressionContext: nodes.UnaryLogicNotExpression,
+}
+
+_BINARY_OPERATORS = {
+    JSP.Multiply: nodes.MulArithmeticExpression,
+    JSP.Divide: nodes.DivArithmeticExpression,
+    JSP.Modulus: nodes.ModArithmeticExpression,
+    JSP.Plus: nodes.AddArithmeticExpression,
+    JSP.Minus: nodes.SubArithmeticExpression,
+    JSP.LeftShiftArithmetic: nodes.LeftBitShiftExpression,
+    JSP.RightShiftArithmetic: nodes.RightBitShiftExpression,
+    JSP.RightShiftLogical: nodes.LogicRightBitShiftExpression,
+    JSP.LessThan: nodes.LowerThanRelationExpression,
+    JSP.LessThanEquals: nodes.LowerThanEqualRelationExpression,
+    JSP.MoreThan: nodes.GreaterThanRelationExpression,
+    JSP.GreaterThanEquals: nodes.GreaterThanEqualRelationExpression,
+    JSP.Equals_: nodes.EqualityExpression,
+    JSP.NotEquals: nodes.NotEqualityExpression,
+    JSP.IdentityEquals: nodes.IdentityEqualityExpression,
+    JSP.IdentityNotEquals: nodes.NotIdentityEqualityExpression,
+}
+"""Operator token type -> binary expression node class."""
+
+_ASSIGNMENT_OPERATORS = {
+    JSP.MultiplyAssign: nodes.AssignmentOperator.MUL,
+    JSP.DivideAssign: nodes.AssignmentOperator.DIV,
+    JSP.ModulusAssign: nodes.AssignmentOperator.MOD,
+    JSP.PlusAssign: nodes.AssignmentOperator.ADD,
+    JSP.MinusAssign: nodes.AssignmentOperator.SUB,
+    JSP.LeftShiftArithmeticAssign: nodes.AssignmentOperator.SHL,
+    JSP.RightShiftArithmeticAssign: nodes.AssignmentOperator.SHR,
+    JSP.RightShiftLogicalAssign: nodes.AssignmentOperator.SHR_LOGIC,
+    JSP.BitAndAssign: nodes.AssignmentOperator.AND,
+    JSP.BitXorAssign: nodes.AssignmentOperator.XOR,
+    JSP.BitOrAssign: nodes.AssignmentOperator.OR,
+    JSP.PowerAssign: nodes.AssignmentOperator.POW,
+}
+"""Operator token type -> assignment operator."""
+
+_NOT_IMPLEMENTED = {
+    JSP.FunctionExpressionContext: "FunctionExpression",
+    JSP.ClassExpressionContext: "ClassExpression",
+    JSP.MemberIndexExpressionContext: "MemberIndexExpression",
+    JSP.MemberDotExpressionContext: "MemberDotExpression",
+    JSP.ArgumentsExpressionContext: "ArgumentsExpression",
+    JSP.NewExpressionContext: "NewExpression",
+    JSP.MetaExpressionContext: "MetaExpression",
+    JSP.CoalesceExpressionContext: "CoalesceExpression",
+    JSP.InExpressionContext: "InExpression",
+    JSP.BitAndExpressionContext: "BitAndExpression",
+    JSP.BitOrExpressionContext: "BitOrExpression",
+    JSP.BitXOrExpressionContext: "BitXOrExpression",
+    JSP.LogicalAndExpressionContext: "LogicalAndExpression",
+    JSP.LogicalOrExpressionContext: "LogicalOrExpression",
+    JSP.TernaryExpressionContext: "TernaryExpression",
+    JSP.ImportExpressionContext: "ImportExpression",
+    JSP.ObjectLiteralExpressionContext: "ObjectLiteralExpression",
+    JSP.BigintLiteralContext: "Bigint literals",
+    JSP.IfStatementContext: "IfStatement",
+    JSP.FunctionDeclarationContext: "FunctionDeclaration",
+    JSP.DoStatementContext: "DoWhileStatement",
+    JSP.WhileStatementContext: "WhileStatement",
+    JSP.ForStatementContext: "ForStatement",
+    JSP.ForInStatementContext: "ForInStatement",
+    JSP.ContinueStatementContext: "ContinueStatement",
+    JSP.BreakStatementContext: "BreakStatement",
+    JSP.ReturnStatementContext: "ReturnStatement",
+    JSP.ImportStatementContext: "ImportStatement",
+    JSP.ExportDeclarationContext: "ExportDeclaration",
+    JSP.ExportDefaultDeclarationContext: "ExportDefaultDeclaration",
+    JSP.ClassDeclarationContext: "ClassDeclaration",
+}
+"""Parse tree context class -> name of the feature which is not supported yet."""
+
+
+class ASTBuilder:
+    """AST builder.
+
+    Use `ASTBuilder(source_type).build(tree)` to get the `Program` node.
+    """
+
+    _source_type: nodes.SourceTypeLiteral
+    _lines: Optional[LineTable]
+    _index: Optional[ASTIndex]
+
+    def __init__(
+        self,
+        source_type: nodes.SourceTypeLiteral = "script",
+        index: Optional[ASTIndex] = None,
+    ):
+        """AST builder constructor.
+
+        Args:
+            source_type (nodes.SourceTypeLiteral): source type. Could be `script` or `module`. Set to
+                `script` by default.
+            index (Optional[ASTIndex]): the index to add the built nodes to.
+        """
+        self._source_type = source_type
+        self._stream = None
+        self._lines = None
+        self._index = index
+
+    def build(self, ctx: JSP.ProgramContext) -> nodes.Program:
+        """Build the AST.
+
+        Args:
+            ctx (JSP.ProgramContext): ANTLR parse tree.
+
+        Returns:
+            `Program` AST node, which is the root node.
+        """
+        logging.debug("JS source type: %s", self._source_type)
+        self._index_lines(ctx)
+
+        hashbang = ctx.HashBangLine()
+        if hashbang is not None:
+            hashbang_exec = hashbang.getText()[2:]
+            logging.debug('Found a hashbang "%s"', hashbang_exec)
+            # TODO treat it somehow
+
+        elems = [self.visit(elem.statement()) for elem in ctx.sourceElements().children]
+
+        loc = _get_source_location(ctx, self._lines)
+        program = nodes.Program(loc, self._source_type, elems)
+        if self._index is not None:
+            self._index.add(program)
+        return program
+
+    def visit(self, ctx: antlr4.ParserRuleContext) -> Any:
+        """Build the AST node of a statement, an expression or a literal.
+
+        Nested nodes are built using an explicit stack rather than recursion, so the nesting depth is not limited by
+        the recursion limit.
+
+        Args:
+            ctx (antlr4.ParserRuleContext): The parse tree node.
+
+        Returns:
+            The AST node.
+        """
+        self._index_lines(ctx)
+        index = self._index
+        method, is_generator = self._lookup(ctx)
+        if not is_generator:
+            value = method(self, ctx)
+            if index is not None:
+                index.add(value)
+            return value
+
+        # Handlers of non-leaf nodes are generators which yield child contexts and get their AST nodes back
+        stack = [method(self, ctx)]
+        value = None
+        while stack:
+            try:
+                child = stack[-1].send(value)
+            except StopIteration as stop:
+                stack.pop()
+                value = stop.value
+                if index is not None:
+                    index.add(value)
+                continue
+
+            method, is_generator = self._lookup(child)
+            if is_generator:
+                stack.append(method(self, child))
+                value = None
+            else:
+                value = method(self, child)
+                if index is not None:
+                    index.add(value)
+
+        return value
+
+    def _index_lines(self, ctx: antlr4.ParserRuleContext):
+        """Build the line table of the source once per character stream."""
+        stream = ctx.start.getInputStream()
+        if stream is not self._stream:
+            self._stream = stream
+            self._lines = LineTable.from_stream(stream)  # FIXME add source name
+
+    @staticmethod
+    def _lookup(ctx: antlr4.ParserRuleContext):
+        try:
+            return _DISPATCH[type(ctx)]
+        except KeyError:
+            raise NotImplementedError(type(ctx).__name__) from None
+
+    # Statements
+
+    @_visits(JSP.StatementContext)
+    def _statement(self, ctx: JSP.StatementContext) -> _Builds[nodes.Statement]:
+        """Obtain an actual statement."""
+        return (yield ctx.getChild(0))
+
+    @_visits(JSP.BlockContext)
+    def _block(self, ctx: JSP.BlockContext) -> _Builds[nodes.BlockStatement]:
+        stmt_list: List[nodes.Statement] = []
+        for stmt in ctx.statementList().children:
+            stmt_list.append((yield stmt))
+
+        loc = _get_source_location(ctx, self._lines)
+        return nodes.BlockStatement(loc, stmt_list)
+
+    @_visits(JSP.VariableStatementContext)
+    def _variable_statement(
+        self, ctx: JSP.VariableStatementContext
+    ) -> _Builds[nodes.VariableDeclaration]:
+        return (yield ctx.variableDeclarationList())
+
+    @_visits(JSP.VariableDeclarationListContext)
+    def _variable_declaration_list(
+        self, ctx: JSP.VariableDeclarationListContext
+    ) -> _Builds[nodes.VariableDeclaration]:
+        var_modifier: nodes.VarDeclKind = ctx.varModifier().getText()
+        var_decls: List[nodes.VariableDeclarator] = []
+        for var_decl in ctx.variableDeclaration():
+            var_decls.append((yield from self._variable_declaration(var_decl)))
+
+        loc = _get_source_location(ctx, self._lines)
+        return nodes.VariableDeclaration(loc, var_modifier, var_decls)
+
+    def _variable_declaration(
+        self, ctx: JSP.VariableDeclarationContext
+    ) -> _Builds[nodes.VariableDeclarator]:
+        loc = _get_source_location(ctx, self._lines)
+        target = yield from self._assignable(ctx.assignable())
+
+        init = None
+        if ctx.singleExpression() is not None:
+            init = yield ctx.singleExpression()
+
+        return nodes.VariableDeclarator(loc, target, init)
+
+    @_visits(JSP.EmptyStatementContext)
+    def _empty_statement(self, ctx: JSP.EmptyStatementContext) -> nodes.EmptyStatement:
+        loc = _get_source_location(ctx, self._lines)
+        return nodes.EmptyStatement(loc)
+
+    @_visits(JSP.ExpressionStatementContext)
+    def _expression_statement(
+        self, ctx: JSP.ExpressionStatementContext
+    ) -> _Builds[nodes.ExpressionStatement]:
+        expression = yield ctx.expressionSequence()
+        loc = _get_source_location(ctx, self._lines)
+        return nodes.ExpressionStatement(loc, expression)
+
+    # Expressions
+
+    @_visits(JSP.ExpressionSequenceContext)
+    def _expression_sequence(
+        self, ctx: JSP.ExpressionSequenceContext
+    ) -> _Builds[nodes.SequenceExpression]:
+        loc = _get_source_location(ctx, self._lines)
+        expressions: List[nodes.Expression] = []
+        for expr in ctx.singleExpression():
+            expressions.append((yield expr))
+        return nodes.SequenceExpression(loc, expressions)
+
+    @_visits(JSP.ParenthesizedExpressionContext)
+    def _parenthesized_expression(
+        self, ctx: JSP.ParenthesizedExpressionContext
+    ) -> _Builds[nodes.Expression]:
+        yield ctx.expressionSequence()
+        raise NotImplementedError("ParenthesizedExpression")
+
+    @_visits(JSP.LiteralExpressionContext)
+    def _literal_expression(
+        self, ctx: JSP.LiteralExpressionContext
+    ) -> _Builds[nodes.Literal]:
+        return (yield ctx.literal())
+
+    @_visits(*_UNARY_EXPRESSIONS)
+    def _unary_expression(
+        self, ctx: antlr4.ParserRuleContext
+    ) -> _Builds[nodes.Expression]:
+        argument = yield ctx.singleExpression()
+        loc = _get_source_location(ctx, self._lines)
+        return _UNARY_EXPRESSIONS[type(ctx)](loc, argument)
+
+    @_visits(JSP.PowerExpressionContext)
+    def _power_expression(
+        self, ctx: JSP.PowerExpressionContext
+    ) -> _Builds[nodes.PowBinaryExpression]:
+        left = yield ctx.singleExpression(0)
+        right = yield ctx.singleExpression(1)
+        loc = _get_source_location(ctx, self._lines)
+        return nodes.PowBinaryExpression(loc, left, right)
+
+    @_visits(
+        JSP.MultiplicativeExpressionContext,
+        JSP.AdditiveExpressionContext,
+        JSP.BitShiftExpressionContext,
+        JSP.RelationalExpressionContext,
+        JSP.EqualityExpressionContext,
+    )
+    def _binary_expression(
+        self, ctx: antlr4.ParserRuleContext
+    ) -> _Builds[nodes.Expression]:
+        op = _BINARY_OPERATORS[ctx.getChild(1).symbol.type]
+        left = yield ctx.singleExpression(0)
+        right = yield ctx.singleExpression(1)
+        loc = _get_source_location(ctx, self._lines)
+        return op(loc, left, right)
+
+    @_visits(JSP.AssignmentExpressionContext)
+    def _assignment_expression(
+        self, ctx: JSP.AssignmentExpressionContext
+    ) -> _Builds[nodes.AssignmentExpression]:
+        left = yield ctx.singleExpression(0)
+        right = yield ctx.singleExpression(1)
+        loc = _get_source_location(ctx, self._lines)
+        return nodes.AssignmentExpression(
+            loc, nodes.AssignmentOperator.ASSIGN, left, right
+        )
+
+    @_visits(JSP.AssignmentOperatorExpressionContext)
+    def _assignment_operator_expression(
+        self, ctx: JSP.AssignmentOperatorExpressionContext
+    ) -> _Builds[nodes.AssignmentExpression]:
+        left = yield ctx.singleExpression(0)
+        right = yield ctx.singleExpression(1)
+        op = _ASSIGNMENT_OPERATORS[ctx.assignmentOperator().getChild(0).symbol.type]
+        loc = _get_source_location(ctx, self._lines)
+        return nodes.AssignmentExpression(loc, op, left, right)
+
+    @_visits(JSP.ThisExpressionContext)
+    def _this_expression(self, ctx: JSP.ThisExpressionContext) -> nodes.ThisExpression:
+        loc = _get_source_location(ctx, self._lines)
+        return nodes.ThisExpression(loc)
+
+    @_visits(JSP.IdentifierExpressionContext)
+    def _identifier_expression(
+        self, ctx: JSP.IdentifierExpressionContext
+    ) -> nodes.Identifier:
+        return self._identifier(ctx.identifier())
+
+    def _identifier(self, ctx: JSP.IdentifierContext) -> nodes.Identifier:
+        loc = _get_source_location(ctx, self._lines)
+        return nodes.Identifier(loc, ctx.getText())
+
+    @_visits(JSP.SuperExpressionContext)
+    def _super_expression(self, ctx: JSP.SuperExpressionContext) -> nodes.Super:
+        loc = _get_source_location(ctx, self._lines)
+        return nodes.Super(loc)
+
+    @_visits(JSP.ArrayLiteralExpressionContext)
+    def _array_literal_expression(
+        self, ctx: JSP.ArrayLiteralExpressionContext
+    ) -> _Builds[nodes.ArrayExpression]:
+        elements = yield from self._element_list(ctx.arrayLiteral().elementList())
+        loc = _get_source_location(ctx, self._lines)
+        return nodes.ArrayExpression(loc, elements)
+
+    def _element_list(
+        self, ctx: JSP.ElementListContext
+    ) -> _Builds[List[Union[nodes.Expression, nodes.SpreadElement]]]:
+        elements = []
+        for elem in ctx.arrayElement():
+            expression = yield elem.singleExpression()
+            if elem.Ellipsis() is not None:
+                loc = _get_source_location(elem, self._lines)
+                elements.append(nodes.SpreadElement(loc, expression))
+            else:
+                elements.append(expression)
+
+        return elements
+
+    # Literals
+
+    @_visits(JSP.LiteralContext)
+    def _literal(self, ctx: JSP.LiteralContext) -> _Builds[nodes.Literal]:
+        loc = _get_source_location(ctx, self._lines)
+        if ctx.NullLiteral() is not None:
+            return nodes.NullLiteral(loc)
+        if ctx.BooleanLiteral() is not None:
+            value = ctx.BooleanLiteral().getText() == "true"
+            return nodes.BooleanLiteral(loc, value)
+        if ctx.StringLiteral() is not None:
+            value = ctx.StringLiteral().getText()[1:-1]  # Strip quotes
+            return nodes.StringLiteral(loc, value)
+
+        return (yield ctx.getChild(0))
+
+    @_visits(JSP.NumericLiteralContext)
+    def _numeric_literal(self, ctx: JSP.NumericLiteralContext) -> nodes.NumericLiteral:
+        # Thank you, PEP-515, very cool!
+        loc = _get_source_location(ctx, self._lines)
+        value = float(ctx.DecimalLiteral().getText())
+        return nodes.NumericLiteral(loc, value)
+
+    # Patterns
+
+    def _assignable(
+        self, ctx: JSP.AssignableContext
+    ) -> _Builds[Union[nodes.Identifier, nodes.ObjectPattern, nodes.ArrayPattern]]:
+        child = ctx.getChild(0)
+        if isinstance(child, JSP.IdentifierContext):
+            return self._identifier(child)
+        if isinstance(child, JSP.ArrayLiteralContext):
+            loc = _get_source_location(child, self._lines)
+            elems = []
+            if child.elementList() is not None:
+                elems += yield from self._element_list(child.elementList())
+            return nodes.ArrayPattern(loc, elems)
+
+        raise NotImplementedError("ObjectLiteral assignment")  # TODO
+
+    # Not implemented yet
+
+    @_visits(*_NOT_IMPLEMENTED)
+    def _not_implemented(self, ctx: antlr4.ParserRuleContext):
+        raise NotImplementedError(_NOT_IMPLEMENTED[type(ctx)])  # TODO
@@ -0,0 +1,409 @@
+"""Columnar (struct-of-arrays) AST storage.
+
+A `nodes.Node` object costs a few hundred bytes with its location, so holding millions of them is dominated by Python
+object overhead. `ColumnarAST` keeps the same tree in parallel typed arrays instead:
+
+* `kinds` holds the index of the node class (and `type`) of every node in the kind table;
+* `start_lines`, `start_columns`, `end_lines`, `end_columns` and `loc_sources` hold the locations (line 0 means there
+  is no location);
+* `field_offsets` points every node to its fields in `values`, in the field order of its class, excluding `type` and
+  `loc`;
+* `subtree_ends` holds the index after the last node of the subtree of every node;
+* `list_offsets` and `list_items` hold the contents of the list fields (e.g. `body`).
+
+Field values are tagged integers: an index of a child node, an index of a list or an index in the deduplicated
+constant table (strings, numbers, booleans, operators and `None`). Nodes are numbered in pre-order, so the root is
+node 0 and every subtree is a contiguous range of indices.
+
+The arrays support the buffer protocol, so they can be viewed as NumPy arrays without copying (e.g.
+``numpy.frombuffer(tree.kinds, dtype=numpy.uint16)``).
+
+`ColumnarAST.walk` and `ColumnarAST.children` traverse the tree using node indices only. `tree[index]` gives a
+`NodeHandle`, which exposes the node with the same fields as `nodes.Node`, and `ColumnarAST.to_node` converts the tree
+back.
+"""
+
+from array import array
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from . import nodes
+
+_TAG_BITS = 2
+_TAG_MASK = (1 << _TAG_BITS) - 1
+
+_TAG_NODE = 0
+_TAG_LIST = 1
+_TAG_CONST = 2
+
+_NO_FIELDS = ("type", "loc")
+"""Fields stored in separate columns."""
+
+
+class ColumnarAST:
+    """AST stored in parallel typed arrays.
+
+    Use `ColumnarAST.from_node(program)` to convert an AST.
+    """
+
+    kind_classes: List[type]
+    """Node class of each kind."""
+
+    kind_types: List[str]
+    """`type` field value of each kind."""
+
+    constants: List[Any]
+    """Deduplicated scalar field values."""
+
+    def __init__(self):
+        """Create an empty tree."""
+        self.kind_classes = []
+        self.kind_types = []
+        self.constants = []
+
+        self.kinds = array("H")
+        self.start_lines = array("I")
+        self.start_columns = array("I")
+        self.end_lines = array("I")
+        self.end_columns = array("I")
+        self.loc_sources = array("I")
+        self.field_offsets = array("I")
+        self.subtree_ends = array("I")
+        self.values = array("q")
+        self.list_offsets = array("I", [0])
+        self.list_items = array("q")
+
+        self._kind_ids: Dict[Tuple[type, str], int] = {}
+        self._constant_ids: Dict[Tuple[type, Any], int] = {}
+
+    def __len__(self):
+        """The number of nodes."""
+        return len(self.kinds)
+
+    # Conversion
+
+    @classmethod
+    def from_node(cls, root: nodes.Node) -> "ColumnarAST":
+        """Convert an AST.
+
+        Args:
+            root (nodes.Node): The root node, e.g. `Program`.
+
+        Returns:
+            The columnar AST. The root node has index 0.
+        """
+        tree = cls()
+
+        # Number the nodes in pre-order first, so the fields can refer to the children
+        order: List[nodes.Node] = []
+        index_of: Dict[int, int] = {}
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            index_of[id(node)] = len(order)
+            order.append(node)
+
+            children = []
+            for attr in _own_attrs(type(node)):
+                value = getattr(node, attr)
+                if isinstance(value, nodes.Node):
+                    children.append(value)
+                elif isinstance(value, list):
+                    children.extend(v for v in value if isinstance(v, nodes.Node))
+            stack.extend(reversed(children))
+
+        for node in order:
+            tree._append(node, index_of)
+
+        # The subtree of a node ends with the subtree of its last child
+        ends = tree.subtree_ends
+        ends.extend(range(1, len(order) + 1))
+        for index in reversed(range(len(order))):
+            for child in tree.children(index):
+                ends[index] = ends[child]
+
+        # Only needed while converting
+        tree._kind_ids.clear()
+        tree._constant_ids.clear()
+        return tree
+
+    def _append(self, node: nodes.Node, index_of: Dict[int, int]):
+        self.kinds.append(self._kind(type(node), node.type))
+
+        loc = node.loc
+        if loc is None:
+            for column in (self.start_lines, self.start_columns):
+                column.append(0)
+            for column in (self.end_lines, self.end_columns):
+                column.append(0)
+            self.loc_sources.append(self._constant(None))
+        else:
+            start, end = loc.start, loc.end
+            self.start_lines.append(start.line)
+            self.start_columns.append(start.column)
+            self.end_lines.append(end.line)
+            self.end_columns.append(end.column)
+            self.loc_sources.append(self._constant(loc.source))
+
+        self.field_offsets.append(len(self.values))
+        for attr in _own_attrs(type(node)):
+            value = getattr(node, attr)
+            if isinstance(value, list):
+                self.list_items.extend(self._encode(v, index_of) for v in value)
+                self.list_offsets.append(len(self.list_items))
+                value = ((len(self.list_offsets) - 2) << _TAG_BITS) | _TAG_LIST
+            else:
+                value = self._encode(value, index_of)
+            self.values.append(value)
+
+    def _encode(self, value, index_of: Dict[int, int]) -> int:
+        if isinstance(value, nodes.Node):
+            return (index_of[id(value)] << _TAG_BITS) | _TAG_NODE
+        return (self._constant(value) << _TAG_BITS) | _TAG_CONST
+
+    def _kind(self, cls: type, node_type: str) -> int:
+        key = (cls, node_type)
+        kind = self._kind_ids.get(key)
+        if kind is None:
+            kind = self._kind_ids[key] = len(self.kind_classes)
+            self.kind_classes.append(cls)
+            self.kind_types.append(node_type)
+        return kind
+
+    def _constant(self, value) -> int:
+        key = (type(value), value)  # Keep 1, 1.0 and True apart
+        index = self._constant_ids.get(key)
+        if index is None:
+            index = self._constant_ids[key] = len(self.constants)
+            self.constants.append(value)
+        return index
+
+    def to_node(self, index: int = 0) -> nodes.Node:
+        """Convert the subtree back to `nodes.Node` objects.
+
+        Args:
+            index (int): The index of the subtree root.
+
+        Returns:
+            The root node of the subtree.
+        """
+        created: Dict[int, nodes.Node] = {}
+        subtree = list(self.walk(index))
+        for i in subtree:
+            cls = self.kind_classes[self.kinds[i]]
+            node = created[i] = cls.__new__(cls)
+            node.type = self.kind_types[self.kinds[i]]
+            node.loc = self.loc(i)
+
+        for i in subtree:
+            node = created[i]
+            offset = self.field_offsets[i]
+            for attr in _own_attrs(type(node)):
+                setattr(node, attr, self._decode(self.values[offset], created))
+                offset += 1
+
+        return created[index]
+
+    def _decode(self, value: int, created: Dict[int, Any]):
+        tag, payload = value & _TAG_MASK, value >> _TAG_BITS
+        if tag == _TAG_NODE:
+            return created[payload]
+        if tag == _TAG_LIST:
+            start, stop = self.list_offsets[payload], self.list_offsets[payload + 1]
+            return [self._decode(v, created) for v in self.list_items[start:stop]]
+        return self.constants[payload]
+
+    # Access by index
+
+    def node_class(self, index: int) -> type:
+        """Get the `nodes.Node` subclass of the node."""
+        return self.kind_classes[self.kinds[index]]
+
+    def node_type(self, index: int) -> str:
+        """Get the `type` field of the node."""
+        return self.kind_types[self.kinds[index]]
+
+    def loc(self, index: int) -> Optional[nodes.SourceLocation]:
+        """Create the `SourceLocation` of the node."""
+        if self.start_lines[index] == 0:
+            return None
+
+        start = nodes.Position(self.start_lines[index], self.start_columns[index])
+        end = nodes.Position(self.end_lines[index], self.end_columns[index])
+        source = self.constants[self.loc_sources[index]]
+        return nodes.SourceLocation(source, start, end)
+
+    def field(self, index: int, name: str):
+        """Get a field of the node. Child nodes are returned as `NodeHandle` objects.
+
+        Args:
+            index (int): The node index.
+            name (str): The ESTree field name, e.g. ``sourceType``.
+
+        Returns:
+            The field value.
+        """
+        if name == "type":
+            return self.node_type(index)
+        if name == "loc":
+            return self.loc(index)
+
+        cls = self.kind_classes[self.kinds[index]]
+        try:
+            position = _own_fields(cls).index(name)
+        except ValueError:
+            raise KeyError(name) from None
+        # Child nodes are decoded as `self[index]`, i.e. as handles
+        return self._decode(self.values[self.field_offsets[index] + position], self)
+
+    def __getitem__(self, index: int) -> "NodeHandle":
+        """Get the handle of the node.
+
+        Args:
+            index (int): The node index.
+
+        Returns:
+            The node handle.
+        """
+        if not 0 <= index < len(self.kinds):
+            raise IndexError(index)
+        return NodeHandle(self, index)
+
+    # Traversal
+
+    def children(self, index: int) -> Iterator[int]:
+        """Iterate over the indices of the child nodes in the field order.
+
+        Args:
+            index (int): The node index.
+        """
+        offset = self.field_offsets[index]
+        count = len(_own_attrs(self.kind_classes[self.kinds[index]]))
+        for value in self.values[offset : offset + count]:
+            tag = value & _TAG_MASK
+            if tag == _TAG_NODE:
+                yield value >> _TAG_BITS
+            elif tag == _TAG_LIST:
+                lst = value >> _TAG_BITS
+                start, stop = self.list_offsets[lst], self.list_offsets[lst + 1]
+                for item in self.list_items[start:stop]:
+                    if item & _TAG_MASK == _TAG_NODE:
+                        yield item >> _TAG_BITS
+
+    def walk(self, index: int = 0) -> Iterator[int]:
+        """Iterate over the indices of the nodes of the subtree in pre-order.
+
+        Nodes are numbered in pre-order, so it's just a range of indices.
+
+        Args:
+            index (int): The index of the subtree root.
+        """
+        return iter(range(index, self.subtree_ends[index]))
+
+    def indices_of(self, cls: type) -> Iterator[int]:
+        """Iterate over the indices of the nodes which are instances of the class.
+
+        Args:
+            cls (type): `nodes.Node` subclass, e.g. `nodes.Identifier`.
+        """
+        kinds = {
+            kind
+            for kind, kind_class in enumerate(self.kind_classes)
+            if issubclass(kind_class, cls)
+        }
+        return (index for index, kind in enumerate(self.kinds) if kind in kinds)
+
+
+class NodeHandle:
+    """A node of `ColumnarAST`.
+
+    It has the same fields and attributes as the `nodes.Node` object of the node, e.g. ``handle.left`` or
+    ``handle.fields["sourceType"]``, so `to_ascii_tree` works with handles too. Child nodes are returned as handles.
+    """
+
+    __slots__ = ("tree", "index")
+
+    def __init__(self, tree: ColumnarAST, index: int):
+        self.tree = tree
+        self.index = index
+
+    @property
+    def node_class(self) -> type:
+        """`nodes.Node` subclass of the node."""
+        return self.tree.node_class(self.index)
+
+    @property
+    def type(self) -> str:
+        return self.tree.node_type(self.index)
+
+    @property
+    def loc(self) -> Optional[nodes.SourceLocation]:
+        return self.tree.loc(self.index)
+
+    @property
+    def _field_attrs(self) -> Dict[str, str]:
+        return self.node_class._field_attrs
+
+    @property
+    def _field_names(self) -> Tuple[str, ...]:
+        return self.node_class._field_names
+
+    @property
+    def fields(self) -> nodes.FieldsView:
+        return nodes.FieldsView(self)
+
+    def __getattr__(self, attr: str):
+        names = _field_names_by_attr(self.node_class)
+        if attr not in names:
+            raise AttributeError(attr)
+        return self.tree.field(self.index, names[attr])
+
+    def __eq__(self, other):
+        return (
+            isinstance(other, NodeHandle)
+            and self.tree is other.tree
+            and self.index == other.index
+        )
+
+    def __hash__(self):
+        return hash((id(self.tree), self.index))
+
+    def __str__(self):
+        # Nodes' `__str__` only use the fields, which handles have too
+        return self.node_class.__str__(self)
+
+    def __repr__(self):
+        return f"<{type(self).__name__} {self.index}: {self.type}>"
+
+
+_OWN_ATTRS: Dict[type, Tuple[str, ...]] = {}
+_OWN_FIELDS: Dict[type, Tuple[str, ...]] = {}
+_NAMES_BY_ATTR: Dict[type, Dict[str, str]] = {}
+
+
+def _own_attrs(cls: type) -> Tuple[str, ...]:
+    """Attribute names of the fields stored in `ColumnarAST.values`, in the field order."""
+    attrs = _OWN_ATTRS.get(cls)
+    if attrs is None:
+        attrs = _OWN_ATTRS[cls] = tuple(
+            attr for name, attr in cls._field_attrs.items() if name not in _NO_FIELDS
+        )
+    return attrs
+
+
+def _own_fields(cls: type) -> Tuple[str, ...]:
+    """ESTree names of the fields stored in `ColumnarAST.values`, in the field order."""
+    fields = _OWN_FIELDS.get(cls)
+    if fields is None:
+        fields = _OWN_FIELDS[cls] = tuple(
+            name for name in cls._field_names if name not in _NO_FIELDS
+        )
+    return fields
+
+
+def _field_names_by_attr(cls: type) -> Dict[str, str]:
+    names = _NAMES_BY_ATTR.get(cls)
+    if names is None:
+        names = _NAMES_BY_ATTR[cls] = {
+            attr: name for name, attr in cls._field_attrs.items()
+        }
+    return names
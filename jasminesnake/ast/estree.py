@@ -0,0 +1,418 @@
+"""ESTree JSON export and import.
+
+`dump` writes the JSON of a tree straight to a text file while walking it, so the JSON text or a dict of the whole
+program is never held in memory. `load` reads the JSON in chunks and rebuilds `nodes.*` objects as soon as their JSON
+objects end, so only the nodes and the JSON containers still being read are kept.
+
+Nodes are written with the keys of their `fields` in order, plus ``range`` if the node location knows it. Operators are
+written as their ESTree strings. Both functions use explicit stacks, so deeply nested trees don't hit the recursion
+limit.
+
+ESTree has fewer node types than `nodes` (e.g. every literal is a ``Literal``), so `load` picks the node classes the
+AST builder would use: literal classes by the value type, unary, update, binary and logical expression classes by the
+operator, `FunctionBody` for function bodies, and so on.
+"""
+
+import inspect
+import re
+from json.decoder import scanstring
+from json.encoder import encode_basestring
+from typing import Any, Dict, List, Optional, TextIO, Tuple
+
+from . import nodes
+
+_NO_FIELDS = ("type", "loc")
+"""Fields written separately."""
+
+_FLUSH_PARTS = 4096
+"""Number of text parts buffered before writing them to the file."""
+
+_OWN_FIELDS: Dict[type, Tuple[Tuple[str, str], ...]] = {}
+
+
+def _own_fields(cls: type) -> Tuple[Tuple[str, str], ...]:
+    """(ESTree name, attribute name) pairs of the fields of the class, excluding `type` and `loc`."""
+    fields = _OWN_FIELDS.get(cls)
+    if fields is None:
+        fields = _OWN_FIELDS[cls] = tuple(
+            (name, attr)
+            for name, attr in cls._field_attrs.items()
+            if name not in _NO_FIELDS
+        )
+    return fields
+
+
+def _scalar(value) -> str:
+    if value is None:
+        return "null"
+    if value is True:
+        return "true"
+    if value is False:
+        return "false"
+    if isinstance(value, str):
+        return encode_basestring(value)
+    if isinstance(value, nodes.Enum):
+        return encode_basestring(value.value)
+    if isinstance(value, float):
+        if value != value:
+            return "NaN"
+        if value in (float("inf"), float("-inf")):
+            return "Infinity" if value > 0 else "-Infinity"
+        return repr(value)
+    if isinstance(value, int):
+        return str(value)
+    raise TypeError(f"Can't serialize {type(value).__name__} to JSON")
+
+
+def _loc(loc: nodes.SourceLocation) -> str:
+    start, end = loc.start, loc.end
+    source = "" if loc.source is None else f'"source":{encode_basestring(loc.source)},'
+    return (
+        f'{{{source}"start":{{"line":{start.line},"column":{start.column}}},'
+        f'"end":{{"line":{end.line},"column":{end.column}}}}}'
+    )
+
+
+def dump(node: nodes.Node, file: TextIO, locations: bool = True):
+    """Write the ESTree JSON of the tree to the file.
+
+    Args:
+        node (nodes.Node): The root node, e.g. `Program`.
+        file (TextIO): The file opened in text mode.
+        locations (bool): Whether to write ``loc`` and ``range``.
+    """
+    parts: List[str] = []
+    append = parts.append
+
+    # Nodes and lists left to write, and the text between them. The text is pushed as `str`, scalar values never are.
+    stack: List[Any] = [node]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, str):
+            append(value)
+        elif isinstance(value, nodes.Node):
+            segments = [f'{{"type":{encode_basestring(value.type)}']
+            loc = value.loc
+            if locations and loc is not None:
+                segments.append(f',"loc":{_loc(loc)}')
+
+            for name, attr in _own_fields(type(value)):
+                field = getattr(value, attr)
+                if isinstance(field, (nodes.Node, list)):
+                    segments.append(f',"{name}":')
+                    segments.append(field)
+                else:
+                    segments.append(f',"{name}":{_scalar(field)}')
+
+            value_range = value.range if locations else None
+            if value_range is not None:
+                segments.append(f',"range":[{value_range[0]},{value_range[1]}]}}')
+            else:
+                segments.append("}")
+            stack.extend(reversed(segments))
+        elif isinstance(value, list):
+            segments = ["["]
+            for index, item in enumerate(value):
+                if index:
+                    segments.append(",")
+                if isinstance(item, (nodes.Node, list)):
+                    segments.append(item)
+                else:
+                    segments.append(_scalar(item))
+            segments.append("]")
+            stack.extend(reversed(segments))
+        else:
+            append(_scalar(value))
+
+        if len(parts) >= _FLUSH_PARTS:
+            file.write("".join(parts))
+            parts.clear()
+
+    file.write("".join(parts))
+
+
+def dumps(node: nodes.Node, locations: bool = True) -> str:
+    """Get the ESTree JSON of the tree.
+
+    Args:
+        node (nodes.Node): The root node, e.g. `Program`.
+        locations (bool): Whether to write ``loc`` and ``range``.
+
+    Returns:
+        The JSON text.
+    """
+    import io
+
+    file = io.StringIO()
+    dump(node, file, locations)
+    return file.getvalue()
+
+
+# Loading
+
+
+def _operator_classes() -> Dict[Tuple[str, str, Optional[bool]], type]:
+    """Map (type, operator, prefix) to the node classes generated for the operators."""
+    bases = (
+        nodes.UnaryExpression,
+        nodes.UpdateExpression,
+        nodes.BinaryExpression,
+        nodes.LogicalExpression,
+        # The AST builder uses `AssignmentExpression` itself for all assignments
+    )
+
+    classes = {}
+    for cls in vars(nodes).values():
+        if isinstance(cls, type) and issubclass(cls, bases) and cls not in bases:
+            # The operator is baked into the constructor, so look at an instance
+            node = cls(*([None] * len(inspect.signature(cls).parameters)))
+            prefix = node.prefix if isinstance(node, nodes.UpdateExpression) else None
+            classes[(node.type, node.operator.value, prefix)] = cls
+    return classes
+
+
+_OPERATOR_CLASSES = _operator_classes()
+
+_OPERATORS = {
+    "UnaryExpression": nodes.UnaryOperator,
+    "UpdateExpression": nodes.UpdateOperator,
+    "BinaryExpression": nodes.BinaryOperator,
+    "AssignmentExpression": nodes.AssignmentOperator,
+    "LogicalExpression": nodes.LogicalOperator,
+}
+"""Node type -> enum of its `operator` field."""
+
+_CLASSES: Dict[str, type] = {
+    name: cls
+    for name, cls in vars(nodes).items()
+    if isinstance(cls, type) and issubclass(cls, nodes.Node)
+}
+"""Node classes named as their ESTree types, by name."""
+
+
+def _node_class(obj: dict) -> type:
+    node_type = obj["type"]
+
+    if node_type == "Literal":
+        value = obj.get("value")
+        if "bigint" in obj:
+            return nodes.BigIntLiteral
+        if value is None:
+            return nodes.NullLiteral
+        if isinstance(value, bool):
+            return nodes.BooleanLiteral
+        if isinstance(value, str):
+            return nodes.StringLiteral
+        return nodes.NumericLiteral
+
+    if node_type in _OPERATORS:
+        key = (node_type, obj.get("operator"), obj.get("prefix"))
+        if node_type != "UpdateExpression":
+            key = key[:2] + (None,)
+        cls = _OPERATOR_CLASSES.get(key)
+        if cls is not None:
+            return cls
+
+    if node_type == "FunctionDeclaration" and obj.get("id") is None:
+        return nodes.AnonymousDefaultExportedFunctionDeclaration
+    if node_type == "ClassDeclaration" and obj.get("id") is None:
+        return nodes.AnonymousDefaultExportedClassDeclaration
+
+    try:
+        return _CLASSES[node_type]
+    except KeyError:
+        raise ValueError(f"Unknown ESTree node type {node_type!r}") from None
+
+
+def _source_location(
+    obj: Optional[dict], value_range: Optional[list]
+) -> Optional[nodes.SourceLocation]:
+    if obj is None:
+        return None
+
+    start, end = obj["start"], obj["end"]
+    loc = nodes.SourceLocation(
+        obj.get("source"),
+        nodes.Position(start["line"], start["column"]),
+        nodes.Position(end["line"], end["column"]),
+    )
+    if value_range is not None:
+        loc.range = value_range
+    return loc
+
+
+def _to_node(obj: dict) -> nodes.Node:
+    """Build a node of a JSON object whose fields are already converted."""
+    cls = _node_class(obj)
+    node = cls.__new__(cls)
+    node.type = obj["type"]
+    node.loc = _source_location(obj.get("loc"), obj.get("range"))
+    for name, attr in _own_fields(cls):
+        setattr(node, attr, obj.get(name))
+
+    operators = _OPERATORS.get(node.type)
+    if operators is not None:
+        node.operator = operators(node.operator)
+
+    # Node classes which depend on the parent. Their slots are the same, so the class can be just replaced.
+    if isinstance(node, nodes.Function) and type(node.body) is nodes.BlockStatement:
+        node.body.__class__ = nodes.FunctionBody
+    if isinstance(node, nodes.ObjectPattern):
+        for prop in node.properties:
+            if type(prop) is nodes.Property:
+                prop.__class__ = nodes.AssignmentProperty
+
+    return node
+
+
+_TOKEN = re.compile(
+    r"""[ \t\n\r]*(?:
+        ([{}\[\],:])
+        |(")
+        |(-?(?:0|[1-9][0-9]*)(\.[0-9]+)?([eE][-+]?[0-9]+)?)
+        |(true|false|null|NaN|Infinity|-Infinity)
+    )""",
+    re.VERBOSE,
+)
+
+_STRING = re.compile(r'"(?:[^"\\]|\\u[0-9a-fA-F]{4}|\\[^u])*"')
+
+_NUMBER_CHARS = frozenset("0123456789.eE+-")
+
+_CONSTANTS = {
+    "true": True,
+    "false": False,
+    "null": None,
+    "NaN": float("nan"),
+    "Infinity": float("inf"),
+    "-Infinity": float("-inf"),
+}
+
+# Parser states: what may come next
+_VALUE = 0
+_VALUE_OR_END = 1  # After "["
+_KEY = 2
+_KEY_OR_END = 3  # After "{"
+_COLON = 4
+_NEXT = 5  # A comma or the end of the container
+
+
+def load(file: TextIO, chunk_size: int = 65536) -> nodes.Node:
+    """Read ESTree JSON from the file and rebuild the tree.
+
+    Args:
+        file (TextIO): The file opened in text mode.
+        chunk_size (int): The number of characters to read at once.
+
+    Returns:
+        The root node, e.g. `Program`.
+    """
+    buffer = ""
+    pos = 0
+    eof = False
+
+    # Containers being read: [dict, key] or [list]
+    stack: List[list] = []
+    state = _VALUE
+    root = None
+    done = False
+
+    while True:
+        match = _TOKEN.match(buffer, pos)
+        if match is not None and not eof:
+            # Strings and numbers may continue in the next chunk
+            end = match.end()
+            if match.group(2):
+                if _STRING.match(buffer, end - 1) is None:
+                    match = None
+            elif match.group(3):
+                if end == len(buffer) or buffer[end] in _NUMBER_CHARS:
+                    match = None
+
+        if match is None:
+            if not eof:
+                chunk = file.read(chunk_size)
+                buffer = buffer[pos:] + chunk
+                pos = 0
+                eof = not chunk
+                continue
+
+            if buffer[pos:].strip():
+                raise ValueError(f"Invalid JSON at {buffer[pos:pos + 20]!r}")
+            if not done:
+                raise ValueError("Unexpected end of JSON")
+            return root
+
+        token = match.group().lstrip()
+        if done:
+            raise ValueError(f"Extra data at {token!r}")
+
+        pos = match.end()
+        punct, quote, number, fraction, exponent, constant = match.groups()
+        frame = stack[-1] if stack else None
+
+        if punct == ":":
+            if state != _COLON:
+                raise ValueError("Unexpected ':'")
+            state = _VALUE
+            continue
+        if punct == ",":
+            if state != _NEXT:
+                raise ValueError("Unexpected ','")
+            state = _KEY if len(frame) == 2 else _VALUE
+            continue
+        if punct in ("}", "]"):
+            expected = (_NEXT, _KEY_OR_END) if punct == "}" else (_NEXT, _VALUE_OR_END)
+            if state not in expected or (len(frame) == 2) != (punct == "}"):
+                raise ValueError(f"Unexpected {punct!r}")
+            stack.pop()
+            value = frame[0]
+            if punct == "}" and "type" in value:
+                value = _to_node(value)
+        elif quote is not None and state in (_KEY, _KEY_OR_END):
+            frame[1], pos = scanstring(buffer, pos)
+            state = _COLON
+            continue
+        elif state not in (_VALUE, _VALUE_OR_END):
+            raise ValueError(f"Unexpected {token!r}")
+        elif punct == "{":
+            stack.append([{}, None])
+            state = _KEY_OR_END
+            continue
+        elif punct == "[":
+            stack.append([[]])
+            state = _VALUE_OR_END
+            continue
+        elif quote is not None:
+            value, pos = scanstring(buffer, pos)
+        elif number is not None:
+            value = float(number) if fraction or exponent else int(number)
+        else:
+            value = _CONSTANTS[constant]
+
+        # Put the value into its container
+        if not stack:
+            root = value
+            done = True
+            continue
+
+        frame = stack[-1]
+        if len(frame) == 2:
+            frame[0][frame[1]] = value
+        else:
+            frame[0].append(value)
+        state = _NEXT
+
+
+def loads(text: str) -> nodes.Node:
+    """Rebuild the tree of ESTree JSON text.
+
+    Args:
+        text (str): The JSON text.
+
+    Returns:
+        The root node, e.g. `Program`.
+    """
+    import io
+
+    return load(io.StringIO(text), max(len(text), 1))
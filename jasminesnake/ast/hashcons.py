@@ -0,0 +1,208 @@
+"""Structural hashing and hash-consing of AST subtrees.
+
+Two subtrees are structurally equal if they have the same node classes, `type` values and field values, whatever their
+locations are. `Interner` keeps one canonical node per structurally different subtree: `Interner.intern` returns a tree
+in which equal subtrees (identifiers, literals, repeated expressions, ...) are the same object. Then two subtrees interned
+by the same interner are equal if and only if they are the same object, and repetitive code takes much less memory.
+The interned tree is not changed, the nodes which need canonical children are copied.
+
+Every canonical node also gets a digest of its structure, which is the same in every process, so it can be used as a
+key for analysis results memoized across files and runs.
+
+Since a canonical node stands for all subtrees equal to it, its location is the location of the first one interned.
+Canonical nodes must not be changed, and neither must the subtrees of interned trees, which may become canonical nodes.
+"""
+
+import hashlib
+from typing import Any, Dict, List, Tuple
+
+from . import nodes
+
+_NO_FIELDS = ("type", "loc")
+"""Fields which are not a part of the structure."""
+
+_DIGEST_SIZE = 16
+
+_OWN_ATTRS: Dict[type, Tuple[str, ...]] = {}
+
+
+def _own_attrs(cls: type) -> Tuple[str, ...]:
+    attrs = _OWN_ATTRS.get(cls)
+    if attrs is None:
+        attrs = _OWN_ATTRS[cls] = tuple(
+            attr for name, attr in cls._field_attrs.items() if name not in _NO_FIELDS
+        )
+    return attrs
+
+
+def _copy(node: nodes.Node) -> nodes.Node:
+    cls = type(node)
+    result = cls.__new__(cls)
+    for attr in cls._field_attrs.values():
+        setattr(result, attr, getattr(node, attr))
+    return result
+
+
+def _scalar_key(value) -> Any:
+    """Key of a field value which is not a node, which doesn't equal the keys of values of other types.
+
+    E.g. ``True``, ``1`` and ``1.0`` are equal in Python, but they're different literals.
+    """
+    if value is None or isinstance(value, nodes.Enum):
+        return value
+    if isinstance(value, float):
+        return float, value.hex()
+    return type(value), value
+
+
+class Interner:
+    """The table of canonical subtrees.
+
+    Use one interner for all the trees whose subtrees should be shared.
+    """
+
+    def __init__(self):
+        self._table: Dict[tuple, nodes.Node] = {}
+        self._digests: Dict[int, bytes] = {}
+
+    def __len__(self):
+        """The number of canonical subtrees."""
+        return len(self._table)
+
+    def __contains__(self, node: nodes.Node) -> bool:
+        """Whether the node is a canonical node of this interner."""
+        return id(node) in self._digests
+
+    def intern(self, node: nodes.Node) -> nodes.Node:
+        """Share the structurally equal subtrees of the tree with the ones interned before.
+
+        The tree itself is not changed: the nodes with children replaced by the canonical ones are copied, the other
+        nodes may become canonical as they are.
+
+        Args:
+            node (nodes.Node): The root of the tree.
+
+        Returns:
+            The canonical node of the tree.
+        """
+        digests = self._digests
+        canonical: Dict[int, nodes.Node] = {}
+
+        # Post-order with an explicit stack, so the children are interned before their parents
+        stack: List[Tuple[nodes.Node, bool]] = [(node, False)]
+        while stack:
+            value, children_done = stack.pop()
+            if id(value) in canonical:
+                continue
+            if id(value) in digests:
+                canonical[id(value)] = value  # Interned subtrees are never changed
+                continue
+
+            attrs = _own_attrs(type(value))
+            if not children_done:
+                stack.append((value, True))
+                for attr in attrs:
+                    field = getattr(value, attr)
+                    if isinstance(field, nodes.Node):
+                        stack.append((field, False))
+                    elif isinstance(field, list):
+                        stack.extend(
+                            (item, False)
+                            for item in field
+                            if isinstance(item, nodes.Node)
+                        )
+                continue
+
+            key = [type(value), value.type]
+            replaced: Dict[str, Any] = {}
+            for attr in attrs:
+                field = getattr(value, attr)
+                if isinstance(field, nodes.Node):
+                    child = canonical[id(field)]
+                    if child is not field:
+                        replaced[attr] = child
+                    key.append(child)
+                elif isinstance(field, list):
+                    items = []
+                    children = []
+                    changed = False
+                    for item in field:
+                        if isinstance(item, nodes.Node):
+                            child = canonical[id(item)]
+                            changed = changed or child is not item
+                            children.append(child)
+                            items.append(child)
+                        else:
+                            children.append(item)
+                            items.append(_scalar_key(item))
+                    if changed:
+                        replaced[attr] = children
+                    key.append(tuple(items))
+                else:
+                    key.append(_scalar_key(field))
+
+            # Canonical nodes have no custom equality, so the children are compared by identity
+            key = tuple(key)
+            shared = self._table.get(key)
+            if shared is None:
+                shared = value
+                if replaced:
+                    shared = _copy(value)
+                    for attr, field in replaced.items():
+                        setattr(shared, attr, field)
+                self._table[key] = shared
+                digests[id(shared)] = self._digest(key)
+            canonical[id(value)] = shared
+
+        return canonical[id(node)]
+
+    def digest(self, node: nodes.Node) -> bytes:
+        """Get the structural digest of the tree.
+
+        Structurally equal trees have the same digest in every process. The tree is interned if it isn't yet.
+
+        Args:
+            node (nodes.Node): The root of the tree.
+
+        Returns:
+            16 bytes of the BLAKE2b hash of the tree structure.
+        """
+        digest = self._digests.get(id(node))
+        if digest is None:
+            digest = self._digests[id(self.intern(node))]
+        return digest
+
+    def _digest(self, key: tuple) -> bytes:
+        """Hash the key of a new canonical node, using the digests of its children."""
+        digests = self._digests
+
+        def stable(value):
+            if isinstance(value, nodes.Node):
+                return digests[id(value)]
+            if isinstance(value, tuple):
+                return tuple(stable(item) for item in value)
+            if isinstance(value, type):
+                return value.__name__
+            if isinstance(value, nodes.Enum):
+                return type(value).__name__, value.value
+            return value
+
+        data = repr(tuple(stable(value) for value in key)).encode(
+            "utf-8", "surrogatepass"
+        )
+        return hashlib.blake2b(data, digest_size=_DIGEST_SIZE).digest()
+
+
+def structural_hash(node: nodes.Node) -> bytes:
+    """Get the structural digest of the tree without sharing its subtrees with other trees.
+
+    Args:
+        node (nodes.Node): The root of the tree. It's not changed.
+
+    Returns:
+        16 bytes of the BLAKE2b hash of the tree structure.
+
+    See Also:
+        Interner.digest
+    """
+    return Interner().digest(node)
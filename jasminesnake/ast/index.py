@@ -0,0 +1,206 @@
+"""Side index of an AST.
+
+`ASTIndex` answers the questions tools ask all the time without walking the tree: all the nodes of a type, the parent
+of a node and the innermost node covering a character offset.
+
+Pass an index to `jasminesnake.ast.from_parse_tree` to fill it while the AST is built: the builder adds every node
+when it's created, so the parent pointers and the type lists cost no extra pass. `ASTIndex.from_node` indexes an
+existing tree.
+
+Position lookups use the character ranges of the nodes (see `nodes.Node.range`). The ranges of a tree are nested, so
+the source splits into segments owned by a single innermost node each. The segment starts are kept sorted in an array,
+so a lookup is one binary search. The segments and the sorted type lists are computed on the first query after nodes
+are added.
+"""
+
+from array import array
+from bisect import bisect_right
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from . import nodes
+from .visitor import iter_child_nodes
+
+
+class ASTIndex:
+    """Node type, parent and position index of an AST."""
+
+    def __init__(self):
+        """Create an empty index."""
+        self._by_type: Dict[str, List[nodes.Node]] = {}
+        self._parents: Dict[nodes.Node, nodes.Node] = {}
+        self._order: Dict[nodes.Node, int] = {}
+        """Node -> the number of nodes added before it. Children are added before their parents."""
+
+        self._sorted = True
+        self._bounds = array("q")
+        self._owners: List[Optional[nodes.Node]] = []
+
+    @classmethod
+    def from_node(cls, node: nodes.Node) -> "ASTIndex":
+        """Index a tree.
+
+        Args:
+            node (nodes.Node): The root of the tree.
+
+        Returns:
+            The index.
+        """
+        index = cls()
+        index.add(node)
+        return index
+
+    def __len__(self):
+        """The number of indexed nodes."""
+        return len(self._order)
+
+    def __contains__(self, node: nodes.Node) -> bool:
+        return node in self._order
+
+    def add(self, node: nodes.Node):
+        """Add the node and its descendants which are not indexed yet.
+
+        Args:
+            node (nodes.Node): The node.
+        """
+        order = self._order
+        if node in order:
+            return
+
+        # New nodes are usually added right after their children, so only the node itself is new
+        pending = [node]
+        new_nodes = []
+        while pending:
+            current = pending.pop()
+            new_nodes.append(current)
+            for child in iter_child_nodes(current):
+                self._parents[child] = current
+                if child not in order:
+                    pending.append(child)
+
+        by_type = self._by_type
+        for current in reversed(new_nodes):
+            order[current] = len(order)
+            nodes_of_type = by_type.get(current.type)
+            if nodes_of_type is None:
+                by_type[current.type] = [current]
+            else:
+                nodes_of_type.append(current)
+        self._sorted = False
+
+    def of_type(self, node_type: str) -> List[nodes.Node]:
+        """Get the nodes of an ESTree type.
+
+        Args:
+            node_type (str): The `type` field value, e.g. ``"CallExpression"``.
+
+        Returns:
+            The nodes in the source order. The list must not be changed.
+        """
+        self._sort()
+        return self._by_type.get(node_type, [])
+
+    def instances(self, cls: type) -> List[nodes.Node]:
+        """Get the nodes of a class and its subclasses.
+
+        Args:
+            cls (type): The node class, e.g. `nodes.BinaryExpression`.
+
+        Returns:
+            The nodes in the source order.
+        """
+        self._sort()
+        result = [
+            node
+            for nodes_of_type in self._by_type.values()
+            for node in nodes_of_type
+            if isinstance(node, cls)
+        ]
+        result.sort(key=self._source_order)
+        return result
+
+    def parent(self, node: nodes.Node) -> Optional[nodes.Node]:
+        """Get the parent of the node.
+
+        Args:
+            node (nodes.Node): The node.
+
+        Returns:
+            The parent node, or `None` for the root.
+        """
+        return self._parents.get(node)
+
+    def ancestors(self, node: nodes.Node) -> Iterator[nodes.Node]:
+        """Iterate over the ancestors of the node from its parent up to the root.
+
+        Args:
+            node (nodes.Node): The node.
+
+        Yields:
+            The ancestor nodes.
+        """
+        parents = self._parents
+        node = parents.get(node)
+        while node is not None:
+            yield node
+            node = parents.get(node)
+
+    def node_at(self, offset: int) -> Optional[nodes.Node]:
+        """Get the innermost node covering a character offset.
+
+        Args:
+            offset (int): The character offset in the source.
+
+        Returns:
+            The deepest node whose range includes the offset, or `None`.
+        """
+        self._sort()
+        index = bisect_right(self._bounds, offset) - 1
+        if index < 0:
+            return None
+        return self._owners[index]
+
+    def _source_order(self, node: nodes.Node) -> Tuple[float, int, int]:
+        """Sort key putting the nodes in pre-order: by start, outer nodes first."""
+        node_range = node.range
+        if node_range is None:
+            return float("inf"), 0, self._order[node]
+        # Parents are added after their children, so the order breaks ties of equal ranges
+        return node_range[0], -node_range[1], -self._order[node]
+
+    def _sort(self):
+        """Sort the type lists and compute the position segments after nodes were added."""
+        if self._sorted:
+            return
+
+        key = self._source_order
+        for nodes_of_type in self._by_type.values():
+            nodes_of_type.sort(key=key)
+
+        bounds = array("q")
+        owners: List[Optional[nodes.Node]] = []
+
+        def segment(start: int, owner: Optional[nodes.Node]):
+            if bounds and bounds[-1] == start:
+                owners[-1] = owner
+            elif not owners or owners[-1] is not owner:
+                bounds.append(start)
+                owners.append(owner)
+
+        # Sweep the ranges in pre-order keeping the stack of the nodes covering the current offset
+        ranged = [node for node in self._order if node.range is not None]
+        ranged.sort(key=key)
+        stack: List[Tuple[int, nodes.Node]] = []
+        for node in ranged:
+            start, end = node.range
+            while stack and stack[-1][0] <= start:
+                closed_end, _ = stack.pop()
+                segment(closed_end, stack[-1][1] if stack else None)
+            segment(start, node)
+            stack.append((end, node))
+        while stack:
+            closed_end, _ = stack.pop()
+            segment(closed_end, stack[-1][1] if stack else None)
+
+        self._bounds = bounds
+        self._owners = owners
+        self._sorted = True
@@ -0,0 +1,76 @@
+"""Line offset tables for computing source positions lazily.
+
+AST nodes built from a parse tree keep character offsets instead of `Position` objects. The line table of the source
+maps an offset to a line and a column with a binary search over the offsets at which the lines start.
+"""
+
+from array import array
+from bisect import bisect_right
+from typing import Optional, Union
+
+from antlr4 import InputStream
+
+from . import nodes
+
+
+class LineTable:
+    """Start offsets of the lines of a source.
+
+    Lines are separated by ``\\n`` only, the same way the ANTLR lexer counts lines, so the positions match the ones
+    of the tokens.
+    """
+
+    __slots__ = ("source", "_starts")
+
+    def __init__(self, text, source: Optional[str] = None):
+        """Index the lines of the source.
+
+        Args:
+            text: The source text. Any `str` or bytes-like object with a ``find`` method (e.g. `mmap.mmap` of an
+                ASCII file) will do.
+            source (Optional[str]): The source name used in the `SourceLocation` objects.
+        """
+        self.source = source
+
+        newline = "\n" if isinstance(text, str) else b"\n"
+        find = text.find
+        starts = array("q", [0])
+        index = find(newline)
+        while index != -1:
+            starts.append(index + 1)
+            index = find(newline, index + 1)
+        self._starts = starts
+
+    @classmethod
+    def from_stream(
+        cls, stream: InputStream, source: Optional[str] = None
+    ) -> "LineTable":
+        """Index the lines of a character stream.
+
+        Args:
+            stream (InputStream): The character stream.
+            source (Optional[str]): The source name used in the `SourceLocation` objects.
+
+        Returns:
+            The line table.
+        """
+        text: Union[str, bytes] = getattr(stream, "buffer", None)
+        if text is None:
+            text = stream.strdata
+        return cls(text, source)
+
+    def __len__(self):
+        """The number of lines."""
+        return len(self._starts)
+
+    def position(self, offset: int) -> nodes.Position:
+        """Compute the position of the character at the offset.
+
+        Args:
+            offset (int): The character offset, 0-indexed.
+
+        Returns:
+            The position of the character.
+        """
+        line = bisect_right(self._starts, offset)
+        return nodes.Position(line, offset - self._starts[line - 1])
@@ -30,9 +30,9 @@ Todo:
     * Make another attempt to split up this module
 """
 
-from typing import List, Union, Optional, Literal as TypeLiteral, Any
+from typing import List, Union, Optional, Literal as TypeLiteral, Dict, Tuple
 from enum import Enum
-from collections import OrderedDict
+from collections.abc import Mapping
 
 # The Lord sees I actually wanted to split it up, but ESTree hierarchy is so messed up... No. It's actually *fucked up*
 # that much that I couldn't even resolve circular dependencies in the submodules. I have to reap what I've sown.
@@ -130,49 +130,81 @@ class LogicalOperator(Enum):
     NULLISH_COALESCING = "??"
 
 
-# Nodes forward declarations
+_FIELD_NAMES = {"source_type": "sourceType", "super_class": "superClass"}
+"""Attribute name -> ESTree field name, for the attributes named differently."""
+
+
+# Nodes forward declarations. They have empty slots, so that nodes using them as bases (e.g. `MemberExpression`)
+# don't get `__dict__`.
 class Expression:
-    ...
+    __slots__ = ()
 
 
 class Pattern:
-    ...
+    __slots__ = ()
 
 
 class Directive:
-    ...
+    __slots__ = ()
 
 
 class Statement:
-    ...
+    __slots__ = ()
 
 
 class FunctionBody:
-    ...
+    __slots__ = ()
 
 
 class VariableDeclaration:
-    ...
+    __slots__ = ()
 
 
 class Property:
-    ...
+    __slots__ = ()
 
 
 class Identifier:
-    ...
+    __slots__ = ()
 
 
 class Literal:
-    ...
+    __slots__ = ()
 
 
 # "Node objects" block
 
 
+class FieldsView(Mapping):
+    """A read-only mapping of the ESTree field names of a node to its attribute values, in the field order.
+
+    The field order is declared once per class, so the view doesn't copy anything and always reflects the current
+    attribute values.
+    """
+
+    __slots__ = ("_obj",)
+
+    def __init__(self, obj):
+        self._obj = obj
+
+    def __getitem__(self, name: str):
+        return getattr(self._obj, self._obj._field_attrs[name])
+
+    def __iter__(self):
+        return iter(self._obj._field_names)
+
+    def __len__(self):
+        return len(self._obj._field_names)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({dict(self)!r})"
+
+
 class Position:
     """The class for an object consisting of a line number (1-indexed) and a column number (0-indexed)."""
 
+    __slots__ = ("line", "column")
+
     def __init__(self, line: int, column: int):
         if line < 1 or column < 0:
             raise ValueError(
@@ -193,18 +225,99 @@ class SourceLocation:
     Consists of a start position (the position of the first character of the parsed source region) and an end
     position (the position of the first character after the parsed source region).
 
+    Locations of the nodes built from a parse tree refer to the character offsets of their first and last tokens
+    only. Their positions are computed from the line table of the source on first access.
+
     See Also:
         Position
+        jasminesnake.ast.lines.LineTable
     """
 
+    __slots__ = (
+        "source",
+        "_start",
+        "_end",
+        "_lines",
+        "_first_start",
+        "_last_start",
+        "_last_stop",
+    )
+
+    _field_names = ("start", "end")
+    _field_attrs = {"start": "start", "end": "end"}
+
     def __init__(self, source: Optional[str], start: Position, end: Position):
         self.source = source
-        self.start = start
-        self.end = end
+        self._start = start
+        self._end = end
+        self._lines = None
+        self._first_start = self._last_start = self._last_stop = None
+
+    @classmethod
+    def from_tokens(cls, lines, first, last) -> "SourceLocation":
+        """Create a source location of a token range with lazily computed positions.
+
+        The offsets are taken from the tokens as is, so creating a location allocates nothing else.
+
+        Args:
+            lines (LineTable): The line table of the source.
+            first (antlr4.Token): The first token.
+            last (antlr4.Token): The last token.
+
+        Returns:
+            The source location.
+        """
+        loc = cls.__new__(cls)
+        loc.source = lines.source
+        loc._start = loc._end = None
+        loc._lines = lines
+        loc._first_start = first.start
+        loc._last_start = last.start
+        loc._last_stop = last.stop
+        return loc
 
     @property
-    def fields(self):
-        return OrderedDict({"start": self.start, "end": self.end})
+    def start(self) -> Position:
+        if self._start is None:
+            self._start = self._lines.position(self._first_start)
+        return self._start
+
+    @start.setter
+    def start(self, value: Position):
+        self._start = value
+
+    @property
+    def end(self) -> Position:
+        if self._end is None:
+            self._end = self._lines.position(self._last_start)
+
+            # If an end is not on a newline, shift end position column by 1
+            # to match exact token end, not the last character
+            if self._end.column != 0:
+                self._end.column += 1
+        return self._end
+
+    @end.setter
+    def end(self, value: Position):
+        self._end = value
+
+    @property
+    def range(self) -> Optional[Tuple[int, int]]:
+        """Character offsets of the start and the end of the parsed source region, if known."""
+        if self._first_start is None:
+            return None
+        return self._first_start, self._last_stop + 1
+
+    @range.setter
+    def range(self, value: Optional[Tuple[int, int]]):
+        if value is None:
+            self._first_start = self._last_stop = None
+        else:
+            self._first_start, self._last_stop = value[0], value[1] - 1
+
+    @property
+    def fields(self) -> FieldsView:
+        return FieldsView(self)
 
     def __str__(self):
         src = "" if self.source is None else f"{self.source}:"
@@ -221,23 +334,47 @@ class Node:
     The `loc` field represents the source location information of the node. If the node contains no information about
     the source location, the field is `None`; otherwise it contains a `SourceLocation` object.
 
+    Node classes declare their own attributes in `__slots__` in the ESTree field order. The ordered field list of a
+    class is derived from the slots of the class and its bases once, when the class is created.
+
     See Also:
         SourceLocation
     """
 
+    __slots__ = ("type", "loc")
+
+    _field_names: Tuple[str, ...] = ("type", "loc")
+    """ESTree field names in order."""
+
+    _field_attrs: Dict[str, str] = {"type": "type", "loc": "loc"}
+    """ESTree field name -> attribute name, in the field order."""
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+
+        field_attrs = {}
+        for klass in reversed(cls.__mro__):
+            for attr in klass.__dict__.get("__slots__", ()):
+                field_attrs[_FIELD_NAMES.get(attr, attr)] = attr
+
+        cls._field_attrs = field_attrs
+        cls._field_names = tuple(field_attrs)
+
     def __init__(self, node_type: str, loc: Optional[SourceLocation]):
         self.type = node_type
         self.loc = loc
 
-        self._fields: OrderedDict[str, Any] = OrderedDict()
-        self._fields.update({"type": self.type, "loc": self.loc})
-
     def __str__(self):
         return f"{self.type} at {str(self.loc)}"
 
     @property
-    def fields(self):
-        return self._fields
+    def range(self) -> Optional[Tuple[int, int]]:
+        """ESTree `range`: character offsets of the start and the end of the node, if known."""
+        return None if self.loc is None else self.loc.range
+
+    @property
+    def fields(self) -> FieldsView:
+        return FieldsView(self)
 
 
 # "Programs" block
@@ -246,6 +383,8 @@ class Node:
 class Program(Node):
     """A complete program source tree."""
 
+    __slots__ = ("source_type", "body")
+
     def __init__(
         self,
         loc: Optional[SourceLocation],
@@ -255,7 +394,6 @@ class Program(Node):
         super().__init__("Program", loc)
         self.body = body
         self.source_type = source_type
-        self._fields.update({"sourceType": self.source_type, "body": self.body})
 
 
 # "Functions" block
@@ -270,6 +408,8 @@ class Function(Node):
         FunctionBody
     """
 
+    __slots__ = ("id", "params", "body")
+
     def __init__(
         self,
         node_type: str,
@@ -282,7 +422,6 @@ class Function(Node):
         self.id = function_id
         self.params = params
         self.body = body
-        self._fields.update({"id": self.id, "params": self.params, "body": self.body})
 
 
 # "Statements" block
@@ -291,6 +430,8 @@ class Function(Node):
 class Statement(Node):
     """Any statement."""
 
+    __slots__ = ()
+
     def __init__(self, node_type: str, loc: Optional[SourceLocation]):
         super().__init__(node_type, loc)
 
@@ -298,6 +439,8 @@ class Statement(Node):
 class EmptyStatement(Statement):
     """An empty statement, i.e., a solitary semicolon."""
 
+    __slots__ = ()
+
     def __init__(self, loc: Optional[SourceLocation]):
         super().__init__("EmptyStatement", loc)
 
@@ -305,19 +448,21 @@ class EmptyStatement(Statement):
 class BlockStatement(Statement):
     """A block statement, i.e., a sequence of statements surrounded by braces."""
 
+    __slots__ = ("body",)
+
     def __init__(self, loc: Optional[SourceLocation], body: List[Statement]):
         super().__init__("BlockStatement", loc)
         self.body = body
-        self._fields.update({"body": self.body})
 
 
 class ExpressionStatement(Statement):
     """An expression statement, i.e., a statement consisting of a single expression."""
 
+    __slots__ = ("expression",)
+
     def __init__(self, loc: Optional[SourceLocation], expression: Expression):
         super().__init__("ExpressionStatement", loc)
         self.expression = expression
-        self._fields.update({"expression": self.expression})
 
 
 class Directive(Node):
@@ -325,20 +470,21 @@ class Directive(Node):
     source of the directive without quotes.
     """
 
+    __slots__ = ("expression", "directive")
+
     def __init__(
         self, loc: Optional[SourceLocation], expression: Literal, directive: str
     ):
         super().__init__("Directive", loc)
         self.expression = expression
         self.directive = directive
-        self._fields.update(
-            {"expression": self.expression, "directive": self.directive}
-        )
 
 
 class FunctionBody(BlockStatement):
     """The body of a function, which is a block statement that may begin with directives."""
 
+    __slots__ = ()
+
     def __init__(
         self, loc: Optional[SourceLocation], body: List[Union[Directive, Statement]]
     ):
@@ -348,33 +494,38 @@ class FunctionBody(BlockStatement):
 class ReturnStatement(Statement):
     """A `return` statement."""
 
+    __slots__ = ("argument",)
+
     def __init__(self, loc: Optional[SourceLocation], argument: Optional[Expression]):
         super().__init__("ReturnStatement", loc)
         self.argument = argument
-        self._fields.update({"argument": self.argument})
 
 
 class BreakStatement(Statement):
     """A `break` statement."""
 
+    __slots__ = ("label",)
+
     def __init__(self, loc: Optional[SourceLocation], label: Optional[Identifier]):
         super().__init__("BreakStatement", loc)
         self.label = label
-        self._fields.update({"label": self.label})
 
 
 class ContinueStatement(Statement):
     """A `continue` statement."""
 
+    __slots__ = ("label",)
+
     def __init__(self, loc: Optional[SourceLocation], label: Optional[Identifier]):
         super().__init__("ContinueStatement", loc)
         self.label = label
-        self._fields.update({"label": self.label})
 
 
 class IfStatement(Statement):
     """An `if` statement."""
 
+    __slots__ = ("test", "consequent", "alternate")
+
     def __init__(
         self,
         loc: Optional[SourceLocation],
@@ -386,42 +537,39 @@ class IfStatement(Statement):
         self.test = test
         self.consequent = consequent
         self.alternate = alternate
-        self._fields.update(
-            {
-                "test": self.test,
-                "consequent": self.consequent,
-                "alternate": self.alternate,
-            }
-        )
 
 
 class WhileStatement(Statement):
     """A `while` statement."""
 
+    __slots__ = ("test", "body")
+
     def __init__(
         self, loc: Optional[SourceLocation], test: Expression, body: Statement
     ):
         super().__init__("WhileStatement", loc)
         self.test = test
         self.body = body
-        self._fields.update({"test": self.test, "body": self.body})
 
 
 class DoWhileStatement(Statement):
     """A `do`/`while` statement."""
 
+    __slots__ = ("body", "test")
+
     def __init__(
         self, loc: Optional[SourceLocation], body: Statement, test: Expression
     ):
         super().__init__("DoWhileStatement", loc)
         self.body = body
         self.test = test
-        self._fields.update({"body": self.body, "test": self.test})
 
 
 class ForStatement(Statement):
     """A `for` statement."""
 
+    __slots__ = ("init", "test", "update", "body")
+
     def __init__(
         self,
         loc: Optional[SourceLocation],
@@ -435,19 +583,13 @@ class ForStatement(Statement):
         self.test = test
         self.update = update
         self.body = body
-        self._fields.update(
-            {
-                "init": self.init,
-                "test": self.test,
-                "update": self.update,
-                "body": self.body,
-            }
-        )
 
 
 class ForInStatement(Statement):
     """A `for`/`in` statement."""
 
+    __slots__ = ("left", "right", "body")
+
     def __init__(
         self,
         loc: Optional[SourceLocation],
@@ -459,7 +601,6 @@ class ForInStatement(Statement):
         self.left = left
         self.right = right
         self.body = body
-        self._fields.update({"left": self.left, "right": self.right, "body": self.body})
 
 
 # "Declarations" block
@@ -469,6 +610,8 @@ class Declaration(Statement):
     """Any declaration node. Note that declarations are considered statements; this is because declarations can
     appear in any statement context. """
 
+    __slots__ = ()
+
     def __init__(self, node_type: str, loc: Optional[SourceLocation]):
         super().__init__(node_type, loc)
 
@@ -476,6 +619,8 @@ class Declaration(Statement):
 class FunctionDeclaration(Function, Declaration):
     """A function declaration. Note that unlike in the parent interface `Function`, the `id` cannot be `None`."""
 
+    __slots__ = ()
+
     def __init__(
         self,
         loc: Optional[SourceLocation],
@@ -489,18 +634,21 @@ class FunctionDeclaration(Function, Declaration):
 class VariableDeclarator(Node):
     """A variable declarator."""
 
+    __slots__ = ("id", "init")
+
     def __init__(
         self, loc: Optional[SourceLocation], var_id: Pattern, init: Optional[Expression]
     ):
         super().__init__("VariableDeclarator", loc)
         self.id = var_id
         self.init = init
-        self._fields.update({"id": self.id, "init": self.init})
 
 
 class VariableDeclaration(Declaration):
     """A variable declaration."""
 
+    __slots__ = ("kind", "declarations")
+
     def __init__(
         self,
         loc: Optional[SourceLocation],
@@ -510,7 +658,6 @@ class VariableDeclaration(Declaration):
         super().__init__("VariableDeclaration", loc)
         self.declarations = declarations
         self.kind = kind
-        self._fields.update({"kind": self.kind, "declarations": self.declarations})
 
 
 # "Expressions" block
@@ -524,6 +671,8 @@ class Expression(Node):
         Pattern
     """
 
+    __slots__ = ()
+
     def __init__(self, node_type: str, loc: Optional[SourceLocation]):
         super().__init__(node_type, loc)
 
@@ -531,6 +680,8 @@ class Expression(Node):
 class Super(Node):
     """A ``super`` pseudo-expression."""
 
+    __slots__ = ()
+
     def __init__(self, loc: Optional[SourceLocation]):
         super().__init__("Super", loc)
 
@@ -538,15 +689,18 @@ class Super(Node):
 class SpreadElement(Node):
     """Spread expression, e.g., ``[head, ...iter, tail]``, ``f(head, ...iter, ...tail)``."""
 
+    __slots__ = ("argument",)
+
     def __init__(self, loc: Optional[SourceLocation], argument: Expression):
         super().__init__("SpreadElement", loc)
         self.argument = argument
-        self._fields.update({"argument": self.argument})
 
 
 class ThisExpression(Expression):
     """A `this` expression."""
 
+    __slots__ = ()
+
     def __init__(self, loc: Optional[SourceLocation]):
         super().__init__("ThisExpression", loc)
 
@@ -554,6 +708,8 @@ class ThisExpression(Expression):
 class ArrayExpression(Expression):
     """An array expression. An element might be `None` if it represents a hole in a sparse array. E.g. ``[1,,2]``."""
 
+    __slots__ = ("elements",)
+
     def __init__(
         self,
         loc: Optional[SourceLocation],
@@ -561,12 +717,13 @@ class ArrayExpression(Expression):
     ):
         super().__init__("ArrayExpression", loc)
         self.elements = elements
-        self._fields.update({"elements": self.elements})
 
 
 class ObjectExpression(Expression):
     """An object expression."""
 
+    __slots__ = ("properties",)
+
     def __init__(
         self,
         loc: Optional[SourceLocation],
@@ -574,12 +731,13 @@ class ObjectExpression(Expression):
     ):
         super().__init__("ObjectExpression", loc)
         self.properties = properties
-        self._fields.update({"properties": self.properties})
 
 
 class FunctionExpression(Function, Expression):
     """A function expression."""
 
+    __slots__ = ()
+
     def __init__(
         self,
         loc: Optional[SourceLocation],
@@ -593,6 +751,8 @@ class FunctionExpression(Function, Expression):
 class ArrowFunctionExpression(Function, Expression):
     """A fat arrow function expression, e.g., ``let foo = (bar) => { /* body */ }``."""
 
+    __slots__ = ("expression",)
+
     def __init__(
         self,
         loc: Optional[SourceLocation],
@@ -602,12 +762,13 @@ class ArrowFunctionExpression(Function, Expression):
     ):
         super().__init__("ArrowFunctionExpression", loc, None, params, body)
         self.expression = expression
-        self._fields.update({"expression": self.expression})
 
 
 class UnaryExpression(Expression):
     """A unary operator expression."""
 
+    __slots__ = ("operator", "prefix", "argument")
+
     def __init__(
         self,
         loc: Optional[SourceLocation],
@@ -619,18 +780,13 @@ class UnaryExpression(Expression):
         self.operator = operator
         self.prefix = prefix
         self.argument = argument
-        self._fields.update(
-            {
-                "operator": self.operator,
-                "prefix": self.prefix,
-                "argument": self.argument,
-            }
-        )
 
 
 class UpdateExpression(Expression):
     """An update (increment or decrement) operator expression."""
 
+    __slots__ = ("operator", "argument", "prefix")
+
     def __init__(
         self,
         loc: Optional[SourceLocation],
@@ -642,18 +798,13 @@ class UpdateExpression(Expression):
         self.operator = operator
         self.argument = argument
         self.prefix = prefix
-        self._fields.update(
-            {
-                "operator": self.operator,
-                "argument": self.argument,
-                "prefix": self.prefix,
-            }
-        )
 
 
 class BinaryExpression(Expression):
     """A binary operator expression."""
 
+    __slots__ = ("operator", "left", "right")
+
     def __init__(
         self,
         loc: Optional[SourceLocation],
@@ -665,14 +816,13 @@ class BinaryExpression(Expression):
         self.operator = operator
         self.left = left
         self.right = right
-        self._fields.update(
-            {"operator": self.operator, "left": self.left, "right": self.right}
-        )
 
 
 class AssignmentExpression(Expression):
     """An assignment operator expression."""
 
+    __slots__ = ("operator", "left", "right")
+
     def __init__(
         self,
         loc: Optional[SourceLocation],
@@ -686,14 +836,13 @@ class AssignmentExpression(Expression):
         self.operator = operator
         self.left = left
         self.right = right
-        self._fields.update(
-            {"operator": self.operator, "left": self.left, "right": self.right}
-        )
 
 
 class LogicalExpression(Expression):
     """A logical operator expression."""
 
+    __slots__ = ("operator", "left", "right")
+
     def __init__(
         self,
         loc: Optional[SourceLocation],
@@ -705,9 +854,6 @@ class LogicalExpression(Expression):
         self.operator = operator
         self.left = left
         self.right = right
-        self._fields.update(
-            {"operator": self.operator, "left": self.left, "right": self.right}
-        )
 
 
 class MemberExpression(Expression, Pattern):
@@ -715,6 +861,8 @@ class MemberExpression(Expression, Pattern):
     expression and `property` is an `Expression`. If `computed` is `False`, the node corresponds to a static
     (``a.b``) member expression and `property` is an `Identifier`. """
 
+    __slots__ = ("object", "property", "computed")
+
     def __init__(
         self,
         loc: Optional[SourceLocation],
@@ -726,18 +874,13 @@ class MemberExpression(Expression, Pattern):
         self.object = member_object
         self.property = member_property
         self.computed = computed
-        self._fields.update(
-            {
-                "object": self.object,
-                "property": self.property,
-                "computed": self.computed,
-            }
-        )
 
 
 class ConditionalExpression(Expression):
     """A conditional expression, i.e., a ternary ``?``/``:`` expression."""
 
+    __slots__ = ("test", "alternate", "consequent")
+
     def __init__(
         self,
         loc: Optional[SourceLocation],
@@ -749,18 +892,13 @@ class ConditionalExpression(Expression):
         self.test = test
         self.alternate = alternate
         self.consequent = consequent
-        self._fields.update(
-            {
-                "test": self.test,
-                "alternate": self.alternate,
-                "consequent": self.consequent,
-            }
-        )
 
 
 class CallExpression(Expression):
     """A function or method call expression."""
 
+    __slots__ = ("callee", "arguments")
+
     def __init__(
         self,
         loc: Optional[SourceLocation],
@@ -770,12 +908,13 @@ class CallExpression(Expression):
         super().__init__("CallExpression", loc)
         self.callee = callee
         self.arguments = arguments
-        self._fields.update({"callee": self.callee, "arguments": self.arguments})
 
 
 class NewExpression(Expression):
     """A ``new`` expression."""
 
+    __slots__ = ("callee", "arguments")
+
     def __init__(
         self,
         loc: Optional[SourceLocation],
@@ -785,16 +924,16 @@ class NewExpression(Expression):
         super().__init__("NewExpression", loc)
         self.callee = callee
         self.arguments = arguments
-        self._fields.update({"callee": self.callee, "arguments": self.arguments})
 
 
 class SequenceExpression(Expression):
     """A sequence expression, i.e., a comma-separated sequence of expressions."""
 
+    __slots__ = ("expressions",)
+
     def __init__(self, loc: Optional[SourceLocation], expressions: List[Expression]):
         super().__init__("SequenceExpression", loc)
         self.expressions = expressions
-        self._fields.update({"expressions": self.expressions})
 
 
 def _generate_unary_expression(operator: UnaryOperator, docstring: str):
@@ -805,6 +944,7 @@ def _generate_unary_expression(operator: UnaryOperator, docstring: str):
 
     class Expr(UnaryExpression):
         __doc__ = docstring
+        __slots__ = ()
 
         def __init__(self, loc: Optional[SourceLocation], argument: Expression):
             super().__init__(loc, operator, True, argument)
@@ -817,6 +957,7 @@ def _generate_update_expression(operator: UpdateOperator, prefix: bool, docstrin
 
     class Expr(UpdateExpression):
         __doc__ = docstring
+        __slots__ = ()
 
         def __init__(self, loc: Optional[SourceLocation], argument: Expression):
             super().__init__(loc, operator, argument, prefix)
@@ -829,6 +970,7 @@ def _generate_binary_expression(operator: BinaryOperator, docstring: str):
 
     class Expr(BinaryExpression):
         __doc__ = docstring
+        __slots__ = ()
 
         def __init__(
             self, loc: Optional[SourceLocation], left: Expression, right: Expression
@@ -843,6 +985,7 @@ def _generate_assignment_expression(operator: AssignmentOperator, docstring: str
 
     class Expr(AssignmentExpression):
         __doc__ = docstring
+        __slots__ = ()
 
         def __init__(
             self,
@@ -860,6 +1003,7 @@ def _generate_logical_expression(operator: LogicalOperator, docstring: str):
 
     class Expr(LogicalExpression):
         __doc__ = docstring
+        __slots__ = ()
 
         def __init__(
             self,
@@ -1025,6 +1169,13 @@ NullishCoalescingLogicExpression = _generate_logical_expression(
     LogicalOperator.NULLISH_COALESCING, """A nullish coalescing logical expression."""
 )
 
+# Generated classes are local to the generator functions, so give them their public names back.
+# Otherwise they can't be found by name (e.g. by `pickle`).
+for _name, _value in list(globals().items()):
+    if isinstance(_value, type) and _value.__qualname__.endswith("<locals>.Expr"):
+        _value.__name__ = _value.__qualname__ = _name
+del _name, _value
+
 
 # "Literal" block
 
@@ -1032,6 +1183,8 @@ NullishCoalescingLogicExpression = _generate_logical_expression(
 class Literal(Expression):
     """A literal token. Note that a literal can be an expression."""
 
+    __slots__ = ("value",)
+
     def __init__(
         self,
         loc: Optional[SourceLocation],
@@ -1039,7 +1192,6 @@ class Literal(Expression):
     ):
         super().__init__("Literal", loc)
         self.value = value
-        self._fields.update({"value": self.value})
 
 
 class BigIntLiteral(Literal):
@@ -1048,6 +1200,8 @@ class BigIntLiteral(Literal):
     be represented natively.
     """
 
+    __slots__ = ("bigint",)
+
     def __init__(
         self,
         loc: Optional[SourceLocation],
@@ -1056,10 +1210,11 @@ class BigIntLiteral(Literal):
     ):
         super().__init__(loc, value)
         self.bigint = bigint
-        self._fields.update({"bigint": self.bigint})
 
 
 class NullLiteral(Literal):
+    __slots__ = ()
+
     def __init__(self, loc: Optional[SourceLocation]):
         super().__init__(loc, None)
 
@@ -1068,6 +1223,8 @@ class NullLiteral(Literal):
 
 
 class BooleanLiteral(Literal):
+    __slots__ = ()
+
     def __init__(self, loc: Optional[SourceLocation], value: bool):
         super().__init__(loc, value)
 
@@ -1076,6 +1233,8 @@ class BooleanLiteral(Literal):
 
 
 class StringLiteral(Literal):
+    __slots__ = ()
+
     def __init__(self, loc: Optional[SourceLocation], value: str):
         super().__init__(loc, value)
 
@@ -1084,6 +1243,8 @@ class StringLiteral(Literal):
 
 
 class NumericLiteral(Literal):
+    __slots__ = ()
+
     def __init__(self, loc: Optional[SourceLocation], value: number):
         super().__init__(loc, value)
 
@@ -1096,6 +1257,8 @@ class Property(Node):
     property initializers have a `kind` value ``"init"``; getters and setters have the kind values ``"get"`` and
     ``"set"``, respectively. """
 
+    __slots__ = ("key", "value", "kind", "method", "shorthand", "computed")
+
     def __init__(
         self,
         loc: Optional[SourceLocation],
@@ -1113,19 +1276,11 @@ class Property(Node):
         self.method = method
         self.shorthand = shorthand
         self.computed = computed
-        self._fields.update(
-            {
-                "key": self.key,
-                "value": self.value,
-                "kind": self.kind,
-                "method": self.method,
-                "shorthand": self.shorthand,
-                "computed": self.computed,
-            }
-        )
 
 
 class AssignmentProperty(Property):
+    __slots__ = ()
+
     def __init__(
         self,
         loc: Optional[SourceLocation],
@@ -1146,18 +1301,23 @@ class AssignmentProperty(Property):
 class Pattern(Node):
     """A pattern."""
 
+    __slots__ = ()
+
     def __init__(self, node_type: str, loc: Optional[SourceLocation]):
         super().__init__(node_type, loc)
 
 
 class RestElement(Pattern):
+    __slots__ = ("argument",)
+
     def __init__(self, loc: Optional[SourceLocation], argument: Pattern):
         super().__init__("RestElement", loc)
         self.argument = argument
-        self._fields.update({"argument": self.argument})
 
 
 class ObjectPattern(Pattern):
+    __slots__ = ("properties",)
+
     def __init__(
         self,
         loc: Optional[SourceLocation],
@@ -1165,24 +1325,25 @@ class ObjectPattern(Pattern):
     ):
         super().__init__("ObjectPattern", loc)
         self.properties = properties
-        self._fields.update({"properties": self.properties})
 
 
 class ArrayPattern(Pattern):
+    __slots__ = ("elements",)
+
     def __init__(
         self, loc: Optional[SourceLocation], elements: List[Optional[Pattern]]
     ):
         super().__init__("ArrayPattern", loc)
         self.elements = elements
-        self._fields.update({"elements": self.elements})
 
 
 class AssignmentPattern(Pattern):
+    __slots__ = ("left", "right")
+
     def __init__(self, loc: Optional[SourceLocation], left: Pattern, right: Expression):
         super().__init__("AssignmentPattern", loc)
         self.left = left
         self.right = right
-        self._fields.update({"left": self.left, "right": self.right})
 
 
 # "Identifier" block
@@ -1191,16 +1352,19 @@ class AssignmentPattern(Pattern):
 class Identifier(Expression, Pattern):
     """An identifier. Note that an identifier may be an expression or a destructuring pattern."""
 
+    __slots__ = ("name",)
+
     def __init__(self, loc: Optional[SourceLocation], name: str):
         super().__init__("Identifier", loc)
         self.name = name
-        self._fields.update({"name": self.name})
 
 
 # "Classes" block
 
 
 class MethodDefinition(Node):
+    __slots__ = ("key", "value", "kind", "computed", "static")
+
     def __init__(
         self,
         loc: Optional[SourceLocation],
@@ -1216,25 +1380,19 @@ class MethodDefinition(Node):
         self.kind = kind
         self.computed = computed
         self.static = static
-        self._fields.update(
-            {
-                "key": self.key,
-                "value": self.value,
-                "kind": self.kind,
-                "computed": self.computed,
-                "static": self.static,
-            }
-        )
 
 
 class ClassBody(Node):
+    __slots__ = ("body",)
+
     def __init__(self, loc: Optional[SourceLocation], body: List[MethodDefinition]):
         super().__init__("ClassBody", loc)
         self.body = body
-        self._fields.update({"body": self.body})
 
 
 class Class(Node):
+    __slots__ = ("id", "super_class", "body")
+
     def __init__(
         self,
         node_type: str,
@@ -1247,12 +1405,11 @@ class Class(Node):
         self.id = class_id
         self.super_class = super_class
         self.body = body
-        self._fields.update(
-            {"id": self.id, "superClass": self.super_class, "body": self.body}
-        )
 
 
 class ClassDeclaration(Class, Declaration):
+    __slots__ = ()
+
     def __init__(
         self,
         loc: Optional[SourceLocation],
@@ -1264,6 +1421,8 @@ class ClassDeclaration(Class, Declaration):
 
 
 class ClassExpression(Class, Expression):
+    __slots__ = ()
+
     def __init__(
         self,
         loc: Optional[SourceLocation],
@@ -1279,13 +1438,14 @@ class MetaProperty(Expression):
     In the future, it will represent other meta properties as well.
     """
 
+    __slots__ = ("meta", "property")
+
     def __init__(
         self, loc: Optional[SourceLocation], meta: Identifier, meta_property: Identifier
     ):
         super().__init__("MetaProperty", loc)
         self.meta = (meta,)
         self.property = meta_property
-        self._fields.update({"meta": self.meta, "property": self.property})
 
 
 # "Modules" block
@@ -1294,6 +1454,8 @@ class MetaProperty(Expression):
 class ModuleDeclaration(Node):
     """A module ``import`` or ``export`` declaration."""
 
+    __slots__ = ()
+
     def __init__(self, node_type: str, loc: Optional[SourceLocation]):
         super().__init__(node_type, loc)
 
@@ -1301,12 +1463,13 @@ class ModuleDeclaration(Node):
 class ModuleSpecifier(Node):
     """A specifier in an import or export declaration."""
 
+    __slots__ = ("local",)
+
     def __init__(
         self, node_type: str, loc: Optional[SourceLocation], local: Identifier
     ):
         super().__init__(node_type, loc)
         self.local = local
-        self._fields.update({"local": self.local})
 
 
 class ImportSpecifier(ModuleSpecifier):
@@ -1317,21 +1480,24 @@ class ImportSpecifier(ModuleSpecifier):
     import, such as in ``import {foo} from "mod"``, both `imported` and `local` are
     equivalent `Identifier` nodes; in this case an `Identifier` node representing ``foo``.
     If it is an aliased import, such as in ``import {foo as bar} from "mod"``, the
-    `imported` field is an `Identifier` node representing ``foo``, and the `local` field 
+    `imported` field is an `Identifier` node representing ``foo``, and the `local` field
     is an `Identifier` node representing ``bar``.
     """
 
+    __slots__ = ("imported",)
+
     def __init__(
         self, loc: Optional[SourceLocation], local: Identifier, imported: Identifier
     ):
         super().__init__("ImportSpecifier", loc, local)
         self.imported = imported
-        self._fields.update({"imported": self.imported})
 
 
 class ImportDefaultSpecifier(ModuleSpecifier):
     """A default import specifier, e.g., ``foo`` in ``import foo from "mod.js"``."""
 
+    __slots__ = ()
+
     def __init__(self, loc: Optional[SourceLocation], local: Identifier):
         super().__init__("ImportDefaultSpecifier", loc, local)
 
@@ -1339,6 +1505,8 @@ class ImportDefaultSpecifier(ModuleSpecifier):
 class ImportNamespaceSpecifier(ModuleSpecifier):
     """A namespace import specifier, e.g., ``* as foo`` in ``import * as foo from "mod.js"``."""
 
+    __slots__ = ()
+
     def __init__(self, loc: Optional[SourceLocation], local: Identifier):
         super().__init__("ImportNamespaceSpecifier", loc, local)
 
@@ -1346,6 +1514,8 @@ class ImportNamespaceSpecifier(ModuleSpecifier):
 class ImportDeclaration(ModuleDeclaration):
     """An import declaration, e.g., ``import foo from "mod";``."""
 
+    __slots__ = ("specifiers", "source")
+
     def __init__(
         self,
         loc: Optional[SourceLocation],
@@ -1357,7 +1527,6 @@ class ImportDeclaration(ModuleDeclaration):
         super().__init__("ImportDeclaration", loc)
         self.specifiers = specifiers
         self.source = source
-        self._fields.update({"specifiers": self.specifiers, "source": self.source})
 
 
 class ImportExpression(Expression):
@@ -1366,10 +1535,11 @@ class ImportExpression(Expression):
     but it can be an arbitrary expression node.
     """
 
+    __slots__ = ("source",)
+
     def __init__(self, loc: Optional[SourceLocation], source: Expression):
         super().__init__("ImportExpression", loc)
         self.source = source
-        self._fields.update({"source": self.source})
 
 
 class ExportSpecifier(ModuleSpecifier):
@@ -1382,12 +1552,13 @@ class ExportSpecifier(ModuleSpecifier):
     ``foo``, and the `local` field is an `Identifier` node representing ``bar``.
     """
 
+    __slots__ = ("exported",)
+
     def __init__(
         self, loc: Optional[SourceLocation], local: Identifier, exported: Identifier
     ):
         super().__init__("ExportSpecifier", loc, local)
         self.exported = exported
-        self._fields.update({"exported": self.exported})
 
 
 class ExportNamedDeclaration(ModuleDeclaration):
@@ -1399,6 +1570,8 @@ class ExportNamedDeclaration(ModuleDeclaration):
         in an invalid state.
     """
 
+    __slots__ = ("declaration", "specifiers", "source")
+
     def __init__(
         self,
         loc: Optional[SourceLocation],
@@ -1410,16 +1583,11 @@ class ExportNamedDeclaration(ModuleDeclaration):
         self.declaration = declaration
         self.specifiers = specifiers
         self.source = source
-        self._fields.update(
-            {
-                "declaration": self.declaration,
-                "specifiers": self.specifiers,
-                "source": self.source,
-            }
-        )
 
 
 class AnonymousDefaultExportedFunctionDeclaration(Function):
+    __slots__ = ()
+
     def __init__(
         self, loc: Optional[SourceLocation], params: List[Pattern], body: FunctionBody
     ):
@@ -1427,6 +1595,8 @@ class AnonymousDefaultExportedFunctionDeclaration(Function):
 
 
 class AnonymousDefaultExportedClassDeclaration(Class):
+    __slots__ = ()
+
     def __init__(
         self,
         loc: Optional[SourceLocation],
@@ -1439,6 +1609,8 @@ class AnonymousDefaultExportedClassDeclaration(Class):
 class ExportDefaultDeclaration(ModuleDeclaration):
     """An export default declaration, e.g., ``export default function () {};`` or ``export default 1;``."""
 
+    __slots__ = ("declaration",)
+
     def __init__(
         self,
         loc: Optional[SourceLocation],
@@ -1452,7 +1624,6 @@ class ExportDefaultDeclaration(ModuleDeclaration):
     ):
         super().__init__("ExportDefaultDeclaration", loc)
         self.declaration = declaration
-        self._fields.update({"declaration": self.declaration})
 
 
 class ExportAllDeclaration(ModuleDeclaration):
@@ -1462,6 +1633,8 @@ class ExportAllDeclaration(ModuleDeclaration):
     name is specified using ``as``, e.g., ``export * as foo from "mod";``.
     """
 
+    __slots__ = ("source", "exported")
+
     def __init__(
         self,
         loc: Optional[SourceLocation],
@@ -1471,4 +1644,3 @@ class ExportAllDeclaration(ModuleDeclaration):
         super().__init__("ExportAllDeclaration", loc)
         self.source = source
         self.exported = exported
-        self._fields.update({"source": self.source, "exported": self.exported})
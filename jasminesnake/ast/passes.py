@@ -0,0 +1,160 @@
+"""Fused analysis passes.
+
+An analysis pass is a `NodeVisitor`: its ``visit_<Class>`` and ``leave_<Class>`` methods subscribe it to the node
+classes it cares about. `PassManager` runs any number of passes in a single traversal of the tree, calling each node's
+methods only on the passes subscribed to its class. The subscribers of a node class are looked up once per class.
+
+The manager also measures the time spent in every pass, so slow passes can be found::
+
+    manager = PassManager([UnusedVariables(), ShadowedNames()])
+    manager.run(program)
+    for name, seconds in manager.timings.items():
+        print(f"{name}: {seconds * 1000:.1f} ms")
+
+Unlike `NodeVisitor.visit`, returning `SKIP` from a method doesn't skip the children, since the other passes may need
+them.
+"""
+
+import time
+from typing import Callable, Dict, Iterable, List, Tuple
+
+from . import nodes
+from .visitor import NodeVisitor, child_fields
+
+
+class Pass(NodeVisitor):
+    """Base class of analysis passes.
+
+    Besides the visitor methods, a pass may define `begin` and `finish`, called before and after the traversal.
+    A pass can be run alone with `visit` as well.
+    """
+
+    name: str = ""
+    """The pass name in the timings. The class name by default."""
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if not cls.__dict__.get("name"):
+            cls.name = cls.__name__
+
+    def begin(self, program: nodes.Program):
+        """Called before the traversal."""
+
+    def finish(self, program: nodes.Program):
+        """Called after the traversal."""
+
+
+_Subscribers = Tuple[Tuple[int, Callable], ...]
+
+
+class PassManager:
+    """Runs passes in one traversal."""
+
+    passes: List[Pass]
+
+    timings: Dict[str, float]
+    """Pass name -> seconds spent in the pass over all the runs."""
+
+    def __init__(self, passes: Iterable[Pass] = (), timed: bool = True):
+        """Create a pass manager.
+
+        Args:
+            passes (Iterable[Pass]): The passes to run.
+            timed (bool): Whether to measure the time of the passes. Measuring adds two clock reads per call.
+        """
+        self.passes = []
+        self.timings = {}
+        self.timed = timed
+        self._dispatch: Dict[type, Tuple[_Subscribers, _Subscribers, tuple]] = {}
+        for pass_ in passes:
+            self.add(pass_)
+
+    def add(self, pass_: Pass):
+        """Add a pass, which is run after the ones added before on every node.
+
+        Args:
+            pass_ (Pass): The pass.
+        """
+        if pass_.name in self.timings:
+            raise ValueError(f"Pass {pass_.name} is added already")
+
+        self.passes.append(pass_)
+        self.timings[pass_.name] = 0.0
+        self._dispatch.clear()
+
+    def _lookup(self, cls: type) -> Tuple[_Subscribers, _Subscribers, tuple]:
+        enters = []
+        leaves = []
+        for index, pass_ in enumerate(self.passes):
+            enter, leave, _ = pass_._lookup(cls)
+            if enter is not None:
+                enters.append((index, enter))
+            if leave is not None:
+                leaves.append((index, leave))
+
+        entry = self._dispatch[cls] = (tuple(enters), tuple(leaves), child_fields(cls))
+        return entry
+
+    def run(self, program: nodes.Program):
+        """Run the passes over the tree.
+
+        Args:
+            program (nodes.Program): The root of the tree.
+        """
+        passes = self.passes
+        seconds = [0.0] * len(passes)
+        clock = time.perf_counter if self.timed else None
+
+        def call(subscribers: _Subscribers, node: nodes.Node):
+            for index, method in subscribers:
+                if clock is None:
+                    method(passes[index], node)
+                else:
+                    started = clock()
+                    method(passes[index], node)
+                    seconds[index] += clock() - started
+
+        for index, pass_ in enumerate(passes):
+            started = time.perf_counter()
+            pass_.begin(program)
+            seconds[index] += time.perf_counter() - started
+
+        dispatch = self._dispatch
+        Node = nodes.Node
+
+        # Nodes to visit, and nodes to leave wrapped in tuples
+        stack: list = [program]
+        while stack:
+            node = stack.pop()
+            if type(node) is tuple:
+                node = node[0]
+                call(dispatch[type(node)][1], node)
+                continue
+
+            entry = dispatch.get(type(node))
+            if entry is None:
+                entry = self._lookup(type(node))
+            enters, leaves, fields = entry
+
+            if enters:
+                call(enters, node)
+            if leaves:
+                stack.append((node,))
+
+            children = []
+            for attr in fields:
+                value = getattr(node, attr)
+                if isinstance(value, Node):
+                    children.append(value)
+                elif isinstance(value, list):
+                    children += [item for item in value if isinstance(item, Node)]
+            children.reverse()
+            stack += children
+
+        for index, pass_ in enumerate(passes):
+            started = time.perf_counter()
+            pass_.finish(program)
+            seconds[index] += time.perf_counter() - started
+
+        for pass_, spent in zip(passes, seconds):
+            self.timings[pass_.name] += spent
@@ -0,0 +1,270 @@
+"""AST visitor and transformer base classes.
+
+`NodeVisitor` walks a tree calling ``visit_<Class>`` methods on the way down (pre-order) and ``leave_<Class>`` methods
+on the way up (post-order). Methods are looked up along the MRO of the node class, so e.g. ``visit_BinaryExpression``
+gets every binary expression and ``visit_Node`` gets every node without a more specific method.
+
+`NodeTransformer` does the same and replaces the visited nodes with the values returned by the methods.
+
+The walk uses an explicit stack, so deeply nested trees don't hit the recursion limit. Only the fields that may hold
+nodes are walked: `child_fields` precomputes them once per node class from the constructor annotations, skipping
+`type`, `loc` and scalar fields like `name` or `operator`. The methods of a visitor class are looked up once per node
+class too.
+"""
+
+import typing
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from . import nodes
+
+SKIP = object()
+"""Return it from a ``visit_*`` method to skip the children of the node."""
+
+_NO_FIELDS = ("type", "loc")
+
+_CHILD_FIELDS: Dict[type, Tuple[str, ...]] = {}
+
+
+def _holds_nodes(hint) -> bool:
+    """Whether a value of the annotated type may be or contain a node."""
+    if isinstance(hint, type):
+        # Annotations may refer to forward declaration stubs, so take the classes by name
+        hint = getattr(nodes, hint.__name__, hint)
+        return isinstance(hint, type) and issubclass(hint, nodes.Node)
+    if isinstance(hint, str):  # A literal value
+        return False
+    return any(_holds_nodes(arg) for arg in typing.get_args(hint))
+
+
+def _field_hint(cls: type, attr: str):
+    """Find the constructor annotation of the field along the MRO.
+
+    Constructor parameters are sometimes prefixed to avoid shadowing builtins (``function_id`` for ``id``).
+    """
+    for base in cls.__mro__:
+        init = base.__dict__.get("__init__")
+        if init is None:
+            continue
+        hints = typing.get_type_hints(init, vars(nodes))
+        for name, hint in hints.items():
+            if name == attr or name.endswith("_" + attr):
+                return hint
+    return None
+
+
+def child_fields(cls: type) -> Tuple[str, ...]:
+    """Get the attribute names of the fields of a node class that may hold nodes or lists of nodes.
+
+    Args:
+        cls (type): The node class.
+
+    Returns:
+        The attribute names in the field order.
+    """
+    fields = _CHILD_FIELDS.get(cls)
+    if fields is None:
+        fields = []
+        for name, attr in cls._field_attrs.items():
+            if name in _NO_FIELDS:
+                continue
+            hint = _field_hint(cls, attr)
+            # Fields without annotations are checked when walked
+            if hint is None or _holds_nodes(hint):
+                fields.append(attr)
+        fields = _CHILD_FIELDS[cls] = tuple(fields)
+    return fields
+
+
+def iter_child_nodes(node: nodes.Node) -> Iterator[nodes.Node]:
+    """Iterate over the direct children of the node in the field order.
+
+    Args:
+        node (nodes.Node): The node.
+
+    Yields:
+        The child nodes.
+    """
+    for attr in child_fields(type(node)):
+        value = getattr(node, attr)
+        if isinstance(value, nodes.Node):
+            yield value
+        elif isinstance(value, list):
+            yield from (item for item in value if isinstance(item, nodes.Node))
+
+
+def walk(node: nodes.Node) -> Iterator[nodes.Node]:
+    """Iterate over all the nodes of the tree in pre-order.
+
+    Args:
+        node (nodes.Node): The root of the tree.
+
+    Yields:
+        The nodes.
+    """
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        yield node
+        children = list(iter_child_nodes(node))
+        children.reverse()
+        stack += children
+
+
+_Method = Optional[Callable[[Any, nodes.Node], Any]]
+
+
+class NodeVisitor:
+    """Base class of AST visitors.
+
+    Define ``visit_<Class>(self, node)`` and ``leave_<Class>(self, node)`` methods for the node classes of interest
+    and call `visit` with the root node. A ``visit_*`` method may return `SKIP` to skip the children of the node
+    (``leave_*`` is called anyway).
+    """
+
+    _dispatch: Dict[type, Tuple[_Method, _Method, Tuple[str, ...]]] = {}
+    """Node class -> ``visit_*`` function, ``leave_*`` function and child fields."""
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._dispatch = {}
+
+    @classmethod
+    def _lookup(cls, node_cls: type) -> Tuple[_Method, _Method, Tuple[str, ...]]:
+        entry = cls._dispatch.get(node_cls)
+        if entry is None:
+            enter = leave = None
+            for base in node_cls.__mro__:
+                if enter is None:
+                    enter = getattr(cls, "visit_" + base.__name__, None)
+                if leave is None:
+                    leave = getattr(cls, "leave_" + base.__name__, None)
+            entry = cls._dispatch[node_cls] = (enter, leave, child_fields(node_cls))
+        return entry
+
+    def visit(self, node: nodes.Node):
+        """Walk the tree calling the visitor methods.
+
+        Args:
+            node (nodes.Node): The root of the tree.
+        """
+        lookup = self._lookup
+        Node = nodes.Node
+
+        # Nodes to visit, and nodes to leave wrapped in tuples
+        stack: List[Any] = [node]
+        while stack:
+            node = stack.pop()
+            if type(node) is tuple:
+                node = node[0]
+                lookup(type(node))[1](self, node)
+                continue
+
+            enter, leave, fields = lookup(type(node))
+            if enter is not None and enter(self, node) is SKIP:
+                if leave is not None:
+                    leave(self, node)
+                continue
+            if leave is not None:
+                stack.append((node,))
+
+            children = []
+            for attr in fields:
+                value = getattr(node, attr)
+                if isinstance(value, Node):
+                    children.append(value)
+                elif isinstance(value, list):
+                    children += [item for item in value if isinstance(item, Node)]
+            children.reverse()
+            stack += children
+
+
+_ENTER = 0
+_LEAVE = 1
+_STORE = 2
+_ASSIGN = 3
+
+
+class NodeTransformer(NodeVisitor):
+    """Base class of AST transformers.
+
+    Like in `NodeVisitor`, ``visit_*`` methods are called in pre-order and ``leave_*`` methods in post-order, but the
+    value they return replaces the node:
+
+    * a node (the same one to keep it): the children of a node returned by ``visit_*`` are transformed then;
+    * `None`: the node is removed from its list, or the field is set to `None`;
+    * a list: the nodes are inserted into the list instead of the node, as is;
+    * `SKIP` (``visit_*`` only): the node is kept and its children are not transformed.
+
+    The nodes are changed in place.
+    """
+
+    def visit(self, node: nodes.Node) -> Any:
+        """Transform the tree.
+
+        Args:
+            node (nodes.Node): The root of the tree.
+
+        Returns:
+            The new root.
+        """
+        lookup = self._lookup
+        Node = nodes.Node
+
+        # Where a result goes: (node, attribute), (list, None) to append or (list, 0) for the root
+        root = [node]
+        # (action, value, destination) entries
+        stack: List[tuple] = [(_ENTER, node, (root, 0))]
+        while stack:
+            action, value, dest = stack.pop()
+
+            if action == _ENTER:
+                enter, _, fields = lookup(type(value))
+                if enter is not None:
+                    result = enter(self, value)
+                    if result is SKIP:
+                        stack.append((_LEAVE, value, dest))
+                        continue
+                    if not isinstance(result, Node):
+                        stack.append((_STORE, result, dest))
+                        continue
+                    if result is not value:
+                        value = result
+                        fields = lookup(type(value))[2]
+
+                stack.append((_LEAVE, value, dest))
+
+                # Children are pushed in reverse, so they're transformed in order
+                for attr in reversed(fields):
+                    field = getattr(value, attr)
+                    if isinstance(field, Node):
+                        stack.append((_ENTER, field, (value, attr)))
+                    elif isinstance(field, list):
+                        items = []
+                        stack.append((_ASSIGN, items, (value, attr)))
+                        for item in reversed(field):
+                            action = _ENTER if isinstance(item, Node) else _STORE
+                            stack.append((action, item, (items, None)))
+                continue
+
+            if action == _ASSIGN:
+                # Keep the list object, other references to it should see the changes
+                getattr(*dest)[:] = value
+                continue
+
+            if action == _LEAVE:
+                leave = lookup(type(value))[1]
+                if leave is not None:
+                    value = leave(self, value)
+
+            container, key = dest
+            if key is None:
+                if isinstance(value, list):
+                    container += value
+                elif value is not None:
+                    container.append(value)
+            elif isinstance(container, list):
+                container[key] = value
+            else:
+                setattr(container, key, value)
+
+        return root[0]
@@ -0,0 +1,211 @@
+"""Content-addressed on-disk cache of parsed ASTs.
+
+Entries are keyed by the hash of the source bytes, the package version, the cache format version and the grammar hash,
+so a cached AST is never reused for a different source, for a different lexer/parser or for a different node layout.
+Entries are evicted in least recently used order once the cache grows above its size limit.
+"""
+
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+import zlib
+from collections import OrderedDict
+from typing import Optional
+
+from antlr4.error.ErrorListener import ErrorListener
+
+from jasminesnake import __version__
+from .ast import from_parse_tree, nodes
+from .js_stream import JSFileStream, ParseMode
+from .lex import grammar_hash
+
+DEFAULT_CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")),
+    "jasminesnake",
+    "ast",
+)
+"""The default cache directory."""
+
+DEFAULT_MAX_SIZE = 256 * 1024 * 1024
+"""The default cache size limit in bytes."""
+
+FORMAT_VERSION = 1
+"""The version of the cache entry format. Bump it whenever the layout of the AST nodes changes."""
+
+_ENTRY_SUFFIX = ".ast"
+
+
+class ASTCache:
+    """On-disk AST cache.
+
+    The AST is stored as a zlib-compressed pickle. Hit and miss counters are kept for the lifetime of the object.
+    """
+
+    hits: int
+    misses: int
+
+    def __init__(
+        self, directory: str = DEFAULT_CACHE_DIR, max_size: int = DEFAULT_MAX_SIZE
+    ):
+        """Open the cache, creating the directory if needed.
+
+        Args:
+            directory (str): The cache directory.
+            max_size (int): The cache size limit in bytes.
+        """
+        if max_size < 0:
+            raise ValueError("Cache size limit can't be below 0")
+
+        self.directory = directory
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(directory, exist_ok=True)
+
+        # Entry sizes in LRU order, oldest first
+        entries = []
+        for entry in os.scandir(directory):
+            if entry.is_file() and entry.name.endswith(_ENTRY_SUFFIX):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, entry.name, stat.st_size))
+        entries.sort()
+
+        self._entries: OrderedDict[str, int] = OrderedDict(
+            (name[: -len(_ENTRY_SUFFIX)], size) for (_, name, size) in entries
+        )
+        self._size = sum(self._entries.values())
+
+    @property
+    def size(self) -> int:
+        """Total size of the cache entries in bytes."""
+        return self._size
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def key(source: bytes) -> str:
+        """Compute the cache key of the source.
+
+        Args:
+            source (bytes): The source code.
+
+        Returns:
+            The cache key.
+        """
+        digest = hashlib.sha256()
+        digest.update(f"{__version__}:{FORMAT_VERSION}:{grammar_hash()}:".encode())
+        digest.update(source)
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key + _ENTRY_SUFFIX)
+
+    def get(self, key: str) -> Optional[nodes.Program]:
+        """Get the cached AST.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            `Program` AST node or None if the AST is not cached.
+        """
+        path = self._path(key)
+        try:
+            with open(path, "rb") as file:
+                payload = file.read()
+        except FileNotFoundError:
+            self._forget(key)
+            self.misses += 1
+            return None
+
+        try:
+            program = pickle.loads(zlib.decompress(payload))
+        except Exception:
+            # Unpickling may fail in many ways, e.g. on a node class that was renamed or takes other arguments now
+            logging.warning("Corrupted AST cache entry %s, dropping it", key)
+            self._remove(key)
+            self.misses += 1
+            return None
+
+        os.utime(path)
+        if key in self._entries:
+            self._entries.move_to_end(key)
+        self.hits += 1
+        return program
+
+    def put(self, key: str, program: nodes.Program):
+        """Store the AST in the cache, evicting least recently used entries if the cache becomes too large.
+
+        Args:
+            key (str): The cache key.
+            program (nodes.Program): `Program` AST node.
+        """
+        payload = zlib.compress(pickle.dumps(program, pickle.HIGHEST_PROTOCOL))
+        if len(payload) > self.max_size:
+            logging.debug("AST of %s is larger than the whole cache, not storing", key)
+            return
+
+        # Write atomically so concurrent readers never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as file:
+            file.write(payload)
+        os.replace(tmp_path, self._path(key))
+
+        self._forget(key)
+        self._entries[key] = len(payload)
+        self._size += len(payload)
+        self._evict()
+
+    def parse_file(
+        self,
+        path: str,
+        error_listener: ErrorListener = None,
+        parse_mode: ParseMode = ParseMode.SLL_LL,
+    ) -> nodes.Program:
+        """Get the AST of the file, parsing it only if it's not cached yet.
+
+        Args:
+            path (str): The path to the file with JavaScript code.
+            error_listener (ErrorListener): The custom error listener. Uses default one if not set or set to None.
+            parse_mode (ParseMode): The prediction mode used on cache misses.
+
+        Returns:
+            `Program` AST node.
+        """
+        with open(path, "rb") as file:
+            key = self.key(file.read())
+
+        program = self.get(key)
+        if program is None:
+            tree = JSFileStream(path, error_listener, parse_mode).parse()
+            program = from_parse_tree(tree)
+            self.put(key, program)
+
+        return program
+
+    def clear(self):
+        """Remove all entries."""
+        for key in list(self._entries):
+            self._remove(key)
+
+    def _forget(self, key: str):
+        size = self._entries.pop(key, None)
+        if size is not None:
+            self._size -= size
+
+    def _remove(self, key: str):
+        self._forget(key)
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def _evict(self):
+        while self._size > self.max_size and self._entries:
+            key = next(iter(self._entries))
+            logging.debug("Evicting AST cache entry %s", key)
+            self._remove(key)
@@ -0,0 +1,170 @@
+"""Parallel batch parsing.
+
+The ANTLR Python runtime is CPU-bound and holds the GIL, so files are fanned out over a pool of worker processes.
+Every worker warms up its lexer/parser DFA caches once and then parses the files it gets. Results are yielded in
+completion order, and a failure in one file is reported in its result instead of stopping the batch.
+
+Files can also be parsed by the native parser (see `jasminesnake.native`), which needs no warm-up.
+"""
+
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Callable, Iterable, Iterator, List, NamedTuple, Optional
+
+from . import native
+from .ast import from_parse_tree, nodes
+from .js_stream import JSFileStream, JSStringStream, ParseMode
+from .lex import load_dfa_cache
+from .lex.ErrorListeners import RaiseErrorListener
+
+_WARMUP_SOURCE = """
+let a = [1, 2, ...b], c;
+{ var d = a + c * 2 - (c / 4) % 5, e = !d; }
+a += -c++ ** 2 >= --d;
+e = d === null || typeof a != "undefined" && this;
+"""
+
+BACKENDS = ("antlr", "native")
+"""Parser backends: the ANTLR parser with the AST builder, or the native parser."""
+
+
+class BatchResult(NamedTuple):
+    """The result of parsing a single file in a batch."""
+
+    path: str
+    """The path to the file."""
+
+    value: Any
+    """`Program` AST node, or whatever the postprocessing function returned for it. None if parsing failed."""
+
+    error: Optional[str]
+    """The error description if parsing failed, None otherwise."""
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def collect_js_files(paths: Iterable[str]) -> List[str]:
+    """Expand directories into the JavaScript files they contain.
+
+    Args:
+        paths: Files and directories. Directories are walked recursively for ``*.js`` files.
+
+    Returns:
+        List of file paths.
+    """
+    files = []
+    for path in paths:
+        if not os.path.isdir(path):
+            files.append(path)
+            continue
+
+        for root, dirs, filenames in os.walk(path):
+            dirs.sort()
+            files.extend(
+                os.path.join(root, name)
+                for name in sorted(filenames)
+                if name.endswith(".js")
+            )
+
+    return files
+
+
+def _init_worker(
+    parse_mode: ParseMode, dfa_cache: Optional[str] = None, backend: str = "antlr"
+):
+    """Warm up the DFA caches of the worker process lexer and parser."""
+    if backend == "native":
+        return
+    if dfa_cache is not None and load_dfa_cache(dfa_cache):
+        return
+    JSStringStream(_WARMUP_SOURCE, RaiseErrorListener(), parse_mode).parse()
+
+
+def _parse_file(
+    path: str,
+    parse_mode: ParseMode,
+    postprocess: Optional[Callable[[nodes.Program], Any]],
+    backend: str = "antlr",
+) -> BatchResult:
+    try:
+        if backend == "native":
+            value = native.parse_file(path)
+        else:
+            tree = JSFileStream(path, RaiseErrorListener(), parse_mode).parse()
+            value = from_parse_tree(tree)
+        if postprocess is not None:
+            value = postprocess(value)
+    except Exception as e:  # pylint: disable=broad-except
+        return BatchResult(path, None, f"{type(e).__name__}: {e}")
+
+    return BatchResult(path, value, None)
+
+
+def parse_many(
+    paths: Iterable[str],
+    workers: Optional[int] = None,
+    parse_mode: ParseMode = ParseMode.SLL_LL,
+    postprocess: Optional[Callable[[nodes.Program], Any]] = None,
+    dfa_cache: Optional[str] = None,
+    backend: str = "antlr",
+) -> Iterator[BatchResult]:
+    """Parse many files in parallel.
+
+    Args:
+        paths: The paths to the files with JavaScript code.
+        workers (int): The number of worker processes. Uses the number of CPUs if not set or set to None. If set to 1,
+            files are parsed in the current process.
+        parse_mode (ParseMode): The prediction mode.
+        postprocess: The function applied to every `Program` AST node in the worker process, e.g. to dump it.
+            Its result is sent back instead of the AST, so it must be picklable, as well as the function itself.
+        dfa_cache (str): The path to the DFA cache file saved by `save_dfa_cache`. Every worker loads it on startup.
+        backend (str): The parser backend, one of `BACKENDS`. The native parser ignores the prediction mode and the
+            DFA cache.
+
+    Returns:
+        Iterator over `BatchResult` objects in completion order.
+
+    Raises:
+        ValueError: If the number of workers or the backend is invalid. Raised right away, not on iteration.
+    """
+    if workers is not None and workers < 1:
+        raise ValueError("Number of workers can't be below 1")
+
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown parser backend: {backend}")
+
+    return _parse_many(paths, workers, parse_mode, postprocess, dfa_cache, backend)
+
+
+def _parse_many(
+    paths: Iterable[str],
+    workers: Optional[int],
+    parse_mode: ParseMode,
+    postprocess: Optional[Callable[[nodes.Program], Any]],
+    dfa_cache: Optional[str],
+    backend: str,
+) -> Iterator[BatchResult]:
+    if workers == 1:
+        _init_worker(parse_mode, dfa_cache, backend)
+        for path in paths:
+            yield _parse_file(path, parse_mode, postprocess, backend)
+        return
+
+    with ProcessPoolExecutor(
+        workers, initializer=_init_worker, initargs=(parse_mode, dfa_cache, backend)
+    ) as pool:
+        futures = {
+            pool.submit(_parse_file, path, parse_mode, postprocess, backend): path
+            for path in paths
+        }
+
+        for future in as_completed(futures):
+            try:
+                yield future.result()
+            except Exception as e:  # pylint: disable=broad-except
+                # The worker died (e.g. ran out of memory) or the result could not be sent back
+                logging.error("Worker failed on %s: %s", futures[future], e)
+                yield BatchResult(futures[future], None, f"{type(e).__name__}: {e}")
@@ -0,0 +1,136 @@
+"""Compact character streams for the lexer.
+
+ANTLR's `InputStream` converts the whole source into a list of code point integers, which costs 8+ bytes per
+character. The streams below index the source in place instead, so `LA`, `seek` and `getText` stay O(1) and never
+copy the buffer.
+"""
+
+import mmap
+import re
+from typing import Union
+
+from antlr4 import InputStream
+from antlr4.Token import Token
+
+_NON_ASCII = re.compile(rb"[\x80-\xff]")
+
+
+class CompactInputStream(InputStream):
+    """Character stream backed directly by a `str`.
+
+    CPython strings are stored with 1, 2 or 4 bytes per character depending on the widest code point, so this is the
+    smallest random-access representation of the source available without copying it.
+    """
+
+    def __init__(self, data: str, name: str = "<empty>"):
+        """Instantiate a string stream.
+
+        Args:
+            data (str): The source text.
+            name (str): The source name.
+        """
+        self.name = name
+        self.strdata = data
+        self._index = 0
+        self._size = len(data)
+
+    def _loadString(self):
+        self._index = 0
+
+    @property
+    def buffer(self) -> Union[str, mmap.mmap]:
+        """The underlying buffer. Its indices are the character offsets of the stream."""
+        return self.strdata
+
+    def LA(self, offset: int):
+        if offset == 0:
+            return 0  # undefined
+        if offset < 0:
+            offset += 1  # e.g., translate LA(-1) to use offset=0
+        pos = self._index + offset - 1
+        if pos < 0 or pos >= self._size:
+            return Token.EOF
+        return ord(self.strdata[pos])
+
+    def getText(self, start: int, stop: int):
+        if start >= self._size:
+            return ""
+        return self.strdata[start : stop + 1]
+
+    def __str__(self):
+        return self.strdata
+
+
+class MappedFileStream(CompactInputStream):
+    """Character stream backed by a memory-mapped file.
+
+    ASCII-only files (which is the usual case for minified bundles) are read straight from the mapping, one byte per
+    character. Files with other characters are decoded once into a compact `str` and handled like
+    `CompactInputStream`.
+    """
+
+    _mmap = None
+
+    def __init__(self, path: str, encoding: str = "utf-8"):
+        """Instantiate a memory-mapped file stream.
+
+        Args:
+            path (str): The path to the file.
+            encoding (str): The file encoding. Only used if the file is not pure ASCII.
+        """
+        with open(path, "rb") as file:
+            try:
+                buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # Empty files can't be mapped
+                buffer = None
+
+        if buffer is not None and _NON_ASCII.search(buffer) is None:
+            super().__init__("", path)
+            self._mmap = buffer
+            self._size = len(buffer)
+        else:
+            data = b"" if buffer is None else buffer[:]
+            if buffer is not None:
+                buffer.close()
+            super().__init__(data.decode(encoding), path)
+
+        self.fileName = path
+
+    @property
+    def buffer(self) -> Union[str, mmap.mmap]:
+        if self._mmap is None:
+            return super().buffer
+        return self._mmap
+
+    def LA(self, offset: int):
+        if self._mmap is None:
+            return super().LA(offset)
+
+        if offset == 0:
+            return 0  # undefined
+        if offset < 0:
+            offset += 1  # e.g., translate LA(-1) to use offset=0
+        pos = self._index + offset - 1
+        if pos < 0 or pos >= self._size:
+            return Token.EOF
+        return self._mmap[pos]
+
+    def getText(self, start: int, stop: int):
+        if self._mmap is None:
+            return super().getText(start, stop)
+
+        if start >= self._size:
+            return ""
+        return self._mmap[start : stop + 1].decode("ascii")
+
+    def close(self):
+        """Release the memory mapping. The stream can't be read afterwards."""
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+            self._size = 0
+
+    def __str__(self):
+        if self._mmap is None:
+            return self.strdata
+        return self._mmap[:].decode("ascii")
@@ -1,13 +1,399 @@
 """A module for JavaScript code stream creation and its parsing. """
-from antlr4 import InputStream, CommonTokenStream, FileStream, StdinStream
-from antlr4.error.ErrorListener import ErrorListener
+import logging
+import sys
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from enum import Enum
+from typing import Iterator, Optional, Union
 
+from antlr4 import InputStream, CommonTokenStream, Token
+from antlr4.atn.ATN import ATN
+from antlr4.atn.PredictionMode import PredictionMode
+from antlr4.atn.Transition import RuleTransition
+from antlr4.error.ErrorListener import ErrorListener, ConsoleErrorListener
+from antlr4.error.ErrorStrategy import BailErrorStrategy, DefaultErrorStrategy
+from antlr4.error.Errors import ParseCancellationException, RecognitionException
+
+from .ast import nodes
+from .ast.builder import ASTBuilder
+from .char_streams import CompactInputStream, MappedFileStream
 from .lex import JavaScriptLexer, JavaScriptParser
+from .lex.PrecedenceClimbing import PrecedenceClimbingParser
+from .lex.RegexLexer import RegexLexer
 
 JSL = JavaScriptLexer.JavaScriptLexer
 JSP = JavaScriptParser.JavaScriptParser
 
 
+class ParseMode(Enum):
+    """Prediction mode used by the parser.
+
+    `SLL` is much faster than `LL`, but may fail on some valid inputs. `SLL_LL` tries `SLL` with a bail-out error
+    strategy first and reparses the token stream in full `LL` mode only if the first stage fails.
+    """
+
+    LL = "ll"
+    SLL = "sll"
+    SLL_LL = "sll-ll"
+
+
+parse_stage_stats: Counter = Counter()
+"""How many times each stage (`ParseMode.SLL` or `ParseMode.LL`) has produced a parse tree in this process."""
+
+
+class TrimmableTokenStream(CommonTokenStream):
+    """Token stream which can drop the tokens that were already consumed.
+
+    `CommonTokenStream` keeps every token of the input until the stream is reset, this one can be trimmed between
+    top-level statements to keep memory usage bounded.
+    """
+
+    def trim(self):
+        """Drop the consumed tokens.
+
+        The last consumed on-channel token and hidden tokens after it are kept, since parser predicates look behind
+        the current token. Token indices are shifted, so it must not be called while anything holds an index into the
+        stream, e.g. during prediction or error recovery.
+        """
+        if self.index <= 0:
+            return
+
+        keep_from = self.previousTokenOnChannel(self.index - 1, self.channel)
+        if keep_from <= 0:
+            return
+
+        del self.tokens[:keep_from]
+        for token in self.tokens:
+            token.tokenIndex -= keep_from
+        self.index -= keep_from
+
+
+def _invoking_state(atn: ATN, caller_rule: int, callee_rule: int) -> int:
+    """Find the ATN state in which `caller_rule` invokes `callee_rule`."""
+    callee_start = atn.ruleToStartState[callee_rule]
+    for state in atn.states:
+        if state is None or state.ruleIndex != caller_rule:
+            continue
+        for transition in state.transitions:
+            if (
+                isinstance(transition, RuleTransition)
+                and transition.target is callee_start
+            ):
+                return state.stateNumber
+
+    raise ValueError(f"Rule {caller_rule} does not invoke rule {callee_rule}")
+
+
+class ParserSession:
+    """Reusable lexer, token stream and parser.
+
+    Building a lexer and a parser with their simulators takes longer than parsing a one-line input, so a session
+    creates them, the error strategies and the error listeners once and resets them for every input. The learned DFA
+    states are shared by all lexers and parsers anyway.
+
+    A session must not be used by several threads at once (it raises `RuntimeError` in that case), hold one per
+    thread instead, e.g. in a `threading.local`.
+
+    Notes:
+        Creating a lexer, a token stream and a parser takes ~0.03 ms, that's what a session saves on every parse.
+        It's small compared to parsing even a one-line input (~17 ms for ``a = 1 + 2;`` with warm DFAs), which is
+        dominated by the lexer computing its start state for every token: the `HashBangLine` rule predicate prevents
+        the lexer from caching it. `RegexLexer` (``regex_lexer=True``) produces the same tokens without simulating
+        the lexer ATN.
+    """
+
+    lexer: Union[JSL, RegexLexer]
+    tokens: TrimmableTokenStream
+    parser: JSP
+    parse_mode: ParseMode = ParseMode.SLL_LL
+    parse_stage: Optional[ParseMode] = None
+    """The stage which produced the last parse tree, either `ParseMode.SLL` or `ParseMode.LL`."""
+
+    def __init__(
+        self,
+        error_listener: ErrorListener = None,
+        parse_mode: ParseMode = ParseMode.SLL_LL,
+        regex_lexer: bool = False,
+    ):
+        """Create a session.
+
+        Args:
+            error_listener (ErrorListener): The custom error listener. Uses default one if not set or set to None.
+            parse_mode (ParseMode): The default prediction mode. Uses two-stage SLL/LL parsing if not set.
+            regex_lexer (bool): Whether to tokenize the input with `RegexLexer` instead of the generated lexer.
+        """
+        self.parse_mode = parse_mode
+
+        lexer_class = RegexLexer if regex_lexer else JSL
+        self.lexer = lexer_class(CompactInputStream(""))
+        self.tokens = TrimmableTokenStream(self.lexer)
+        self.parser = PrecedenceClimbingParser(self.tokens)
+
+        self._error_listeners = [
+            ConsoleErrorListener.INSTANCE if error_listener is None else error_listener
+        ]
+        self._bail_strategy = BailErrorStrategy()
+        self._default_strategy = DefaultErrorStrategy()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def _in_use(self):
+        if not self._lock.acquire(blocking=False):
+            raise RuntimeError(
+                "The parser session is already in use, use a session per thread"
+            )
+
+        try:
+            yield
+        finally:
+            self._lock.release()
+
+    def _use_error_listeners(self):
+        self.parser.removeErrorListeners()
+        for listener in self._error_listeners:
+            self.parser.addErrorListener(listener)
+
+    def parse(
+        self, input_stream: InputStream, mode: Optional[ParseMode] = None
+    ) -> JSP.ProgramContext:
+        """Parse the character stream.
+
+        Args:
+            input_stream (InputStream): The character stream with JavaScript code.
+            mode (ParseMode): The prediction mode. Uses the one set in the constructor if not set or set to None.
+
+        Returns:
+            Program context.
+        """
+        with self._in_use():
+            return self._parse(input_stream, self.parse_mode if mode is None else mode)
+
+    def parse_string(
+        self, string: str, mode: Optional[ParseMode] = None
+    ) -> JSP.ProgramContext:
+        """Parse the string.
+
+        Args:
+            string (str): The string with JavaScript code.
+            mode (ParseMode): The prediction mode. Uses the one set in the constructor if not set or set to None.
+
+        Returns:
+            Program context.
+        """
+        return self.parse(CompactInputStream(string), mode)
+
+    def parse_file(
+        self, path: str, mode: Optional[ParseMode] = None
+    ) -> JSP.ProgramContext:
+        """Parse the file.
+
+        Args:
+            path (str): The path to the file with JavaScript code.
+            mode (ParseMode): The prediction mode. Uses the one set in the constructor if not set or set to None.
+
+        Returns:
+            Program context.
+        """
+        return self.parse(MappedFileStream(path), mode)
+
+    def check(
+        self, input_stream: InputStream, mode: Optional[ParseMode] = None
+    ) -> bool:
+        """Check the syntax of the character stream.
+
+        The parser runs without building the parse tree. It still does all the token predictions, which take most of the
+        parsing time, so it's hardly faster than `parse`. Syntax errors are still reported to the error listener.
+
+        Args:
+            input_stream (InputStream): The character stream with JavaScript code.
+            mode (ParseMode): The prediction mode. Uses the one set in the constructor if not set or set to None.
+
+        Returns:
+            True if there are no syntax errors, False otherwise.
+        """
+        with self._in_use():
+            self.parser.buildParseTrees = False
+            try:
+                self._parse(input_stream, self.parse_mode if mode is None else mode)
+            finally:
+                self.parser.buildParseTrees = True
+
+            return self.parser.getNumberOfSyntaxErrors() == 0
+
+    def iter_statements(
+        self, input_stream: InputStream, mode: Optional[ParseMode] = None
+    ) -> Iterator[nodes.Statement]:
+        """Parse the character stream one top-level statement at a time.
+
+        Unlike `parse`, it never builds the whole parse tree: the parse tree of every top-level statement and its
+        tokens are dropped once its AST is built, so memory usage is proportional to the largest statement rather than
+        to the whole input. With `ParseMode.SLL_LL` the LL fallback reparses only the statement that failed.
+
+        The session is busy until the iterator is exhausted or closed.
+
+        Args:
+            input_stream (InputStream): The character stream with JavaScript code.
+            mode (ParseMode): The prediction mode. Uses the one set in the constructor if not set or set to None.
+
+        Yields:
+            `Statement` AST nodes, in source order.
+        """
+        with self._in_use():
+            yield from self._iter_statements(
+                input_stream, self.parse_mode if mode is None else mode
+            )
+
+    def _reset(self, input_stream: InputStream):
+        input_stream.seek(0)
+        self.lexer.inputStream = input_stream  # Resets the lexer
+        self.tokens.setTokenSource(self.lexer)  # Drops the tokens of the last input
+
+    def _parse(self, input_stream: InputStream, mode: ParseMode) -> JSP.ProgramContext:
+        parser = self.parser
+        self._reset(input_stream)
+
+        if mode is ParseMode.SLL_LL:
+            parser._errHandler = self._bail_strategy
+            # Resets the parser and its error strategy
+            parser.setTokenStream(self.tokens)
+            parser._interp.predictionMode = PredictionMode.SLL
+            parser.removeErrorListeners()
+
+            try:
+                tree = parser.program()
+                self.parse_stage = ParseMode.SLL
+            except ParseCancellationException:
+                logging.debug("SLL parsing failed, falling back to LL")
+                parser._errHandler = self._default_strategy
+                parser._interp.predictionMode = PredictionMode.LL
+                parser.reset()  # Rewinds the token stream, no relexing needed
+                self._use_error_listeners()
+
+                tree = parser.program()
+                self.parse_stage = ParseMode.LL
+        else:
+            parser._errHandler = self._default_strategy
+            parser.setTokenStream(self.tokens)
+            parser._interp.predictionMode = (
+                PredictionMode.SLL if mode is ParseMode.SLL else PredictionMode.LL
+            )
+            self._use_error_listeners()
+
+            tree = parser.program()
+            self.parse_stage = mode
+
+        parse_stage_stats[self.parse_stage] += 1
+        return tree
+
+    def _iter_statements(
+        self, input_stream: InputStream, mode: ParseMode
+    ) -> Iterator[nodes.Statement]:
+        # Mimics the generated `program` and `sourceElements` rules, so that the parser has the same rule context
+        # stack (LL prediction depends on it), but takes the source elements one by one
+        parser = self.parser
+        atn = parser.atn
+        builder = ASTBuilder()
+        self._reset(input_stream)
+
+        parser._errHandler = self._default_strategy
+        parser.setTokenStream(self.tokens)
+        self._set_stage(mode)
+        self.parse_stage = ParseMode.SLL if mode is ParseMode.SLL_LL else mode
+
+        program = JSP.ProgramContext(parser, None, parser.state)
+        parser.enterRule(
+            program,
+            atn.ruleToStartState[JSP.RULE_program].stateNumber,
+            JSP.RULE_program,
+        )
+        parser.enterOuterAlt(program, 1)
+        if self.tokens.LA(1) == JSP.HashBangLine:
+            parser.match(JSP.HashBangLine)
+
+        parser.state = _invoking_state(atn, JSP.RULE_program, JSP.RULE_sourceElements)
+        elements = JSP.SourceElementsContext(parser, program, parser.state)
+        parser.enterRule(
+            elements,
+            atn.ruleToStartState[JSP.RULE_sourceElements].stateNumber,
+            JSP.RULE_sourceElements,
+        )
+        parser.enterOuterAlt(elements, 1)
+        element_state = _invoking_state(
+            atn, JSP.RULE_sourceElements, JSP.RULE_sourceElement
+        )
+
+        while self.tokens.LA(1) != Token.EOF:
+            parser.state = element_state
+            if mode is ParseMode.SLL_LL:
+                element = self._parse_element_sll_ll(elements, element_state)
+            else:
+                element = parser.sourceElement()
+
+            yield builder.visit(element.statement())
+
+            elements.removeLastChild()
+            # Recovering error strategy holds token indices
+            if parser.getNumberOfSyntaxErrors() == 0:
+                self.tokens.trim()
+
+        parser.exitRule()
+
+        try:
+            parser.match(Token.EOF)
+        except RecognitionException as e:
+            program.exception = e
+            parser._errHandler.reportError(parser, e)
+            parser._errHandler.recover(parser, e)
+        finally:
+            parser.exitRule()
+
+        parse_stage_stats[self.parse_stage] += 1
+
+    def _set_stage(self, mode: ParseMode):
+        """Configure the parser for the mode, `ParseMode.SLL_LL` stands for its first (bailing SLL) stage."""
+        parser = self.parser
+        if mode is ParseMode.SLL_LL:
+            parser._errHandler = self._bail_strategy
+            parser.removeErrorListeners()
+        else:
+            parser._errHandler = self._default_strategy
+            self._use_error_listeners()
+
+        parser._interp.predictionMode = (
+            PredictionMode.LL if mode is ParseMode.LL else PredictionMode.SLL
+        )
+        parser._errHandler.reset(parser)
+
+    def _parse_element_sll_ll(
+        self, elements: JSP.SourceElementsContext, element_state: int
+    ) -> JSP.SourceElementContext:
+        parser = self.parser
+        start = self.tokens.index
+
+        try:
+            return parser.sourceElement()
+        except ParseCancellationException:
+            logging.debug("SLL parsing failed, falling back to LL for one statement")
+
+        # The rule contexts were exited on the way out, drop the failed element and the exception the bail
+        # strategy has put on its parents
+        elements.removeLastChild()
+        ctx = elements
+        while ctx is not None:
+            ctx.exception = None
+            ctx = ctx.parentCtx
+
+        self.tokens.seek(start)
+        self._set_stage(ParseMode.LL)
+        self.parse_stage = ParseMode.LL
+        try:
+            parser.state = element_state
+            return parser.sourceElement()
+        finally:
+            self._set_stage(ParseMode.SLL_LL)
+
+
 class JSBaseStream:
     """JavaScript stream base class.
 
@@ -24,31 +410,70 @@ class JSBaseStream:
     _error_listener = None
     lexer = None
     parser = None
+    parse_mode: ParseMode = ParseMode.SLL_LL
+    parse_stage: Optional[ParseMode] = None
+    """The stage which produced the last parse tree, either `ParseMode.SLL` or `ParseMode.LL`."""
 
-    def __init__(self, error_listener):
+    def __init__(self, error_listener, parse_mode: ParseMode = ParseMode.SLL_LL):
         if self is JSBaseStream:
             raise TypeError(
                 "JSReader is a base class, you should instantiate its subclasses instead."
             )
 
         self._error_listener = error_listener
+        self.parse_mode = parse_mode
 
-    def parse(self) -> JSP.ProgramContext:
+    def parse(self, mode: Optional[ParseMode] = None) -> JSP.ProgramContext:
         """Parse the stream.
 
+        Args:
+            mode (ParseMode): The prediction mode. Uses the one set in the constructor if not set or set to None.
+
         Returns:
             Program context.
         """
-        self.lexer = JSL(self._input_stream)
-        stream = CommonTokenStream(self.lexer)
-        self.parser = JSP(stream)
+        session = ParserSession(self._error_listener, self.parse_mode)
+        tree = session.parse(self._input_stream, mode)
+
+        self.lexer = session.lexer
+        self.parser = session.parser
+        self.parse_stage = session.parse_stage
+        return tree
+
+    def check(self, mode: Optional[ParseMode] = None) -> bool:
+        """Check the syntax of the stream without building the parse tree, see `ParserSession.check`.
+
+        Args:
+            mode (ParseMode): The prediction mode. Uses the one set in the constructor if not set or set to None.
+
+        Returns:
+            True if there are no syntax errors, False otherwise.
+        """
+        session = ParserSession(self._error_listener, self.parse_mode)
+        valid = session.check(self._input_stream, mode)
+
+        self.lexer = session.lexer
+        self.parser = session.parser
+        self.parse_stage = session.parse_stage
+        return valid
+
+    def iter_statements(
+        self, mode: Optional[ParseMode] = None
+    ) -> Iterator[nodes.Statement]:
+        """Parse the stream one top-level statement at a time, see `ParserSession.iter_statements`.
 
-        # Register error listener if present
-        if self._error_listener is not None:
-            self.parser.removeErrorListeners()
-            self.parser.addErrorListener(self._error_listener)
+        Args:
+            mode (ParseMode): The prediction mode. Uses the one set in the constructor if not set or set to None.
+
+        Yields:
+            `Statement` AST nodes, in source order.
+        """
+        session = ParserSession(self._error_listener, self.parse_mode)
+        self.lexer = session.lexer
+        self.parser = session.parser
 
-        return self.parser.program()
+        yield from session.iter_statements(self._input_stream, mode)
+        self.parse_stage = session.parse_stage
 
 
 class JSStringStream(JSBaseStream):
@@ -60,15 +485,21 @@ class JSStringStream(JSBaseStream):
         JSStdinStream
     """
 
-    def __init__(self, string: str, error_listener: ErrorListener = None):
+    def __init__(
+        self,
+        string: str,
+        error_listener: ErrorListener = None,
+        parse_mode: ParseMode = ParseMode.SLL_LL,
+    ):
         """Instantiate a string stream.
 
         Args:
             string (str): The string with JavaScript code.
             error_listener (ErrorListener): The custom error listener. Uses default one if not set or set to None.
+            parse_mode (ParseMode): The prediction mode. Uses two-stage SLL/LL parsing if not set.
         """
-        super().__init__(error_listener)
-        self._input_stream = InputStream(string)
+        super().__init__(error_listener, parse_mode)
+        self._input_stream = CompactInputStream(string)
 
 
 class JSStdinStream(JSBaseStream):
@@ -80,14 +511,19 @@ class JSStdinStream(JSBaseStream):
         JSStringStream
     """
 
-    def __init__(self, error_listener: ErrorListener = None):
+    def __init__(
+        self,
+        error_listener: ErrorListener = None,
+        parse_mode: ParseMode = ParseMode.SLL_LL,
+    ):
         """Instantiate a string stream.
 
         Args:
             error_listener (ErrorListener): The custom error listener. Uses default one if not set or set to None.
+            parse_mode (ParseMode): The prediction mode. Uses two-stage SLL/LL parsing if not set.
         """
-        super().__init__(error_listener)
-        self._input_stream = StdinStream("utf-8")
+        super().__init__(error_listener, parse_mode)
+        self._input_stream = CompactInputStream(sys.stdin.read(), "<stdin>")
 
 
 class JSFileStream(JSBaseStream):
@@ -99,12 +535,18 @@ class JSFileStream(JSBaseStream):
         JSStdinStream
     """
 
-    def __init__(self, path: str, error_listener: ErrorListener = None):
+    def __init__(
+        self,
+        path: str,
+        error_listener: ErrorListener = None,
+        parse_mode: ParseMode = ParseMode.SLL_LL,
+    ):
         """Instantiate a string stream.
 
         Args:
             path (str): The path to the file with JavaScript code.
             error_listener (ErrorListener): The custom error listener. Uses default one if not set or set to None.
+            parse_mode (ParseMode): The prediction mode. Uses two-stage SLL/LL parsing if not set.
         """
-        super().__init__(error_listener)
-        self._input_stream = FileStream(path)
+        super().__init__(error_listener, parse_mode)
+        self._input_stream = MappedFileStream(path)
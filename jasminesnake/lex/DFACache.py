@@ -0,0 +1,411 @@
+"""Persistent DFA cache for the lexer and the parser.
+
+ANTLR simulators learn DFA states while parsing, and every new process starts with empty DFAs, so the first few files
+are parsed several times slower than the steady state. This module serializes the learned DFA states of
+`JavaScriptLexer` and `JavaScriptParser` to a file and loads them back in another process.
+
+DFA states refer to ATN states, prediction contexts, semantic contexts and lexer actions. They are stored as plain
+tuples of numbers (ATN objects by their index in the ATN), so the file does not depend on the runtime internals.
+The file carries the grammar hash and is ignored if it does not match the generated lexer/parser.
+"""
+
+import logging
+import pickle
+import zlib
+from functools import reduce
+from typing import Dict, Iterable, List, Optional
+
+from antlr4 import CommonTokenStream, FileStream
+from antlr4.PredictionContext import (
+    PredictionContext,
+    SingletonPredictionContext,
+    ArrayPredictionContext,
+)
+from antlr4.atn.ATN import ATN
+from antlr4.atn.ATNConfig import ATNConfig, LexerATNConfig
+from antlr4.atn.ATNConfigSet import ATNConfigSet
+from antlr4.atn.ATNSimulator import ATNSimulator
+from antlr4.atn.LexerAction import LexerIndexedCustomAction
+from antlr4.atn.LexerActionExecutor import LexerActionExecutor
+from antlr4.atn.SemanticContext import (
+    SemanticContext,
+    Predicate,
+    PrecedencePredicate,
+    AND,
+    OR,
+)
+from antlr4.dfa.DFA import DFA
+from antlr4.dfa.DFAState import DFAState, PredPrediction
+
+from .JavaScriptLexer import JavaScriptLexer
+from .JavaScriptParser import JavaScriptParser
+from .PrecedenceClimbing import PrecedenceClimbingParser
+
+FORMAT_VERSION = 1
+"""The version of the cache file format."""
+
+_NONE = -1
+_EMPTY = -2
+_ERROR = -3
+
+
+class _Encoder:
+    """Converts DFAs of a single recognizer into tuples of numbers."""
+
+    def __init__(self, atn: ATN):
+        self.contexts: List[tuple] = []
+        self.semantics: List[tuple] = []
+        self._context_ids: Dict[int, int] = {}
+        self._semantic_ids: Dict[int, int] = {}
+        self._actions = {id(action): i for i, action in enumerate(atn.lexerActions or [])}
+
+    def context(self, ctx: Optional[PredictionContext]) -> int:
+        if ctx is None:
+            return _NONE
+        if ctx is PredictionContext.EMPTY:
+            return _EMPTY
+
+        key = id(ctx)
+        if key not in self._context_ids:
+            if isinstance(ctx, ArrayPredictionContext):
+                entry = (
+                    tuple(self.context(parent) for parent in ctx.parents),
+                    tuple(ctx.returnStates),
+                )
+            else:
+                entry = (self.context(ctx.parentCtx), ctx.returnState)
+            self._context_ids[key] = len(self.contexts)
+            self.contexts.append(entry)
+
+        return self._context_ids[key]
+
+    def semantic(self, sem: Optional[SemanticContext]) -> int:
+        if sem is None:
+            return _NONE
+        if sem is SemanticContext.NONE:
+            return _EMPTY
+
+        key = id(sem)
+        if key not in self._semantic_ids:
+            if isinstance(sem, Predicate):
+                entry = ("p", sem.ruleIndex, sem.predIndex, sem.isCtxDependent)
+            elif isinstance(sem, PrecedencePredicate):
+                entry = ("pp", sem.precedence)
+            elif isinstance(sem, AND):
+                entry = ("and",) + tuple(self.semantic(op) for op in sem.opnds)
+            elif isinstance(sem, OR):
+                entry = ("or",) + tuple(self.semantic(op) for op in sem.opnds)
+            else:
+                raise TypeError(f"Unknown semantic context {type(sem).__name__}")
+            self._semantic_ids[key] = len(self.semantics)
+            self.semantics.append(entry)
+
+        return self._semantic_ids[key]
+
+    def action(self, action) -> tuple:
+        if isinstance(action, LexerIndexedCustomAction):
+            return (action.offset, self._actions[id(action.action)])
+        return (_NONE, self._actions[id(action)])
+
+    def executor(self, executor: Optional[LexerActionExecutor]) -> Optional[tuple]:
+        if executor is None:
+            return None
+        return tuple(self.action(action) for action in executor.lexerActions)
+
+    def config(self, config: ATNConfig) -> tuple:
+        entry = (
+            config.state.stateNumber,
+            config.alt,
+            self.context(config.context),
+            self.semantic(config.semanticContext),
+            config.reachesIntoOuterContext,
+            config.precedenceFilterSuppressed,
+        )
+        if isinstance(config, LexerATNConfig):
+            entry += (
+                self.executor(config.lexerActionExecutor),
+                config.passedThroughNonGreedyDecision,
+            )
+        return entry
+
+    def configs(self, configs: ATNConfigSet) -> tuple:
+        return (
+            configs.fullCtx,
+            tuple(self.config(config) for config in configs.configs),
+            configs.uniqueAlt,
+            None if configs.conflictingAlts is None else tuple(configs.conflictingAlts),
+            configs.hasSemanticContext,
+            configs.dipsIntoOuterContext,
+        )
+
+    def dfa(self, dfa: DFA) -> Optional[tuple]:
+        if dfa.s0 is None and not dfa.states:
+            return None
+
+        # Lexer DFAs may have no start state (e.g. if it has predicates), but their states are still reused
+        registered = {id(state) for state in dfa.states}
+        states: List[DFAState] = [] if dfa.s0 is None else [dfa.s0]
+        state_ids = {id(state): i for i, state in enumerate(states)}
+        for state in dfa.states:
+            if id(state) not in state_ids:
+                state_ids[id(state)] = len(states)
+                states.append(state)
+
+        def state_id(state: Optional[DFAState]) -> int:
+            if state is None:
+                return _NONE
+            if state is ATNSimulator.ERROR:
+                return _ERROR
+            if id(state) not in state_ids:  # Not registered in the DFA, shouldn't happen
+                state_ids[id(state)] = len(states)
+                states.append(state)
+            return state_ids[id(state)]
+
+        encoded = []
+        index = 0
+        while index < len(states):  # `states` may grow while encoding edges
+            state = states[index]
+            encoded.append(
+                (
+                    state.stateNumber,
+                    self.configs(state.configs),
+                    None
+                    if state.edges is None
+                    else tuple(state_id(edge) for edge in state.edges),
+                    state.isAcceptState,
+                    state.prediction,
+                    self.executor(state.lexerActionExecutor),
+                    state.requiresFullContext,
+                    None
+                    if state.predicates is None
+                    else tuple(
+                        (self.semantic(pred.pred), pred.alt)
+                        for pred in state.predicates
+                    ),
+                    id(state) in registered,
+                )
+            )
+            index += 1
+
+        return dfa.precedenceDfa, dfa.s0 is not None, tuple(encoded)
+
+
+class _Decoder:
+    """Rebuilds DFAs of a single recognizer from tuples of numbers."""
+
+    def __init__(self, atn: ATN, contexts: List[tuple], semantics: List[tuple]):
+        self.atn = atn
+        self.contexts: List[Optional[PredictionContext]] = []
+        self.semantics: List[SemanticContext] = []
+
+        # Entries always refer to the ones encoded earlier
+        for entry in contexts:
+            if isinstance(entry[0], tuple):
+                parents = [self.context(parent) for parent in entry[0]]
+                ctx = ArrayPredictionContext(parents, list(entry[1]))
+            else:
+                ctx = SingletonPredictionContext.create(
+                    self.context(entry[0]), entry[1]
+                )
+            self.contexts.append(ctx)
+
+        for entry in semantics:
+            if entry[0] == "p":
+                sem = Predicate(entry[1], entry[2], entry[3])
+            elif entry[0] == "pp":
+                sem = PrecedencePredicate(entry[1])
+            else:
+                op = AND if entry[0] == "and" else OR
+                sem = reduce(op, (self.semantic(i) for i in entry[1:]))
+            self.semantics.append(sem)
+
+    def context(self, index: int) -> Optional[PredictionContext]:
+        if index == _NONE:
+            return None
+        if index == _EMPTY:
+            return PredictionContext.EMPTY
+        return self.contexts[index]
+
+    def semantic(self, index: int) -> Optional[SemanticContext]:
+        if index == _NONE:
+            return None
+        if index == _EMPTY:
+            return SemanticContext.NONE
+        return self.semantics[index]
+
+    def executor(self, entry: Optional[tuple]) -> Optional[LexerActionExecutor]:
+        if entry is None:
+            return None
+
+        actions = []
+        for (offset, index) in entry:
+            action = self.atn.lexerActions[index]
+            if offset != _NONE:
+                action = LexerIndexedCustomAction(offset, action)
+            actions.append(action)
+        return LexerActionExecutor(actions)
+
+    def config(self, entry: tuple) -> ATNConfig:
+        state = self.atn.states[entry[0]]
+        context = self.context(entry[2])
+        semantic = self.semantic(entry[3])
+
+        if len(entry) > 6:
+            config = LexerATNConfig(
+                state, entry[1], context, semantic, self.executor(entry[6])
+            )
+            config.passedThroughNonGreedyDecision = entry[7]
+        else:
+            config = ATNConfig(state, entry[1], context, semantic)
+
+        config.reachesIntoOuterContext = entry[4]
+        config.precedenceFilterSuppressed = entry[5]
+        return config
+
+    def configs(self, entry: tuple) -> ATNConfigSet:
+        configs = ATNConfigSet(entry[0])
+        configs.configs = [self.config(config) for config in entry[1]]
+        configs.uniqueAlt = entry[2]
+        configs.conflictingAlts = None if entry[3] is None else set(entry[3])
+        configs.hasSemanticContext = entry[4]
+        configs.dipsIntoOuterContext = entry[5]
+        configs.setReadonly(True)
+        return configs
+
+    def dfa(self, decision: int, entry: Optional[tuple]) -> DFA:
+        dfa = DFA(self.atn.decisionToState[decision], decision)
+        if entry is None:
+            return dfa
+
+        precedence_dfa, has_start_state, encoded = entry
+        if precedence_dfa != dfa.precedenceDfa:
+            raise ValueError(f"DFA {decision} precedence mismatch")
+
+        states = []
+        for state_entry in encoded:
+            state = DFAState(state_entry[0], self.configs(state_entry[1]))
+            state.isAcceptState = state_entry[3]
+            state.prediction = state_entry[4]
+            state.lexerActionExecutor = self.executor(state_entry[5])
+            state.requiresFullContext = state_entry[6]
+            if state_entry[7] is not None:
+                state.predicates = [
+                    PredPrediction(self.semantic(pred), alt)
+                    for (pred, alt) in state_entry[7]
+                ]
+            states.append(state)
+
+        def edge(index: int) -> Optional[DFAState]:
+            if index == _NONE:
+                return None
+            if index == _ERROR:
+                return ATNSimulator.ERROR
+            return states[index]
+
+        for (state, state_entry) in zip(states, encoded):
+            if state_entry[2] is not None:
+                state.edges = [edge(i) for i in state_entry[2]]
+            if state_entry[8]:
+                dfa.states[state] = state
+
+        if has_start_state:
+            dfa.s0 = states[0]
+        return dfa
+
+
+def _dump_recognizer(recognizer) -> tuple:
+    encoder = _Encoder(recognizer.atn)
+    dfas = [encoder.dfa(dfa) for dfa in recognizer.decisionsToDFA]
+    return encoder.contexts, encoder.semantics, dfas
+
+
+def _load_recognizer(recognizer, data: tuple):
+    contexts, semantics, dfas = data
+    if len(dfas) != len(recognizer.decisionsToDFA):
+        raise ValueError("Number of decisions mismatch")
+
+    decoder = _Decoder(recognizer.atn, contexts, semantics)
+    loaded = [decoder.dfa(decision, entry) for decision, entry in enumerate(dfas)]
+
+    # Replace in place, the simulators of existing recognizers share the list
+    recognizer.decisionsToDFA[:] = loaded
+
+
+def save_dfa_cache(path: str):
+    """Save the DFA states learned by the lexer and the parser in this process.
+
+    Args:
+        path (str): The path to the cache file.
+    """
+    from . import grammar_hash
+
+    data = {
+        "format": FORMAT_VERSION,
+        "grammar": grammar_hash(),
+        "lexer": _dump_recognizer(JavaScriptLexer),
+        "parser": _dump_recognizer(JavaScriptParser),
+    }
+
+    with open(path, "wb") as file:
+        file.write(zlib.compress(pickle.dumps(data, protocol=4)))
+
+
+def load_dfa_cache(path: str) -> bool:
+    """Load the DFA states saved by `save_dfa_cache`.
+
+    It replaces the DFA states learned in this process, so it should be called at startup, before parsing anything.
+    Stale or corrupted cache files are ignored.
+
+    Args:
+        path (str): The path to the cache file.
+
+    Returns:
+        True if the cache was loaded, False otherwise.
+    """
+    from . import grammar_hash
+
+    try:
+        with open(path, "rb") as file:
+            data = pickle.loads(zlib.decompress(file.read()))
+    except FileNotFoundError:
+        logging.debug("DFA cache %s does not exist", path)
+        return False
+    except (zlib.error, pickle.UnpicklingError, EOFError, ValueError) as e:
+        logging.warning("Corrupted DFA cache %s: %s", path, e)
+        return False
+
+    if not isinstance(data, dict) or data.get("format") != FORMAT_VERSION:
+        logging.warning("DFA cache %s has unsupported format, ignoring it", path)
+        return False
+    if data.get("grammar") != grammar_hash():
+        logging.warning("DFA cache %s is stale, ignoring it", path)
+        return False
+
+    try:
+        _load_recognizer(JavaScriptLexer, data["lexer"])
+        _load_recognizer(JavaScriptParser, data["parser"])
+    except (IndexError, KeyError, TypeError, ValueError) as e:
+        # Don't leave the recognizers half-loaded
+        logging.warning("Invalid DFA cache %s: %s", path, e)
+        for recognizer in (JavaScriptLexer, JavaScriptParser):
+            recognizer.decisionsToDFA[:] = [
+                DFA(state, i) for i, state in enumerate(recognizer.atn.decisionToState)
+            ]
+        return False
+
+    logging.debug("Loaded DFA cache %s", path)
+    return True
+
+
+def warm_up(paths: Iterable[str]):
+    """Parse the files to let the lexer and the parser learn DFA states. Syntax errors are ignored.
+
+    Args:
+        paths: The paths to the files with JavaScript code.
+    """
+    for path in paths:
+        lexer = JavaScriptLexer(FileStream(path, "utf-8"))
+        lexer.removeErrorListeners()
+        parser = PrecedenceClimbingParser(CommonTokenStream(lexer))
+        parser.removeErrorListeners()
+        parser.program()
@@ -4,6 +4,23 @@ import logging
 from antlr4.error.Errors import ParseCancellationException
 
 
+class JSSyntaxError(ParseCancellationException):
+    """A syntax error with its position in the source."""
+
+    def __init__(self, msg: str, line: int, column: int):
+        super().__init__(f"{line}:{column}: {msg}")
+        self.msg = msg
+        self.line = line
+        self.column = column
+
+
+class RaiseErrorListener(ErrorListener):
+    """Stops parsing on the first syntax error by raising `JSSyntaxError`."""
+
+    def syntaxError(self, recognizer, offendingSymbol, line, column, msg, e):
+        raise JSSyntaxError(msg, line, column)
+
+
 class LogErrorListener(ErrorListener):
     def __init__(self):
         super().__init__()
@@ -15,27 +32,40 @@ class LogErrorListener(ErrorListener):
         #     "{}\n{}\n{}\n{}\n{}".format(offendingSymbol, line, column, msg, e)
         # )
 
+    # Configuration sets and DFAs are formatted only if debug messages are actually logged, they are huge
     def reportAmbiguity(
         self, recognizer, dfa, startIndex, stopIndex, exact, ambigAlts, configs
     ):
         logging.debug(
-            "{}\n{}\n{}\n{}\n{}\n{}".format(
-                dfa, startIndex, stopIndex, exact, ambigAlts, configs
-            )
+            "Ambiguity: %s\n%s\n%s\n%s\n%s\n%s",
+            dfa,
+            startIndex,
+            stopIndex,
+            exact,
+            ambigAlts,
+            configs,
         )
 
     def reportAttemptingFullContext(
         self, recognizer, dfa, startIndex, stopIndex, conflictingAlts, configs
     ):
         logging.debug(
-            "{}; {}; {}; {}; {}".format(
-                dfa, startIndex, stopIndex, conflictingAlts, configs
-            )
+            "Attempting full context: %s; %s; %s; %s; %s",
+            dfa,
+            startIndex,
+            stopIndex,
+            conflictingAlts,
+            configs,
         )
 
     def reportContextSensitivity(
         self, recognizer, dfa, startIndex, stopIndex, prediction, configs
     ):
         logging.debug(
-            "{}; {}; {}; {}; {}".format(dfa, startIndex, stopIndex, prediction, configs)
+            "Context sensitivity: %s; %s; %s; %s; %s",
+            dfa,
+            startIndex,
+            stopIndex,
+            prediction,
+            configs,
         )
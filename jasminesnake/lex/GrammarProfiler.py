@@ -0,0 +1,270 @@
+"""Grammar decision profiler.
+
+The parser predicts which alternative to take at every decision point of the grammar (a rule with several
+alternatives, an optional or a repeated block). Prediction is where the parser spends most of its time, and the
+decisions that need a long lookahead or a full-context (LL) retry are the ones to restructure in the grammar.
+
+ANTLR's Python runtime has no profiling simulator, so `ProfilingATNSimulator` collects the same numbers as the Java
+one: the time spent in every decision, the SLL and LL lookahead depth, SLL-to-LL fallbacks, ambiguities and context
+sensitivities. Install it on a parser with `profile_parser` and print `GrammarProfile.report` after parsing::
+
+    profile = profile_parser(session.parser)
+    session.parse_file("app.js")
+    print(profile.report())
+"""
+
+import time
+from typing import List, Optional
+
+from antlr4 import Parser, ParserRuleContext, TokenStream
+from antlr4.atn.ATNConfigSet import ATNConfigSet
+from antlr4.atn.ParserATNSimulator import ParserATNSimulator
+from antlr4.dfa.DFA import DFA
+from antlr4.dfa.DFAState import DFAState
+
+
+class DecisionInfo:
+    """Prediction statistics of a decision."""
+
+    __slots__ = (
+        "decision",
+        "invocations",
+        "time_ns",
+        "sll_total_look",
+        "sll_max_look",
+        "ll_total_look",
+        "ll_max_look",
+        "ll_fallbacks",
+        "ambiguities",
+        "context_sensitivities",
+    )
+
+    def __init__(self, decision: int):
+        self.decision = decision
+        self.invocations = 0
+        self.time_ns = 0
+        """Total time spent in the prediction, including the LL retries."""
+        self.sll_total_look = 0
+        """Total number of tokens looked at in SLL prediction."""
+        self.sll_max_look = 0
+        self.ll_total_look = 0
+        """Total number of tokens looked at in full-context (LL) retries."""
+        self.ll_max_look = 0
+        self.ll_fallbacks = 0
+        """How many times SLL prediction hit a conflict and was retried with the full context."""
+        self.ambiguities = 0
+        self.context_sensitivities = 0
+        """How many times LL prediction resolved a conflict SLL couldn't, i.e. the retry was needed."""
+
+
+class ProfilingATNSimulator(ParserATNSimulator):
+    """Parser ATN simulator which collects `DecisionInfo` of every decision."""
+
+    def __init__(self, parser: Parser):
+        """Create a simulator sharing the DFAs of the current simulator of the parser.
+
+        Args:
+            parser (Parser): The parser. The simulator must be assigned to its `_interp` afterwards.
+        """
+        interp = parser._interp
+        super().__init__(
+            parser, parser.atn, interp.decisionToDFA, interp.sharedContextCache
+        )
+        self.predictionMode = interp.predictionMode
+        self.decisions = [
+            DecisionInfo(i) for i in range(len(parser.atn.decisionToState))
+        ]
+
+        self._sll_stop_index = -1
+        self._ll_stop_index = -1
+
+    def adaptivePredict(
+        self, input: TokenStream, decision: int, outerContext: ParserRuleContext
+    ):
+        self._sll_stop_index = -1
+        self._ll_stop_index = -1
+        start_index = input.index
+
+        started = time.perf_counter_ns()
+        try:
+            return super().adaptivePredict(input, decision, outerContext)
+        finally:
+            info = self.decisions[decision]
+            info.time_ns += time.perf_counter_ns() - started
+            info.invocations += 1
+
+            if self._sll_stop_index >= 0:
+                look = self._sll_stop_index - start_index + 1
+                info.sll_total_look += look
+                if look > info.sll_max_look:
+                    info.sll_max_look = look
+
+            if self._ll_stop_index >= 0:
+                look = self._ll_stop_index - start_index + 1
+                info.ll_total_look += look
+                if look > info.ll_max_look:
+                    info.ll_max_look = look
+
+    def getExistingTargetState(self, previousD: DFAState, t: int):
+        # Called for every token SLL prediction consumes
+        self._sll_stop_index = self._input.index
+        return super().getExistingTargetState(previousD, t)
+
+    def computeReachSet(self, closure: ATNConfigSet, t: int, fullCtx: bool):
+        if fullCtx:
+            self._ll_stop_index = self._input.index
+        return super().computeReachSet(closure, t, fullCtx)
+
+    def reportAttemptingFullContext(
+        self,
+        dfa: DFA,
+        conflictingAlts: set,
+        configs: ATNConfigSet,
+        startIndex: int,
+        stopIndex: int,
+    ):
+        self.decisions[dfa.decision].ll_fallbacks += 1
+        super().reportAttemptingFullContext(
+            dfa, conflictingAlts, configs, startIndex, stopIndex
+        )
+
+    def reportContextSensitivity(
+        self,
+        dfa: DFA,
+        prediction: int,
+        configs: ATNConfigSet,
+        startIndex: int,
+        stopIndex: int,
+    ):
+        self.decisions[dfa.decision].context_sensitivities += 1
+        super().reportContextSensitivity(
+            dfa, prediction, configs, startIndex, stopIndex
+        )
+
+    def reportAmbiguity(
+        self,
+        dfa: DFA,
+        D: DFAState,
+        startIndex: int,
+        stopIndex: int,
+        exact: bool,
+        ambigAlts: set,
+        configs: ATNConfigSet,
+    ):
+        self.decisions[dfa.decision].ambiguities += 1
+        super().reportAmbiguity(
+            dfa, D, startIndex, stopIndex, exact, ambigAlts, configs
+        )
+
+
+class GrammarProfile:
+    """Decision statistics of a parser with the grammar rule names."""
+
+    def __init__(self, parser: Parser, simulator: ProfilingATNSimulator):
+        self._rule_names = parser.ruleNames
+        self._decision_states = parser.atn.decisionToState
+        self._simulator = simulator
+
+    @property
+    def decisions(self) -> List[DecisionInfo]:
+        """Statistics of all the decisions of the grammar, by decision number."""
+        return self._simulator.decisions
+
+    def rule_name(self, decision: int) -> str:
+        """Get the name of the grammar rule a decision belongs to.
+
+        Args:
+            decision (int): The decision number.
+
+        Returns:
+            The rule name in the grammar, e.g. ``"singleExpression"``.
+        """
+        return self._rule_names[self._decision_states[decision].ruleIndex]
+
+    def ranked(self) -> List[DecisionInfo]:
+        """Get the invoked decisions, the slowest first."""
+        invoked = [info for info in self.decisions if info.invocations]
+        invoked.sort(key=lambda info: info.time_ns, reverse=True)
+        return invoked
+
+    def report(self, limit: Optional[int] = None) -> str:
+        """Format a table of the decisions ranked by the total prediction time.
+
+        The lookahead columns are the average and the maximum number of tokens looked at by SLL prediction and by the
+        full-context (LL) retries.
+
+        Args:
+            limit (Optional[int]): The maximum number of rows. All the invoked decisions are shown if not set.
+
+        Returns:
+            The table.
+        """
+        ranked = self.ranked()
+        total_ns = sum(info.time_ns for info in ranked) or 1
+        if limit is not None:
+            ranked = ranked[:limit]
+
+        header = (
+            "decision",
+            "rule",
+            "calls",
+            "time ms",
+            "time %",
+            "SLL look",
+            "LL look",
+            "LL fallbacks",
+            "ambiguities",
+            "ctx sensitive",
+        )
+        rows = []
+        for info in ranked:
+            ll_calls = info.ll_fallbacks or 1
+            rows.append(
+                (
+                    str(info.decision),
+                    self.rule_name(info.decision),
+                    str(info.invocations),
+                    f"{info.time_ns / 1e6:.2f}",
+                    f"{info.time_ns * 100 / total_ns:.1f}",
+                    f"{info.sll_total_look / info.invocations:.1f}/{info.sll_max_look}",
+                    (
+                        f"{info.ll_total_look / ll_calls:.1f}/{info.ll_max_look}"
+                        if info.ll_fallbacks
+                        else "-"
+                    ),
+                    str(info.ll_fallbacks),
+                    str(info.ambiguities),
+                    str(info.context_sensitivities),
+                )
+            )
+
+        widths = [
+            max(len(row[column]) for row in [header] + rows)
+            for column in range(len(header))
+        ]
+        lines = []
+        for row in [header] + rows:
+            # The rule name is left-aligned, numbers are right-aligned
+            cells = [
+                cell.ljust(width) if column == 1 else cell.rjust(width)
+                for column, (cell, width) in enumerate(zip(row, widths))
+            ]
+            lines.append("  ".join(cells))
+        lines.insert(1, "  ".join("-" * width for width in widths))
+        return "\n".join(lines)
+
+
+def profile_parser(parser: Parser) -> GrammarProfile:
+    """Replace the ATN simulator of the parser with `ProfilingATNSimulator`.
+
+    The learned DFA states are shared with the other parsers, so profiling a parser doesn't slow down the others.
+
+    Args:
+        parser (Parser): The parser.
+
+    Returns:
+        The profile filled while the parser runs.
+    """
+    simulator = ProfilingATNSimulator(parser)
+    parser._interp = simulator
+    return GrammarProfile(parser, simulator)
@@ -1,12 +1,35 @@
 from antlr4 import *
 import logging
 
-relativeImport = False
-if __name__ is not None and "." in __name__:
-    relativeImport = True
-
 
 class JavaScriptBaseLexer(Lexer):
+    # Token types of the generated lexer, set in __init_subclass__
+    _OpenBrace: int
+    _NoRegexAfter: frozenset
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+
+        # Token types are class attributes of the generated lexer, so look
+        # them up once here instead of importing it in every call
+        cls._OpenBrace = cls.OpenBrace
+        cls._NoRegexAfter = frozenset(
+            (
+                cls.Identifier,
+                cls.NullLiteral,
+                cls.BooleanLiteral,
+                cls.This,
+                cls.CloseBracket,
+                cls.CloseParen,
+                cls.OctalIntegerLiteral,
+                cls.DecimalLiteral,
+                cls.HexIntegerLiteral,
+                cls.StringLiteral,
+                cls.PlusPlus,
+                cls.MinusMinus,
+            )
+        )
+
     def __init__(self, *args, **kwargs):
         logging.debug("JavaScriptBaseLexerInit")
         super(JavaScriptBaseLexer, self).__init__(*args, **kwargs)
@@ -15,6 +38,7 @@ class JavaScriptBaseLexer(Lexer):
         defined externally (useStrictDefault)"""
         self.scopeStrictModes = []
         self.lastToken: Token = None
+        self.lastTokenType: int = None
 
         """Default value of strict mode
         Can be defined externally by setUseStrictDefault"""
@@ -24,6 +48,15 @@ class JavaScriptBaseLexer(Lexer):
         Can be defined during parsing, see StringFunctions.js and StringGlobal.js samples"""
         self.useStrictCurrent = False
 
+    def reset(self):
+        super(JavaScriptBaseLexer, self).reset()
+
+        # Lexer may be reused for another input, see ParserSession
+        self.scopeStrictModes = []
+        self.lastToken = None
+        self.lastTokenType = None
+        self.useStrictCurrent = self.useStrictDefault
+
     def getStrictDefault(self) -> bool:
         return self.useStrictDefault
 
@@ -47,8 +80,9 @@ class JavaScriptBaseLexer(Lexer):
         :return the next token from the character stream."""
         next_token: Token = super(JavaScriptBaseLexer, self).nextToken()
 
-        if next_token.channel == Token.DEFAULT_CHANNEL:
+        if next_token.channel == 0:  # Token.DEFAULT_CHANNEL
             self.lastToken = next_token
+            self.lastTokenType = next_token.type
 
         return next_token
 
@@ -64,11 +98,7 @@ class JavaScriptBaseLexer(Lexer):
         )
 
     def processStringLiteral(self):
-        if relativeImport:
-            from .JavaScriptLexer import JavaScriptLexer
-        else:
-            from JavaScriptLexer import JavaScriptLexer
-        if not self.lastToken or self.lastToken.type == JavaScriptLexer.OpenBrace:
+        if self.lastTokenType is None or self.lastTokenType == self._OpenBrace:
             text = self.text
             if text == '"use strict"' or text == "'use strict'":
                 if self.scopeStrictModes:
@@ -77,31 +107,8 @@ class JavaScriptBaseLexer(Lexer):
                 self.scopeStrictModes.append(self.useStrictCurrent)
 
     def isRegexPossible(self) -> bool:
-        """Returns {@code true} if the lexer can match a regex literal. """
-        if relativeImport:
-            from .JavaScriptLexer import JavaScriptLexer
-        else:
-            from JavaScriptLexer import JavaScriptLexer
-
-        if not self.lastToken:
-            # No token has been produced yet: at the start of the input,
-            # no division is possible, so a regex literal _is_ possible.
-            return True
-
-        if self.lastToken.type in [
-            JavaScriptLexer.Identifier,
-            JavaScriptLexer.NullLiteral,
-            JavaScriptLexer.BooleanLiteral,
-            JavaScriptLexer.This,
-            JavaScriptLexer.CloseBracket,
-            JavaScriptLexer.CloseParen,
-            JavaScriptLexer.OctalIntegerLiteral,
-            JavaScriptLexer.DecimalLiteral,
-            JavaScriptLexer.HexIntegerLiteral,
-            JavaScriptLexer.StringLiteral,
-            JavaScriptLexer.PlusPlus,
-            JavaScriptLexer.MinusMinus,
-        ]:
-            return False
-
-        return True
+        """Returns {@code true} if the lexer can match a regex literal.
+
+        No token has been produced yet at the start of the input, so no
+        division is possible and a regex literal _is_ possible."""
+        return self.lastTokenType not in self._NoRegexAfter
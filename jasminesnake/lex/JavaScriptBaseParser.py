@@ -1,19 +1,24 @@
 from antlr4 import *
 import logging
 
-relativeImport = False
-if __name__ is not None and "." in __name__:
-    relativeImport = True
-
-
 class JavaScriptBaseParser(Parser):
-    @staticmethod
-    def parser():
-        if relativeImport:
-            from .JavaScriptParser import JavaScriptParser
-        else:
-            from JavaScriptParser import JavaScriptParser
-        return JavaScriptParser
+    # Token types of the generated parser, set in __init_subclass__
+    _LineTerminator: int
+    _MultiLineComment: int
+    _WhiteSpaces: int
+    _CloseBrace: int
+    _OpenBraceOrFunction: frozenset
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+
+        # Token types are class attributes of the generated parser, so look
+        # them up once here instead of importing it in every call
+        cls._LineTerminator = cls.LineTerminator
+        cls._MultiLineComment = cls.MultiLineComment
+        cls._WhiteSpaces = cls.WhiteSpaces
+        cls._CloseBrace = cls.CloseBrace
+        cls._OpenBraceOrFunction = frozenset((cls.OpenBrace, cls.Function))
 
     def p(self, s: str) -> bool:
         return self.prev(s)
@@ -28,23 +33,13 @@ class JavaScriptBaseParser(Parser):
         return self._input.LT(1).text == s
 
     def notLineTerminator(self) -> bool:
-        JavaScriptParser = self.parser()
-
-        return not self.here(JavaScriptParser.LineTerminator)
+        return not self.here(self._LineTerminator)
 
     def notOpenBraceAndNotFunction(self) -> bool:
-        JavaScriptParser = self.parser()
-
-        nextTokenType = self._input.LT(1).type
-        return (
-            nextTokenType != JavaScriptParser.OpenBrace
-            and nextTokenType != JavaScriptParser.Function
-        )
+        return self._input.LT(1).type not in self._OpenBraceOrFunction
 
     def closeBrace(self) -> bool:
-        JavaScriptParser = self.parser()
-
-        return self._input.LT(1).type == JavaScriptParser.CloseBrace
+        return self._input.LT(1).type == self._CloseBrace
 
     def here(self, tokenType: int) -> bool:
         """
@@ -59,13 +54,12 @@ class JavaScriptBaseParser(Parser):
             {@code HIDDEN} channel.
         """
         # Get the token ahead of the current index.
-        assert isinstance(self.getCurrentToken(), Token)
-        possibleIndexEosToken: Token = self.getCurrentToken().tokenIndex - 1
-        ahead = self._input.get(possibleIndexEosToken)
+        stream = self._input
+        ahead = stream.get(stream.LT(1).tokenIndex - 1)
 
         # Check if the token resides on the HIDDEN channel and if it's of the
         # provided type.
-        return (ahead.channel == Lexer.HIDDEN) and (ahead.type == tokenType)
+        return ahead.type == tokenType and ahead.channel == Lexer.HIDDEN
 
     def lineTerminatorAhead(self) -> bool:
         """
@@ -79,31 +73,30 @@ class JavaScriptBaseParser(Parser):
         either is a line terminator, or is a multi line comment that
         contains a line terminator.
         """
-        JavaScriptParser = self.parser()
-
         # Get the token ahead of the current index.
-        possibleIndexEosToken: Token = self.getCurrentToken().tokenIndex - 1
-        ahead: Token = self._input.get(possibleIndexEosToken)
+        stream = self._input
+        possibleIndexEosToken = stream.LT(1).tokenIndex - 1
+        ahead: Token = stream.get(possibleIndexEosToken)
 
         if ahead.channel != Lexer.HIDDEN:
             # We're only interested in tokens on the HIDDEN channel.
             return False
 
-        if ahead.type == JavaScriptParser.LineTerminator:
+        tokenType = ahead.type
+        if tokenType == self._LineTerminator:
             # There is definitely a line terminator ahead.
             return True
 
-        if ahead.type == JavaScriptParser.WhiteSpaces:
-            # Get the token ahead of the current whitespaces.
-            possibleIndexEosToken = self.getCurrentToken().tokenIndex - 2
-            ahead = self._input.get(possibleIndexEosToken)
+        if tokenType == self._WhiteSpaces:
+            if possibleIndexEosToken == 0:
+                return False
 
-        # Get the token's text and type.
-        text = ahead.text
-        tokenType = ahead.type
+            # Get the token ahead of the current whitespaces.
+            ahead = stream.get(possibleIndexEosToken - 1)
+            tokenType = ahead.type
 
         # Check if the token is, or contains a line terminator.
-        return (
-            tokenType == JavaScriptParser.MultiLineComment
-            and (text.contains("\r") or text.contains("\n"))
-        ) or (tokenType == JavaScriptParser.LineTerminator)
+        if tokenType == self._MultiLineComment:
+            text = ahead.text
+            return "\r" in text or "\n" in text
+        return tokenType == self._LineTerminator
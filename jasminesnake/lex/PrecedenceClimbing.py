@@ -0,0 +1,484 @@
+"""Precedence climbing for the `singleExpression` rule.
+
+`singleExpression` is a left-recursive rule, which ANTLR turns into a loop over ~20 binary and postfix alternatives
+guarded by precedence predicates. Every operand costs an adaptive prediction to pick the primary alternative and
+another one to leave the loop, and every operator costs two more (stay in the loop, pick the operator). The
+predictions run precedence DFAs keyed by the precedence level, so an expression like ``a + b * c`` does about ten
+predictions.
+
+`PrecedenceClimbingParser` overrides the generated `singleExpression` with a precedence climbing loop over a table of
+the binary operators. It builds exactly the same parse tree as the generated rule: the same contexts, the same ATN
+states in `invokingState`, the same token intervals. Simple operands (identifiers, literals, ``this`` followed by an
+operator or the end of the expression) are matched without any prediction; other operands, e.g. calls and member
+accesses, are parsed by the generated rule with the precedence above all the binary operators.
+
+The table is built from the ATN, so it follows the grammar: the operator alternatives are found by their precedence
+predicates, and ANTLR's precedence levels and ATN states are taken from there.
+
+Greedy climbing takes an operator whenever its precedence allows, while ANTLR may leave the loop if the operator token
+can follow the expression (e.g. ``in`` of ``for (a in b)``, or ``+`` starting the next statement after an automatic
+semicolon). The parser runs the generated loop prediction in those contexts, so the choice is always ANTLR's. It does
+the same when the expression is followed by a token which can't follow it, or an operator by a token which can't
+start an operand.
+
+Syntax errors are not reported by the climbing loop, since the generated rule makes other predictions and syncs
+before reporting them, e.g. it reports ``a ? ? b`` as no viable alternative at ``? ?`` rather than a mismatched second
+``?``. An expression is climbed with an error strategy which gives up on the first error instead, and on an error it's
+parsed again by the generated rule from its first token, so errors are reported and recovered from exactly as by
+`JavaScriptParser`.
+"""
+
+import sys
+from functools import lru_cache
+from typing import Dict, FrozenSet, NamedTuple, Optional, Set, TextIO
+
+from antlr4 import Token, TokenStream
+from antlr4.IntervalSet import IntervalSet
+from antlr4.LL1Analyzer import LL1Analyzer
+from antlr4.atn.ATN import ATN
+from antlr4.atn.ATNState import ATNState, StarLoopEntryState
+from antlr4.atn.Transition import (
+    AtomTransition,
+    PrecedencePredicateTransition,
+    RuleTransition,
+    SetTransition,
+)
+from antlr4.error.ErrorStrategy import BailErrorStrategy, DefaultErrorStrategy
+from antlr4.error.Errors import (
+    InputMismatchException,
+    ParseCancellationException,
+    RecognitionException,
+)
+
+from .JavaScriptParser import JavaScriptParser
+
+JSP = JavaScriptParser
+
+
+class _Operator(NamedTuple):
+    """An operator alternative of the `singleExpression` loop."""
+
+    context: type
+    precedence: int
+    """The precedence predicate of the alternative, the operator applies if it's not below the current level."""
+    operator_state: int
+    operator_rule: Optional[str]
+    """The rule matching the operator, if it's not a single token."""
+    operand_state: int
+    operand_precedence: int
+    colon_state: int = -1
+    """The ``:`` state of the ternary operator."""
+    alternate_state: int = -1
+
+
+# The binary operator alternatives and a token of each, the rest of the loop alternatives are postfix ones
+_OPERATOR_ALTERNATIVES = (
+    (JSP.PowerExpressionContext, JSP.Power),
+    (JSP.MultiplicativeExpressionContext, JSP.Multiply),
+    (JSP.AdditiveExpressionContext, JSP.Plus),
+    (JSP.CoalesceExpressionContext, JSP.NullCoalesce),
+    (JSP.BitShiftExpressionContext, JSP.LeftShiftArithmetic),
+    (JSP.RelationalExpressionContext, JSP.LessThan),
+    (JSP.InExpressionContext, JSP.In),
+    (JSP.EqualityExpressionContext, JSP.Equals_),
+    (JSP.BitAndExpressionContext, JSP.BitAnd),
+    (JSP.BitXOrExpressionContext, JSP.BitXOr),
+    (JSP.BitOrExpressionContext, JSP.BitOr),
+    (JSP.LogicalAndExpressionContext, JSP.And),
+    (JSP.LogicalOrExpressionContext, JSP.Or),
+    (JSP.TernaryExpressionContext, JSP.QuestionMark),
+    (JSP.AssignmentExpressionContext, JSP.Assign),
+    (JSP.AssignmentOperatorExpressionContext, JSP.PlusAssign),
+)
+
+
+def _tokens(intervals: IntervalSet) -> Set[int]:
+    return {token for interval in intervals.intervals or () for token in interval}
+
+
+def _look(
+    analyzer: LL1Analyzer, state: ATNState, see_through_predicates: bool
+) -> Set[int]:
+    """Get the tokens which may follow the state inside its rule, `Token.EPSILON` if the rule may end."""
+    result = IntervalSet()
+    analyzer._LOOK(
+        state, None, None, result, set(), set(), see_through_predicates, True
+    )
+    return _tokens(result)
+
+
+def _follow(atn: ATN, rule: int) -> Set[int]:
+    """Get the tokens which may follow the rule, not counting the rule's own recursion and predicated paths.
+
+    Predicated paths are the precedence predicates of left-recursive rules and the semantic predicates, e.g. an
+    automatic semicolon, so this is what may follow the rule no matter what the predicates say.
+    """
+    analyzer = LL1Analyzer(atn)
+    callers: Dict[int, list] = {}
+    for state in atn.states:
+        if state is None:
+            continue
+        for transition in state.transitions:
+            if isinstance(transition, RuleTransition):
+                callers.setdefault(transition.target.ruleIndex, []).append(
+                    (state.ruleIndex, transition.followState)
+                )
+
+    follow: Dict[int, Set[int]] = {
+        index: set() for index in range(len(atn.ruleToStartState))
+    }
+    changed = True
+    while changed:
+        changed = False
+        for callee, sites in callers.items():
+            tokens = set(follow[callee])
+            for caller, follow_state in sites:
+                if caller == callee:
+                    continue
+                look = _look(analyzer, follow_state, False)
+                if Token.EPSILON in look:
+                    look.discard(Token.EPSILON)
+                    look |= follow[caller]
+                tokens |= look
+            if tokens != follow[callee]:
+                follow[callee] = tokens
+                changed = True
+
+    return follow[rule]
+
+
+class _Tables:
+    """ATN states and operator tables of `singleExpression`."""
+
+    def __init__(self, atn: ATN):
+        rule = JSP.RULE_singleExpression
+        self.start_state = atn.ruleToStartState[rule].stateNumber
+        primary_block = atn.ruleToStartState[rule].transitions[0].target
+
+        loop_entry = next(
+            state
+            for state in atn.states
+            if isinstance(state, StarLoopEntryState)
+            and state.ruleIndex == rule
+            and state.isPrecedenceDecision
+        )
+        self.loop_state = loop_entry.stateNumber
+        self.loop_back_state = loop_entry.loopBackState.stateNumber
+        self.loop_decision = loop_entry.decision
+
+        # Primary alternatives matched without prediction: the state of their only element
+        self.identifier_state = -1
+        self.this_state = -1
+        self.literal_state = -1
+        for transition in primary_block.transitions:
+            state = transition.target
+            element = state.transitions[0]
+            if isinstance(element, RuleTransition):
+                if element.ruleIndex == JSP.RULE_identifier:
+                    self.identifier_state = state.stateNumber
+                elif element.ruleIndex == JSP.RULE_literal:
+                    self.literal_state = state.stateNumber
+            elif isinstance(element, AtomTransition) and element.label_ == JSP.This:
+                self.this_state = state.stateNumber
+
+        self.literal_tokens: FrozenSet[int] = frozenset(
+            _tokens(atn.nextTokens(atn.ruleToStartState[JSP.RULE_literal]))
+        )
+
+        operators: Dict[int, _Operator] = {}
+        postfix_tokens: Set[int] = set()
+        contexts = {token: context for context, token in _OPERATOR_ALTERNATIVES}
+        analyzer = LL1Analyzer(atn)
+        binary_precedence = 0
+        for transition in loop_entry.transitions[0].target.transitions:
+            predicate_state = transition.target
+            predicate = predicate_state.transitions[0]
+            assert isinstance(predicate, PrecedencePredicateTransition)
+
+            operator_state = predicate.target
+            element = operator_state.transitions[0]
+            if isinstance(element, (AtomTransition, SetTransition)):
+                tokens = _tokens(element.label)
+                operator_rule = None
+            elif (
+                isinstance(element, RuleTransition)
+                and element.ruleIndex == JSP.RULE_assignmentOperator
+            ):
+                tokens = _tokens(atn.nextTokens(element.target))
+                operator_rule = JSP.ruleNames[JSP.RULE_assignmentOperator]
+            else:
+                tokens = set()
+                operator_rule = None
+
+            context = next(
+                (contexts[token] for token in tokens if token in contexts), None
+            )
+            if context is None:
+                postfix_tokens |= _look(analyzer, operator_state, True)
+                continue
+
+            operand_state = element.followState if operator_rule else element.target
+            operand = operand_state.transitions[0]
+            operator = _Operator(
+                context,
+                predicate.precedence,
+                operator_state.stateNumber,
+                operator_rule,
+                operand_state.stateNumber,
+                operand.precedence,
+            )
+            if context is JSP.TernaryExpressionContext:
+                colon_state = operand.followState
+                alternate_state = colon_state.transitions[0].target
+                operator = operator._replace(
+                    colon_state=colon_state.stateNumber,
+                    alternate_state=alternate_state.stateNumber,
+                )
+                self.alternate_precedence = alternate_state.transitions[0].precedence
+
+            binary_precedence = max(binary_precedence, operator.precedence)
+            for token in tokens:
+                operators[token] = operator
+
+        self.operators = operators
+        self.operand_precedence = binary_precedence + 1
+        """The precedence level the generated rule parses operands with: no binary operators, only postfix ones."""
+
+        # `?.` starts an optional member access, `?` alone is the ternary operator
+        postfix_tokens.discard(JSP.QuestionMark)
+        self.postfix_tokens: FrozenSet[int] = frozenset(postfix_tokens)
+
+        self.following: FrozenSet[int] = frozenset(_follow(atn, rule))
+        """Tokens which may follow an expression, e.g. ``)``, ``;``, or ``in`` of ``for (a in b)``."""
+        self.expression_start: FrozenSet[int] = frozenset(
+            _tokens(atn.nextTokens(atn.ruleToStartState[rule]))
+        )
+        self.predicted_operators: FrozenSet[int] = self.following & set(operators)
+        """Operators which may end the expression instead in some context."""
+        self.asi_operators: FrozenSet[int] = self.expression_start & set(operators)
+        """Operators which may start the next statement after an automatic semicolon."""
+
+        self._atn = atn
+        self._analyzer = analyzer
+        self._looks: Dict[int, FrozenSet[int]] = {}
+
+    def look(self, invoking_state: int) -> FrozenSet[int]:
+        """Get the tokens which may follow a rule invoked in the state inside the calling rule.
+
+        `Token.EPSILON` means that the calling rule may end.
+        """
+        look = self._looks.get(invoking_state)
+        if look is None:
+            follow_state = self._atn.states[invoking_state].transitions[0].followState
+            look = self._looks[invoking_state] = frozenset(
+                _look(self._analyzer, follow_state, False)
+            )
+        return look
+
+
+@lru_cache(maxsize=None)
+def _get_tables() -> _Tables:
+    return _Tables(JSP.atn)
+
+
+class _SpeculationStrategy(DefaultErrorStrategy):
+    """Error strategy cancelling the parse on the first syntax error without reporting it."""
+
+    def reportError(self, recognizer, e: RecognitionException):
+        raise ParseCancellationException(e)
+
+    def reportUnwantedToken(self, recognizer):
+        raise ParseCancellationException(InputMismatchException(recognizer))
+
+    def reportMissingToken(self, recognizer):
+        raise ParseCancellationException(InputMismatchException(recognizer))
+
+    def recover(self, recognizer, e: RecognitionException):
+        raise ParseCancellationException(e)
+
+    def recoverInline(self, recognizer):
+        raise ParseCancellationException(InputMismatchException(recognizer))
+
+
+class PrecedenceClimbingParser(JavaScriptParser):
+    """`JavaScriptParser` parsing binary expressions by precedence climbing."""
+
+    def __init__(self, input: TokenStream, output: TextIO = sys.stdout):
+        super().__init__(input, output)
+        self._tables = _get_tables()
+        self._speculation = _SpeculationStrategy()
+
+    def _may_follow(self, token: int) -> bool:
+        """Check if the token may follow the current expression given the rules it's nested in.
+
+        The only predicates which may follow an expression are the ones of `eos`, they let a statement end in front of
+        a line terminator or a closing brace.
+        """
+        tables = self._tables
+        ctx = self._ctx
+        while ctx is not None and ctx.invokingState >= 0:
+            look = tables.look(ctx.invokingState)
+            if token in look:
+                return True
+            if LL1Analyzer.HIT_PRED in look and (
+                self.lineTerminatorAhead() or self.closeBrace()
+            ):
+                return True
+            if Token.EPSILON not in look:
+                return False
+            ctx = ctx.parentCtx
+        return False
+
+    def singleExpression(self, _p: int = 0):
+        if _p >= self._tables.operand_precedence or self._parseListeners is not None:
+            return super().singleExpression(_p)
+
+        handler = self._errHandler
+        if isinstance(handler, (BailErrorStrategy, _SpeculationStrategy)):
+            # Errors cancel the parse anyway
+            return self._climb(_p)
+
+        parent = self._ctx
+        state = self.state
+        index = self._input.index
+        had_children = parent.children is not None
+        child_count = len(parent.children) if had_children else 0
+        self._errHandler = self._speculation
+        try:
+            localctx = self._climb(_p)
+        except ParseCancellationException:
+            # Let the generated rule report the error
+            self._input.seek(index)
+            self._ctx = parent
+            self.state = state
+            if had_children:
+                del parent.children[child_count:]
+            else:
+                parent.children = None
+        else:
+            handler.reportMatch(self)  # The generated rule ends error recovery on the first match
+            return localctx
+        finally:
+            self._errHandler = handler
+
+        return super().singleExpression(_p)
+
+    def _climb(self, _p: int):
+        tables = self._tables
+        _input = self._input
+        token = _input.LA(1)
+        after = _input.LA(2)
+        if after in tables.postfix_tokens or (
+            after == JSP.QuestionMark and _input.LA(3) == JSP.Dot
+        ):
+            simple = False
+        elif token == JSP.Identifier:
+            simple = after != JSP.ARROW
+        else:
+            simple = token == JSP.This or token in tables.literal_tokens
+
+        if simple:
+            _parentctx = self._ctx
+            _parentState = self.state
+            localctx = JSP.SingleExpressionContext(self, _parentctx, _parentState)
+            self.enterRecursionRule(
+                localctx, tables.start_state, self.RULE_singleExpression, _p
+            )
+        else:
+            localctx = super().singleExpression(tables.operand_precedence)
+            if _input.LA(1) not in tables.operators:
+                return localctx
+
+            # Reopen the operand as the first alternative of this invocation
+            _parentctx = localctx.parentCtx
+            _parentState = localctx.invokingState
+            if self.buildParseTrees and _parentctx is not None:
+                _parentctx.removeLastChild()
+            self._precedenceStack.append(_p)
+            self._ctx = localctx
+
+        try:
+            if simple:
+                self.enterOuterAlt(localctx, 1)
+                if token == JSP.Identifier:
+                    localctx = JSP.IdentifierExpressionContext(self, localctx)
+                    self._ctx = localctx
+                    self.state = tables.identifier_state
+                    self.identifier()
+                elif token == JSP.This:
+                    localctx = JSP.ThisExpressionContext(self, localctx)
+                    self._ctx = localctx
+                    self.state = tables.this_state
+                    self.match(JSP.This)
+                else:
+                    localctx = JSP.LiteralExpressionContext(self, localctx)
+                    self._ctx = localctx
+                    self.state = tables.literal_state
+                    self.literal()
+                self._ctx.stop = _input.LT(-1)
+
+            operators = tables.operators
+            self.state = tables.loop_state
+            while True:
+                token = _input.LA(1)
+                operator = operators.get(token)
+                if operator is None:
+                    if token in tables.following:
+                        if not self._may_follow(token):
+                            # The generated rule predicts another tree, and reports the error in its own way
+                            raise ParseCancellationException(
+                                InputMismatchException(self)
+                            )
+                        break
+                    if self.lineTerminatorAhead():
+                        break
+                    # A syntax error, let ANTLR report it the same way
+                    predict = True
+                elif operator.precedence < _p:
+                    break
+                else:
+                    predict = (
+                        token in tables.predicted_operators
+                        and self._may_follow(token)
+                        or _input.LA(2) not in tables.expression_start
+                        or token in tables.asi_operators
+                        and self.lineTerminatorAhead()
+                    )
+
+                if predict:
+                    # The operator may end the expression, leave the choice to ANTLR
+                    alt = self._interp.adaptivePredict(
+                        _input, tables.loop_decision, self._ctx
+                    )
+                    if alt != 1 or operator is None:
+                        break
+
+                localctx = operator.context(
+                    self, JSP.SingleExpressionContext(self, _parentctx, _parentState)
+                )
+                self.pushNewRecursionContext(
+                    localctx, tables.start_state, self.RULE_singleExpression
+                )
+                self.state = operator.operator_state
+                if operator.operator_rule is None:
+                    self._errHandler.reportMatch(self)
+                    self.consume()
+                else:
+                    getattr(self, operator.operator_rule)()
+                self.state = operator.operand_state
+                self.singleExpression(operator.operand_precedence)
+                if operator.colon_state >= 0:
+                    self.state = operator.colon_state
+                    self.match(JSP.Colon)
+                    self.state = operator.alternate_state
+                    self.singleExpression(tables.alternate_precedence)
+
+                self.state = tables.loop_back_state
+
+        except RecognitionException as re:
+            localctx.exception = re
+            self._errHandler.reportError(self, re)
+            self._errHandler.recover(self, re)
+        finally:
+            self.unrollRecursionContexts(_parentctx)
+        return localctx
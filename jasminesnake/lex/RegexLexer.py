@@ -0,0 +1,426 @@
+"""Regular expression based drop-in replacement for the generated lexer.
+
+`JavaScriptLexer` simulates the lexer ATN in Python, a step per character, and can't even cache its start state
+because of the `HashBangLine` predicate. `RegexLexer` matches a whole token with one call of a master regular
+expression instead and produces the same `CommonToken` objects: the same types, channels, offsets, lines and columns.
+It's a token source, so `CommonTokenStream` and the parser work on top of it unchanged. Like the generated lexer, it
+doesn't copy the source: the buffer of the character stream is matched in place, even a memory-mapped file, and the
+token text is read from the stream only when it's asked for.
+
+Strict mode is tracked like `JavaScriptBaseLexer` does. The grammar has no regular expression literal rule, so ``/``
+is always `Divide` (or `DivideAssign`); the last token type is recorded anyway, see `RegexLexer.isRegexPossible`.
+
+Tokens the master expression doesn't cover are lexed by the generated lexer, positioned at the current offset: the
+identifiers with non-ASCII characters or Unicode escapes, and unexpected characters. The grammar defines non-ASCII
+letters with its own Unicode tables, which is not worth duplicating for the rare identifiers using them.
+"""
+
+import re
+from typing import AnyStr, Callable, List, Match, Optional
+
+from antlr4 import InputStream, Token
+from antlr4.CommonTokenFactory import CommonTokenFactory
+from antlr4.Token import CommonToken
+
+from .JavaScriptLexer import JavaScriptLexer as JSL
+
+_PUNCTUATORS = {
+    ">>>=": JSL.RightShiftLogicalAssign,
+    "...": JSL.Ellipsis,
+    "===": JSL.IdentityEquals,
+    "!==": JSL.IdentityNotEquals,
+    "**=": JSL.PowerAssign,
+    "<<=": JSL.LeftShiftArithmeticAssign,
+    ">>=": JSL.RightShiftArithmeticAssign,
+    ">>>": JSL.RightShiftLogical,
+    "=>": JSL.ARROW,
+    "==": JSL.Equals_,
+    "!=": JSL.NotEquals,
+    "<=": JSL.LessThanEquals,
+    ">=": JSL.GreaterThanEquals,
+    "&&": JSL.And,
+    "||": JSL.Or,
+    "??": JSL.NullCoalesce,
+    "++": JSL.PlusPlus,
+    "--": JSL.MinusMinus,
+    "**": JSL.Power,
+    "<<": JSL.LeftShiftArithmetic,
+    ">>": JSL.RightShiftArithmetic,
+    "*=": JSL.MultiplyAssign,
+    "/=": JSL.DivideAssign,
+    "%=": JSL.ModulusAssign,
+    "+=": JSL.PlusAssign,
+    "-=": JSL.MinusAssign,
+    "&=": JSL.BitAndAssign,
+    "^=": JSL.BitXorAssign,
+    "|=": JSL.BitOrAssign,
+    "[": JSL.OpenBracket,
+    "]": JSL.CloseBracket,
+    "(": JSL.OpenParen,
+    ")": JSL.CloseParen,
+    "{": JSL.OpenBrace,
+    "}": JSL.CloseBrace,
+    ";": JSL.SemiColon,
+    ",": JSL.Comma,
+    "=": JSL.Assign,
+    "?": JSL.QuestionMark,
+    ":": JSL.Colon,
+    ".": JSL.Dot,
+    "+": JSL.Plus,
+    "-": JSL.Minus,
+    "~": JSL.BitNot,
+    "!": JSL.Not,
+    "*": JSL.Multiply,
+    "/": JSL.Divide,
+    "%": JSL.Modulus,
+    "#": JSL.Hashtag,
+    "<": JSL.LessThan,
+    ">": JSL.MoreThan,
+    "&": JSL.BitAnd,
+    "^": JSL.BitXOr,
+    "|": JSL.BitOr,
+}
+"""Punctuator token types, longest first."""
+
+_KEYWORDS = {
+    "null": JSL.NullLiteral,
+    "true": JSL.BooleanLiteral,
+    "false": JSL.BooleanLiteral,
+    "break": JSL.Break,
+    "do": JSL.Do,
+    "typeof": JSL.Typeof,
+    "else": JSL.Else,
+    "new": JSL.New,
+    "var": JSL.Var,
+    "return": JSL.Return,
+    "void": JSL.Void,
+    "continue": JSL.Continue,
+    "for": JSL.For,
+    "while": JSL.While,
+    "function": JSL.Function,
+    "this": JSL.This,
+    "default": JSL.Default,
+    "if": JSL.If,
+    "delete": JSL.Delete,
+    "in": JSL.In,
+    "as": JSL.As,
+    "from": JSL.From,
+    "class": JSL.Class,
+    "enum": JSL.Enum,
+    "extends": JSL.Extends,
+    "super": JSL.Super,
+    "const": JSL.Const,
+    "export": JSL.Export,
+    "import": JSL.Import,
+}
+
+_STRICT_KEYWORDS = {
+    "implements": JSL.Implements,
+    "let": JSL.StrictLet,
+    "private": JSL.Private,
+    "public": JSL.Public,
+    "interface": JSL.Interface,
+    "package": JSL.Package,
+    "protected": JSL.Protected,
+    "static": JSL.Static,
+}
+"""Words which are keywords in strict mode only. ``let`` is `NonStrictLet` otherwise, the rest are identifiers."""
+
+_NUMBERS = {
+    "x": JSL.HexIntegerLiteral,
+    "X": JSL.HexIntegerLiteral,
+    "o": JSL.OctalIntegerLiteral2,
+    "O": JSL.OctalIntegerLiteral2,
+    "b": JSL.BinaryIntegerLiteral,
+    "B": JSL.BinaryIntegerLiteral,
+}
+
+_BIGINTS = {
+    "x": JSL.BigHexIntegerLiteral,
+    "X": JSL.BigHexIntegerLiteral,
+    "o": JSL.BigOctalIntegerLiteral,
+    "O": JSL.BigOctalIntegerLiteral,
+    "b": JSL.BigBinaryIntegerLiteral,
+    "B": JSL.BigBinaryIntegerLiteral,
+}
+
+_HEX = "[_0-9a-fA-F]"
+_INTEGER = "0[xX][0-9a-fA-F][_0-9a-fA-F]*|0[oO][0-7][_0-7]*|0[bB][01][_01]*"
+_DECIMAL_INTEGER = "0|[1-9][0-9_]*"
+_EXPONENT = "[eE][+-]?[0-9_]+"
+
+
+def _token_pattern(separators: str) -> str:
+    """Build the master expression. `separators` are the escapes of the line and paragraph separators, which can't
+    be a part of a bytes pattern."""
+    escape = rf"\\(?:[^0-9xu\r\n]|0|x{_HEX}{{2}}|u{_HEX}{{4}}|u\{{{_HEX}+\}}|[\r\n{separators}])"
+
+    # Alternatives are tried in order, so of the overlapping tokens the longer ones come first. `RegexLexer.nextToken`
+    # relies on the group numbers.
+    return "|".join(
+        (
+            r"([\t\x0b\x0c \xa0]+)",  # 1: WhiteSpaces
+            rf"([\r\n{separators}])",  # 2: LineTerminator
+            r"(/\*[\s\S]*?\*/)",  # 3: MultiLineComment
+            rf"(//[^\r\n{separators}]*)",  # 4: SingleLineComment
+            rf"([A-Za-z_$][A-Za-z0-9_$]*)(?![A-Za-z0-9_$\\]|[^\x00-\x7f\xa0{separators}])",  # 5: ASCII identifier
+            rf"((?:{_INTEGER}|{_DECIMAL_INTEGER})n)",  # 6: bigint literal
+            rf"({_INTEGER})",  # 7: hex, octal or binary integer literal
+            r"(0[0-7]+)",  # 8: legacy octal integer literal
+            rf"((?:{_DECIMAL_INTEGER})(?:\.[0-9][0-9_]*)?(?:{_EXPONENT})?|\.[0-9][0-9_]*(?:{_EXPONENT})?)",  # 9: decimal
+            rf"""("[^"\\\r\n]*(?:{escape}[^"\\\r\n]*)*"|'[^'\\\r\n]*(?:{escape}[^'\\\r\n]*)*')""",  # 10: StringLiteral
+            r"(<!--[\s\S]*?-->)",  # 11: HtmlComment
+            r"(<!\[CDATA\[[\s\S]*?\]\]>)",  # 12: CDataComment
+            "(" + "|".join(re.escape(p) for p in _PUNCTUATORS) + ")",  # 13: punctuator
+        )
+    )
+
+
+class _Syntax:
+    """The master expression and the token tables for `str` buffers or for ASCII `bytes` buffers (memory-mapped
+    files, see `MappedFileStream`), so that both are matched in place."""
+
+    def __init__(self, encode: Callable[[str], AnyStr], separators: str):
+        self.token = re.compile(encode(_token_pattern(separators)))
+        self.hashbang = re.compile(encode(rf"#![^\r\n{separators}]*"))
+        self.hashbang_start = encode("#!")
+        self.newline = encode("\n")
+        self.use_strict = (encode('"use strict"'), encode("'use strict'"))
+        self.punctuators = {encode(p): t for p, t in _PUNCTUATORS.items()}
+        self.keywords = {encode(k): t for k, t in _KEYWORDS.items()}
+        self.strict_keywords = {encode(k): t for k, t in _STRICT_KEYWORDS.items()}
+        self.let = encode("let")
+        self.numbers = {encode(k): t for k, t in _NUMBERS.items()}
+        self.bigints = {encode(k): t for k, t in _BIGINTS.items()}
+
+
+_STR_SYNTAX = _Syntax(str, r"\u2028\u2029")
+_BYTES_SYNTAX = _Syntax(lambda text: text.encode("ascii"), "")
+
+
+class RegexLexer:
+    """Token source producing the same tokens as `JavaScriptLexer`, see the module docstring.
+
+    Only the parts of the `Lexer` interface used by token streams, parsers and error strategies are implemented.
+    """
+
+    def __init__(self, input_stream: InputStream):
+        """Create a lexer.
+
+        Args:
+            input_stream (InputStream): The character stream. The buffer of `CompactInputStream` and
+                `MappedFileStream` is matched in place, other streams are converted to a string once.
+        """
+        self._factory = CommonTokenFactory.DEFAULT
+        self._fallback: Optional[JSL] = None
+
+        self.useStrictDefault = False
+        """Default value of strict mode, see `JavaScriptBaseLexer`."""
+
+        self.inputStream = input_stream
+
+    @property
+    def inputStream(self) -> InputStream:
+        return self._input
+
+    @inputStream.setter
+    def inputStream(self, input_stream: InputStream):
+        self._input = input_stream
+        buffer = getattr(input_stream, "buffer", None)
+        if buffer is None:
+            buffer = str(input_stream)
+        self._buffer = buffer
+        self._syntax = _STR_SYNTAX if isinstance(buffer, str) else _BYTES_SYNTAX
+        self._tokenFactorySourcePair = (self, input_stream)
+        self.reset()
+
+    def reset(self):
+        self._pos = 0
+        self.line = 1
+        self.column = 0
+        self.scopeStrictModes: List[bool] = []
+        self.lastToken: Optional[Token] = None
+        self.lastTokenType: Optional[int] = None
+        self.useStrictCurrent = self.useStrictDefault
+
+    @property
+    def sourceName(self) -> str:
+        return self._input.name
+
+    def getInputStream(self) -> InputStream:
+        return self._input
+
+    def getSourceName(self) -> str:
+        return self.sourceName
+
+    def setUseStrictDefault(self, value: bool):
+        self.useStrictDefault = value
+        self.useStrictCurrent = value
+
+    def isStrictMode(self) -> bool:
+        return self.useStrictCurrent
+
+    def isRegexPossible(self) -> bool:
+        """Same as `JavaScriptBaseLexer.isRegexPossible`."""
+        return self.lastTokenType not in JSL._NoRegexAfter
+
+    def getAllTokens(self) -> List[Token]:
+        tokens = []
+        token = self.nextToken()
+        while token.type != Token.EOF:
+            tokens.append(token)
+            token = self.nextToken()
+        return tokens
+
+    def nextToken(self) -> Token:
+        buffer = self._buffer
+        syntax = self._syntax
+        start = self._pos
+        if start >= len(buffer):
+            return self._emit(Token.EOF, Token.DEFAULT_CHANNEL, start, start)
+
+        if self.lastToken is None and buffer[start : start + 2] == syntax.hashbang_start:
+            # `HashBangLine` is only allowed before any token on the default channel
+            end = syntax.hashbang.match(buffer, start).end()
+            return self._emit(JSL.HashBangLine, Token.DEFAULT_CHANNEL, start, end)
+
+        m = syntax.token.match(buffer, start)
+        if m is None:
+            return self._next_fallback_token()
+
+        group = m.lastindex
+        end = m.end()
+        channel = Token.DEFAULT_CHANNEL
+
+        if group == 1:
+            token_type = JSL.WhiteSpaces
+            channel = Token.HIDDEN_CHANNEL
+        elif group == 5:
+            value = m.group()
+            token_type = syntax.keywords.get(value)
+            if token_type is None:
+                if value in syntax.strict_keywords:
+                    if self.useStrictCurrent:
+                        token_type = syntax.strict_keywords[value]
+                    elif value == syntax.let:
+                        token_type = JSL.NonStrictLet
+                    else:
+                        token_type = JSL.Identifier
+                else:
+                    token_type = JSL.Identifier
+        elif group == 13:
+            token_type = syntax.punctuators[m.group()]
+            if token_type == JSL.OpenBrace:
+                self._process_open_brace()
+            elif token_type == JSL.CloseBrace:
+                self._process_close_brace()
+        elif group == 2:
+            token_type = JSL.LineTerminator
+            channel = Token.HIDDEN_CHANNEL
+        elif group == 9:
+            token_type = JSL.DecimalLiteral
+        elif group == 10:
+            token_type = JSL.StringLiteral
+            self._process_string_literal(m)
+        elif group == 3:
+            token_type = JSL.MultiLineComment
+            channel = Token.HIDDEN_CHANNEL
+        elif group == 4:
+            token_type = JSL.SingleLineComment
+            channel = Token.HIDDEN_CHANNEL
+        elif group == 6:
+            token_type = syntax.bigints.get(
+                buffer[start + 1 : start + 2], JSL.BigDecimalIntegerLiteral
+            )
+        elif group == 7:
+            token_type = syntax.numbers[buffer[start + 1 : start + 2]]
+        elif group == 8:
+            if self.useStrictCurrent:
+                # `OctalIntegerLiteral` predicate fails in strict mode, so it's just ``0``
+                token_type = JSL.DecimalLiteral
+                end = start + 1
+            else:
+                token_type = JSL.OctalIntegerLiteral
+        elif group == 11:
+            token_type = JSL.HtmlComment
+            channel = Token.HIDDEN_CHANNEL
+        else:
+            token_type = JSL.CDataComment
+            channel = Token.HIDDEN_CHANNEL
+
+        return self._emit(token_type, channel, start, end)
+
+    def _emit(self, token_type: int, channel: int, start: int, end: int) -> Token:
+        # `CommonToken` takes the line and the column from the lexer, so they are advanced afterwards. Its text is
+        # taken from the input stream when it's asked for.
+        token = CommonToken(
+            self._tokenFactorySourcePair, token_type, channel, start, end - 1
+        )
+
+        # Like the ATN simulator, only ``\n`` starts a new line
+        buffer = self._buffer
+        newline = self._syntax.newline
+        last_newline = buffer.rfind(newline, start, end)
+        if last_newline < 0:
+            self.column += end - start
+        else:
+            self.line += buffer[start:end].count(newline)
+            self.column = end - last_newline - 1
+
+        self._pos = end
+        if channel == Token.DEFAULT_CHANNEL:
+            self.lastToken = token
+            self.lastTokenType = token_type
+        return token
+
+    def _next_fallback_token(self) -> Token:
+        """Lex the next token with the generated lexer."""
+        lexer = self._fallback
+        if lexer is None or lexer.inputStream is not self._input:
+            lexer = self._fallback = JSL(self._input)
+            lexer.removeErrorListeners()
+
+        lexer.inputStream.seek(self._pos)
+        lexer._interp.line = self.line
+        lexer._interp.column = self.column
+        lexer.scopeStrictModes = self.scopeStrictModes
+        lexer.lastToken = self.lastToken
+        lexer.lastTokenType = self.lastTokenType
+        lexer.useStrictCurrent = self.useStrictCurrent
+
+        token = lexer.nextToken()
+        # The generated lexer updates the strict mode, the line and the column
+        self.useStrictCurrent = lexer.useStrictCurrent
+        end = token.stop + 1
+        token = CommonToken(
+            self._tokenFactorySourcePair, token.type, token.channel, token.start, end - 1
+        )
+
+        self.line = lexer._interp.line
+        self.column = lexer._interp.column
+        self._pos = end
+        if token.channel == Token.DEFAULT_CHANNEL:
+            self.lastToken = token
+            self.lastTokenType = token.type
+        return token
+
+    def _process_open_brace(self):
+        scopes = self.scopeStrictModes
+        self.useStrictCurrent = bool(scopes) and (
+            True if scopes[-1] else self.useStrictDefault
+        )
+        scopes.append(self.useStrictCurrent)
+
+    def _process_close_brace(self):
+        scopes = self.scopeStrictModes
+        self.useStrictCurrent = bool(scopes) and (
+            True if scopes.pop(-1) else self.useStrictDefault
+        )
+
+    def _process_string_literal(self, m: Match):
+        if self.lastTokenType is None or self.lastTokenType == JSL.OpenBrace:
+            if m.group() in self._syntax.use_strict:
+                if self.scopeStrictModes:
+                    self.scopeStrictModes.pop(-1)
+                self.useStrictCurrent = True
+                self.scopeStrictModes.append(self.useStrictCurrent)
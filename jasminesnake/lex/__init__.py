@@ -1,3 +1,47 @@
 """Lexer/parser module.
 Consists mostly of auto-generated files spewed by ANTLR.
 """
+import hashlib
+from functools import lru_cache
+
+
+@lru_cache(maxsize=None)
+def grammar_hash() -> str:
+    """Get the hash of the generated lexer and parser.
+
+    Anything derived from the grammar (cached ASTs, DFA states, etc.) should be invalidated once it changes.
+
+    Returns:
+        Hex digest of the serialized lexer and parser ATNs.
+    """
+    from . import JavaScriptLexer, JavaScriptParser
+
+    digest = hashlib.sha256()
+    digest.update(str(JavaScriptLexer.serializedATN()).encode())
+    digest.update(str(JavaScriptParser.serializedATN()).encode())
+    return digest.hexdigest()
+
+
+def load_dfa_cache(path: str) -> bool:
+    """Load the lexer and parser DFA states saved by `save_dfa_cache`. Stale or corrupted caches are ignored.
+
+    Args:
+        path (str): The path to the cache file.
+
+    Returns:
+        True if the cache was loaded, False otherwise.
+    """
+    from .DFACache import load_dfa_cache as _load
+
+    return _load(path)
+
+
+def save_dfa_cache(path: str):
+    """Save the lexer and parser DFA states learned in this process.
+
+    Args:
+        path (str): The path to the cache file.
+    """
+    from .DFACache import save_dfa_cache as _save
+
+    _save(path)
@@ -0,0 +1,34 @@
+"""Native parser backend.
+
+A hand-written tokenizer and recursive descent parser building the AST directly, without the ANTLR runtime, the parse
+tree and the AST builder pass. It produces the same AST as `jasminesnake.ast.from_parse_tree` of the ANTLR parse tree
+and is an order of magnitude faster, but stops on the first syntax error instead of reporting it to an error listener
+and recovering. Only sources with constructs the AST builder doesn't support are checked by the ANTLR parser too, to
+report their syntax errors first.
+"""
+
+from typing import Optional
+
+from ..ast import nodes
+from ..ast.index import ASTIndex
+from .parser import Parser, parse
+from .tokenizer import Token, tokenize
+
+
+def parse_file(
+    path: str,
+    source_type: nodes.SourceTypeLiteral = "script",
+    index: Optional[ASTIndex] = None,
+) -> nodes.Program:
+    """Parse the file with the native parser.
+
+    Args:
+        path (str): The path to the file with JavaScript code.
+        source_type (nodes.SourceTypeLiteral): source type. Could be `script` or `module`. Set to `script` by default.
+        index (Optional[ASTIndex]): If given, the nodes are added to the index.
+
+    Returns:
+        `Program` AST node, which is the root node.
+    """
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        return parse(f.read(), source_type, index)
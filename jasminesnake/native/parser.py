@@ -0,0 +1,623 @@
+"""Hand-written recursive descent parser building `nodes.*` objects directly.
+
+It accepts the language of `grammars/JavaScriptParser.g4` as far as `jasminesnake.ast.builder.ASTBuilder` can turn it
+into an AST, and builds the same AST: the same nodes, and the same source locations, since every node spans the same
+tokens as the parse tree context it's built from in `ASTBuilder`. Constructs `ASTBuilder` doesn't support raise
+`NotImplementedError` with the same message. `ASTBuilder` only sees them once the whole source is parsed though, so
+before raising it the ANTLR parser checks the syntax of the source the native parser can't get through.
+
+Expressions are parsed by precedence climbing over the precedence levels ANTLR assigns to the alternatives of the
+left-recursive `singleExpression` rule, so operators group exactly the way they do in the generated parser, quirks
+included: e.g. ``-a ** b`` is ``(-a) ** b``, and since ``=`` binds tighter than ``+=``, ``a = b += c`` is
+``(a = b) += c``.
+
+The first syntax error raises `JSSyntaxError`, there's no error recovery.
+
+Notes:
+    Left-associative operator chains are parsed in a loop, but nested brackets, prefix operators and right-associative
+    operators take a few Python frames per level, so extremely deep nesting hits the recursion limit.
+"""
+
+from typing import Callable, List, Optional, Union
+
+from ..ast import nodes
+from ..ast.index import ASTIndex
+from ..ast.lines import LineTable
+from ..lex.ErrorListeners import JSSyntaxError, RaiseErrorListener
+from . import tokenizer
+from .tokenizer import Token
+
+_from_tokens = nodes.SourceLocation.from_tokens
+
+_PREFIX_OPERATORS = {
+    "delete": (33, nodes.DeleteExpression),
+    "void": (32, nodes.VoidExpression),
+    "typeof": (31, nodes.TypeofExpression),
+    "++": (30, nodes.PreIncrementExpression),
+    "--": (29, nodes.PreDecrementExpression),
+    "+": (28, nodes.UnaryPlusExpression),
+    "-": (27, nodes.UnaryMinusExpression),
+    "~": (26, nodes.UnaryBitNotExpression),
+    "!": (25, nodes.UnaryLogicNotExpression),
+}
+"""Prefix operator -> the precedence its operand is parsed with and the node class."""
+
+_POSTFIX_OPERATORS = {
+    "++": nodes.PostIncrementExpression,
+    "--": nodes.PostDecrementExpression,
+}
+"""Postfix operator -> the node class. They bind tighter than any operand precedence, so they always apply."""
+
+_BINARY_OPERATORS = {
+    "**": (24, nodes.PowBinaryExpression),
+    "*": (23, nodes.MulArithmeticExpression),
+    "/": (23, nodes.DivArithmeticExpression),
+    "%": (23, nodes.ModArithmeticExpression),
+    "+": (22, nodes.AddArithmeticExpression),
+    "-": (22, nodes.SubArithmeticExpression),
+    "<<": (20, nodes.LeftBitShiftExpression),
+    ">>": (20, nodes.RightBitShiftExpression),
+    ">>>": (20, nodes.LogicRightBitShiftExpression),
+    "<": (19, nodes.LowerThanRelationExpression),
+    ">": (19, nodes.GreaterThanRelationExpression),
+    "<=": (19, nodes.LowerThanEqualRelationExpression),
+    ">=": (19, nodes.GreaterThanEqualRelationExpression),
+    "==": (17, nodes.EqualityExpression),
+    "!=": (17, nodes.NotEqualityExpression),
+    "===": (17, nodes.IdentityEqualityExpression),
+    "!==": (17, nodes.NotIdentityEqualityExpression),
+}
+"""Binary operator -> its precedence and the node class. All of them are left-associative except ``**``."""
+
+_ASSIGN_PRECEDENCE = 10
+_ASSIGNMENT_OPERATOR_PRECEDENCE = 9
+
+_ASSIGNMENT_OPERATORS = {
+    "*=": nodes.AssignmentOperator.MUL,
+    "/=": nodes.AssignmentOperator.DIV,
+    "%=": nodes.AssignmentOperator.MOD,
+    "+=": nodes.AssignmentOperator.ADD,
+    "-=": nodes.AssignmentOperator.SUB,
+    "<<=": nodes.AssignmentOperator.SHL,
+    ">>=": nodes.AssignmentOperator.SHR,
+    ">>>=": nodes.AssignmentOperator.SHR_LOGIC,
+    "&=": nodes.AssignmentOperator.AND,
+    "^=": nodes.AssignmentOperator.XOR,
+    "|=": nodes.AssignmentOperator.OR,
+    "**=": nodes.AssignmentOperator.POW,
+}
+
+_NOT_IMPLEMENTED_OPERATORS = {
+    "[": "MemberIndexExpression",
+    ".": "MemberDotExpression",
+    "(": "ArgumentsExpression",
+    "??": "CoalesceExpression",
+    "in": "InExpression",
+    "&": "BitAndExpression",
+    "^": "BitXOrExpression",
+    "|": "BitOrExpression",
+    "&&": "LogicalAndExpression",
+    "||": "LogicalOrExpression",
+    "?": "TernaryExpression",
+}
+"""Operator following an operand -> name of the feature which is not supported yet, as `ASTBuilder` reports it."""
+
+_NOT_IMPLEMENTED_PRIMARY = {
+    "function": "FunctionExpression",
+    "class": "ClassExpression",
+    "import": "ImportExpression",
+    "{": "ObjectLiteralExpression",
+    tokenizer.BIGINT: "Bigint literals",
+}
+"""Token starting an expression -> name of the feature which is not supported yet."""
+
+_NOT_IMPLEMENTED_STATEMENTS = {
+    "if": "IfStatement",
+    "do": "DoWhileStatement",
+    "while": "WhileStatement",
+    "for": "ForStatement",
+    "continue": "ContinueStatement",
+    "break": "BreakStatement",
+    "return": "ReturnStatement",
+    "export": "ExportDeclaration",
+    "class": "ClassDeclaration",
+    "function": "FunctionDeclaration",
+}
+"""Token starting a statement -> name of the feature which is not supported yet."""
+
+_NAME_TOKENS = tokenizer.KEYWORDS | tokenizer.STRICT_KEYWORDS | {tokenizer.IDENTIFIER, "#"}
+"""Tokens which may follow ``.``: identifier names and private names."""
+
+_VAR_MODIFIERS = frozenset(("var", "let", "const"))
+
+_DECLARATION_STARTS = frozenset((tokenizer.IDENTIFIER, "[", "{"))
+"""Tokens after a non-strict ``let`` which make it a declaration rather than an identifier."""
+
+_NOT_STATEMENT_STARTS = (
+    frozenset(_BINARY_OPERATORS)
+    | frozenset(_ASSIGNMENT_OPERATORS)
+    | frozenset(_NOT_IMPLEMENTED_OPERATORS)
+    | {"=", "=>", "...", ",", ")", "]", ":"}
+) - {"+", "-", "[", "("}
+"""Tokens which can't start a statement, so a statement can't end in front of them."""
+
+
+class Parser:
+    """Recursive descent parser of a single source.
+
+    Use `Parser(source).parse()` to get the `Program` node.
+    """
+
+    def __init__(
+        self, source: str, source_type: nodes.SourceTypeLiteral = "script"
+    ):
+        """Tokenize the source.
+
+        Args:
+            source (str): The JavaScript code.
+            source_type (nodes.SourceTypeLiteral): source type. Could be `script` or `module`. Set to `script` by
+                default.
+        """
+        self._source = source
+        self._source_type = source_type
+        self._lines = LineTable(source)  # FIXME add source name, see ASTBuilder
+        self._tokens: List[Token] = tokenizer.tokenize(source)
+        self._pos = 0
+        self._asi_stop = -1
+        self._asi_candidates: List[int] = []
+        self._asi_retry = True
+        self._unsupported: Optional[str] = None
+
+    def parse(self, index: Optional[ASTIndex] = None) -> nodes.Program:
+        """Parse the source.
+
+        Args:
+            index (Optional[ASTIndex]): If given, the nodes are added to the index.
+
+        Returns:
+            `Program` AST node, which is the root node.
+        """
+        tokens = self._tokens
+        self._pos = 0
+        if tokens[0].type == tokenizer.HASHBANG:
+            self._pos = 1  # TODO treat it somehow, see ASTBuilder
+
+        body = []
+        try:
+            while tokens[self._pos].type != tokenizer.EOF:
+                body.append(self._statement())
+        except NotImplementedError:
+            self._check_syntax()
+            raise
+
+        first = tokens[0]
+        last = tokens[-2] if len(tokens) > 1 else first
+        program = nodes.Program(
+            _from_tokens(self._lines, first, last), self._source_type, body
+        )
+        if index is not None:
+            index.add(program)
+        return program
+
+    def _check_syntax(self):
+        """Raise `JSSyntaxError` on the first syntax error in the source, as the ANTLR parser reports it."""
+        from ..char_streams import CompactInputStream
+        from ..js_stream import ParserSession
+
+        ParserSession(RaiseErrorListener()).check(CompactInputStream(self._source))
+
+    # Helpers
+
+    def _loc(self, first: Token) -> nodes.SourceLocation:
+        """Get the location from the token to the last consumed one."""
+        return _from_tokens(self._lines, first, self._tokens[self._pos - 1])
+
+    def _error(self, token: Token) -> JSSyntaxError:
+        position = self._lines.position(token.start)
+        text = token.text if token.type == tokenizer.EOF else repr(token.text)
+        return JSSyntaxError(
+            f"unexpected input {text}", position.line, position.column
+        )
+
+    def _expect(self, token_type: str) -> Token:
+        token = self._tokens[self._pos]
+        if token.type != token_type:
+            raise self._error(token)
+        self._pos += 1
+        return token
+
+    def _eos(self):
+        """Match the end of a statement, either ``;`` or an automatic semicolon."""
+        token = self._tokens[self._pos]
+        if token.type == ";":
+            self._pos += 1
+        elif not (
+            token.type == tokenizer.EOF or token.type == "}" or token.newline_before
+        ):
+            raise self._error(token)
+
+    # Statements
+
+    def _statement(self) -> nodes.Statement:
+        token = self._tokens[self._pos]
+        token_type = token.type
+
+        if token_type == "{":
+            return self._block()
+        if token_type in _VAR_MODIFIERS:
+            return self._with_asi_retry(self._variable_statement)
+        if (
+            token.text == "let"
+            and self._tokens[self._pos + 1].type in _DECLARATION_STARTS
+        ):
+            # A non-strict ``let`` is an identifier if it doesn't start a declaration
+            start = self._pos
+            try:
+                statement = self._with_asi_retry(self._variable_statement)
+                if self._tokens[self._pos].type not in _NOT_STATEMENT_STARTS:
+                    return statement
+            except JSSyntaxError:
+                self._pos = start
+                if self._is_declaration():
+                    raise
+            self._pos = start
+        if token_type == ";":
+            self._pos += 1
+            return nodes.EmptyStatement(self._loc(token))
+        if token_type == "export" and self._tokens[self._pos + 1].type == "default":
+            raise NotImplementedError("ExportDefaultDeclaration")
+        if token_type in _NOT_IMPLEMENTED_STATEMENTS:
+            raise NotImplementedError(_NOT_IMPLEMENTED_STATEMENTS[token_type])
+        if token_type == "import" and self._tokens[self._pos + 1].type != "(":
+            raise NotImplementedError("ImportStatement")
+
+        return self._with_asi_retry(self._expression_statement)
+
+    def _with_asi_retry(self, parse_statement: Callable[[], nodes.Statement]):
+        """Parse a statement, ending it at a line terminator inside it if it's a syntax error otherwise.
+
+        An operator after a line terminator either continues the expression or starts the next statement after an
+        automatic semicolon, e.g. ``a = b\n-1``. ANTLR predicts the alternative which matches more input, so it
+        continues the expression unless that fails further on. The parser continues greedily, and on a syntax error
+        reparses the statement ending it at every line terminator it has passed, the last one first, until both the
+        statement and the next one parse. The next statement is checked without retries, so every candidate costs at
+        most two statement parses.
+
+        A bracket after a line terminator is a candidate too, but the member index it opens is not supported, so it's
+        only checked for syntax errors, and `NotImplementedError` is raised once the statement parses.
+        """
+        start = self._pos
+        candidates = self._asi_candidates = []
+        self._unsupported = None
+        try:
+            statement = parse_statement()
+        except JSSyntaxError as error:
+            if not self._asi_retry:
+                raise
+            for stop in reversed(candidates):
+                self._pos = start
+                self._asi_stop = stop
+                self._asi_candidates = []
+                self._unsupported = None
+                try:
+                    statement = parse_statement()
+                except JSSyntaxError:
+                    continue
+                finally:
+                    self._asi_stop = -1
+
+                unsupported = self._unsupported
+                if self._next_statement_parses():
+                    self._unsupported = unsupported
+                    break
+            else:
+                raise error
+
+        if self._unsupported is not None:
+            raise NotImplementedError(self._unsupported)
+        return statement
+
+    def _next_statement_parses(self) -> bool:
+        """Check if the statement at the current token parses greedily, without consuming it."""
+        start = self._pos
+        if self._tokens[start].type in (tokenizer.EOF, "}"):
+            return True
+        retry, self._asi_retry = self._asi_retry, False
+        try:
+            self._statement()
+            return True
+        except JSSyntaxError:
+            return False
+        except NotImplementedError:
+            return True  # Can't tell
+        finally:
+            self._pos = start
+            self._asi_retry = retry
+
+    def _is_declaration(self) -> bool:
+        """Check if ANTLR predicts a declaration for the non-strict ``let`` at the current token.
+
+        The prediction assumes an automatic semicolon may follow the declaration list, so it's a declaration if the
+        list parses and the token after it may start a statement, even if there's no line terminator in front of it,
+        e.g. ``let\nlet x``.
+        """
+        start = self._pos
+        try:
+            self._variable_declaration_list()
+            return self._tokens[self._pos].type not in _NOT_STATEMENT_STARTS
+        except JSSyntaxError:
+            return False
+        except NotImplementedError:
+            return True  # Can't tell
+        finally:
+            self._pos = start
+
+    def _variable_statement(self) -> nodes.VariableDeclaration:
+        declaration = self._variable_declaration_list()
+        self._eos()
+        return declaration
+
+    def _expression_statement(self) -> nodes.ExpressionStatement:
+        first = self._tokens[self._pos]
+        expression = self._expression_sequence()
+        self._eos()
+        return nodes.ExpressionStatement(self._loc(first), expression)
+
+    def _block(self) -> nodes.BlockStatement:
+        tokens = self._tokens
+        first = self._expect("{")
+        body = []
+        while tokens[self._pos].type != "}":
+            if tokens[self._pos].type == tokenizer.EOF:
+                raise self._error(tokens[self._pos])
+            body.append(self._statement())
+        self._pos += 1
+        return nodes.BlockStatement(self._loc(first), body)
+
+    def _variable_declaration_list(self) -> nodes.VariableDeclaration:
+        first = self._tokens[self._pos]
+        self._pos += 1
+        kind: nodes.VarDeclKind = first.text
+
+        declarations = [self._variable_declaration()]
+        while self._tokens[self._pos].type == ",":
+            self._pos += 1
+            declarations.append(self._variable_declaration())
+
+        return nodes.VariableDeclaration(self._loc(first), kind, declarations)
+
+    def _variable_declaration(self) -> nodes.VariableDeclarator:
+        first = self._tokens[self._pos]
+        if first.type == tokenizer.IDENTIFIER:
+            self._pos += 1
+            target = nodes.Identifier(self._loc(first), first.text)
+        elif first.type == "[":
+            elements = self._array_literal()
+            target = nodes.ArrayPattern(self._loc(first), elements)
+        elif first.type == "{":
+            raise NotImplementedError("ObjectLiteral assignment")  # TODO
+        else:
+            raise self._error(first)
+
+        init = None
+        if self._tokens[self._pos].type == "=":
+            self._pos += 1
+            init = self._single_expression(0)
+
+        return nodes.VariableDeclarator(self._loc(first), target, init)
+
+    # Expressions
+
+    def _expression_sequence(self) -> nodes.SequenceExpression:
+        first = self._tokens[self._pos]
+        expressions = [self._single_expression(0)]
+        while self._tokens[self._pos].type == ",":
+            self._pos += 1
+            expressions.append(self._single_expression(0))
+        return nodes.SequenceExpression(self._loc(first), expressions)
+
+    def _single_expression(self, precedence: int) -> nodes.Expression:
+        """Parse an expression of the precedence level or above it, the way the generated `singleExpression` does."""
+        tokens = self._tokens
+        first = tokens[self._pos]
+        left = self._operand()
+
+        while True:
+            token = tokens[self._pos]
+            token_type = token.type
+            if token.newline_before and (
+                token_type not in _POSTFIX_OPERATORS or token.after_newline
+            ):
+                # The statement may end here unless a postfix operator applies, see `_with_asi_retry`
+                if self._pos == self._asi_stop:
+                    return left
+                candidates = self._asi_candidates
+                if not candidates or candidates[-1] != self._pos:
+                    candidates.append(self._pos)
+
+            binary = _BINARY_OPERATORS.get(token_type)
+            if binary is not None:
+                operator_precedence, node_class = binary
+                if operator_precedence < precedence:
+                    return left
+                self._pos += 1
+                # ``**`` is right-associative
+                right = self._single_expression(
+                    operator_precedence + (token_type != "**")
+                )
+                left = node_class(self._loc(first), left, right)
+                continue
+
+            if token_type == "=":
+                if _ASSIGN_PRECEDENCE < precedence:
+                    return left
+                self._pos += 1
+                right = self._single_expression(_ASSIGN_PRECEDENCE)
+                left = nodes.AssignmentExpression(
+                    self._loc(first), nodes.AssignmentOperator.ASSIGN, left, right
+                )
+                continue
+
+            assignment = _ASSIGNMENT_OPERATORS.get(token_type)
+            if assignment is not None:
+                if _ASSIGNMENT_OPERATOR_PRECEDENCE < precedence:
+                    return left
+                self._pos += 1
+                right = self._single_expression(_ASSIGNMENT_OPERATOR_PRECEDENCE)
+                left = nodes.AssignmentExpression(
+                    self._loc(first), assignment, left, right
+                )
+                continue
+
+            postfix = _POSTFIX_OPERATORS.get(token_type)
+            if postfix is not None and not token.after_newline:
+                self._pos += 1
+                left = postfix(self._loc(first), left)
+                continue
+
+            if token_type in _NOT_IMPLEMENTED_OPERATORS:
+                if token_type == "[" and token.newline_before:
+                    # It may be an array literal after an automatic semicolon, see `_with_asi_retry`
+                    self._pos += 1
+                    self._expression_sequence()
+                    self._expect("]")
+                    if self._unsupported is None:
+                        self._unsupported = _NOT_IMPLEMENTED_OPERATORS[token_type]
+                    continue
+                if token_type == "?" and tokens[self._pos + 1].type == ".":
+                    token_type = "."
+                    self._pos += 1
+                if token_type == ".":
+                    # Only a name or a private name may follow
+                    name = tokens[self._pos + 1]
+                    if name.type not in _NAME_TOKENS:
+                        raise self._error(name)
+                raise NotImplementedError(_NOT_IMPLEMENTED_OPERATORS[token_type])
+
+            return left
+
+    def _operand(self) -> nodes.Expression:
+        """Parse a prefix operator expression or a primary expression."""
+        tokens = self._tokens
+        first = tokens[self._pos]
+        token_type = first.type
+
+        prefix = _PREFIX_OPERATORS.get(token_type)
+        if prefix is not None:
+            self._pos += 1
+            precedence, node_class = prefix
+            argument = self._single_expression(precedence)
+            return node_class(self._loc(first), argument)
+
+        if token_type == tokenizer.IDENTIFIER:
+            if tokens[self._pos + 1].type == "=>":
+                raise NotImplementedError("FunctionExpression")
+            self._pos += 1
+            return nodes.Identifier(self._loc(first), first.text)
+
+        if token_type == tokenizer.NUMBER:
+            self._pos += 1
+            # Thank you, PEP-515, very cool!
+            return nodes.NumericLiteral(self._loc(first), float(first.text))
+
+        if token_type == tokenizer.STRING:
+            self._pos += 1
+            return nodes.StringLiteral(self._loc(first), first.text[1:-1])
+
+        if token_type == "true" or token_type == "false":
+            self._pos += 1
+            return nodes.BooleanLiteral(self._loc(first), token_type == "true")
+
+        if token_type == "null":
+            self._pos += 1
+            return nodes.NullLiteral(self._loc(first))
+
+        if token_type == "this":
+            self._pos += 1
+            return nodes.ThisExpression(self._loc(first))
+
+        if token_type == "super":
+            self._pos += 1
+            return nodes.Super(self._loc(first))
+
+        if token_type == "[":
+            elements = self._array_literal()
+            return nodes.ArrayExpression(self._loc(first), elements)
+
+        if token_type == "(":
+            if self._is_arrow_function():
+                raise NotImplementedError("FunctionExpression")
+            raise NotImplementedError("ParenthesizedExpression")
+
+        if token_type == "new":
+            if tokens[self._pos + 1].type == ".":
+                raise NotImplementedError("MetaExpression")
+            raise NotImplementedError("NewExpression")
+
+        if token_type in _NOT_IMPLEMENTED_PRIMARY:
+            raise NotImplementedError(_NOT_IMPLEMENTED_PRIMARY[token_type])
+
+        raise self._error(first)
+
+    def _is_arrow_function(self) -> bool:
+        """Check if the parenthesis at the current token opens arrow function parameters."""
+        tokens = self._tokens
+        depth = 0
+        for pos in range(self._pos, len(tokens)):
+            token_type = tokens[pos].type
+            if token_type == "(":
+                depth += 1
+            elif token_type == ")":
+                depth -= 1
+                if depth == 0:
+                    return tokens[pos + 1].type == "=>"
+            elif token_type == tokenizer.EOF:
+                break
+        return False
+
+    def _array_literal(self) -> List[Union[nodes.Expression, nodes.SpreadElement]]:
+        """Parse an array literal, holes are skipped."""
+        tokens = self._tokens
+        self._expect("[")
+        elements = []
+        while True:
+            token = tokens[self._pos]
+            if token.type == ",":
+                self._pos += 1
+                continue
+            if token.type == "]":
+                self._pos += 1
+                return elements
+
+            if token.type == "...":
+                self._pos += 1
+                argument = self._single_expression(0)
+                elements.append(nodes.SpreadElement(self._loc(token), argument))
+            else:
+                elements.append(self._single_expression(0))
+
+            if tokens[self._pos].type not in (",", "]"):
+                raise self._error(tokens[self._pos])
+
+
+def parse(
+    source: str,
+    source_type: nodes.SourceTypeLiteral = "script",
+    index: Optional[ASTIndex] = None,
+) -> nodes.Program:
+    """Parse the source with the native parser.
+
+    Args:
+        source (str): The JavaScript code.
+        source_type (nodes.SourceTypeLiteral): source type. Could be `script` or `module`. Set to `script` by default.
+        index (Optional[ASTIndex]): If given, the nodes are added to the index.
+
+    Returns:
+        `Program` AST node, which is the root node.
+
+    Raises:
+        JSSyntaxError: on the first syntax error.
+        NotImplementedError: on the first construct `ASTBuilder` doesn't support either, if the source has no syntax
+            errors.
+    """
+    return Parser(source, source_type).parse(index)
@@ -0,0 +1,294 @@
+"""Hand-written JavaScript tokenizer of the native parser.
+
+It follows `grammars/JavaScriptLexer.g4`: the same tokens, the same strict mode tracking as `JavaScriptBaseLexer` and
+the same treatment of characters the grammar doesn't know (they are skipped, like the ``ERROR`` channel tokens).
+Tokens are matched by a single master regular expression, so a token costs one ``re.match`` call instead of an ATN
+simulation step per character.
+
+Only the tokens the parser sees are returned. Whitespace, line terminators and comments are dropped, but every token
+records whether `JavaScriptBaseParser.lineTerminatorAhead` would be true in front of it, which is all the parser needs
+them for.
+"""
+
+import re
+from typing import List
+
+EOF = "EOF"
+IDENTIFIER = "Identifier"
+STRING = "String"
+NUMBER = "Number"
+BIGINT = "BigInt"
+INTEGER = "Integer"
+"""Hex, octal and binary integer literals, which are not supported by the grammar."""
+HASHBANG = "HashBang"
+
+KEYWORDS = frozenset(
+    (
+        "null",
+        "true",
+        "false",
+        "break",
+        "do",
+        "typeof",
+        "else",
+        "new",
+        "var",
+        "return",
+        "void",
+        "continue",
+        "for",
+        "while",
+        "function",
+        "this",
+        "default",
+        "if",
+        "delete",
+        "in",
+        "as",
+        "from",
+        "class",
+        "enum",
+        "extends",
+        "super",
+        "const",
+        "export",
+        "import",
+    )
+)
+"""Reserved words, their token type is the word itself."""
+
+STRICT_KEYWORDS = frozenset(
+    (
+        "implements",
+        "let",
+        "private",
+        "public",
+        "interface",
+        "package",
+        "protected",
+        "static",
+    )
+)
+"""Words reserved in strict mode only, identifiers otherwise."""
+
+_PUNCTUATORS = (
+    ">>>=",
+    "...",
+    "===",
+    "!==",
+    "**=",
+    "<<=",
+    ">>=",
+    ">>>",
+    "=>",
+    "==",
+    "!=",
+    "<=",
+    ">=",
+    "&&",
+    "||",
+    "??",
+    "++",
+    "--",
+    "**",
+    "<<",
+    ">>",
+    "*=",
+    "/=",
+    "%=",
+    "+=",
+    "-=",
+    "&=",
+    "^=",
+    "|=",
+    "[",
+    "]",
+    "(",
+    ")",
+    "{",
+    "}",
+    ";",
+    ",",
+    "=",
+    "?",
+    ":",
+    ".",
+    "+",
+    "-",
+    "~",
+    "!",
+    "*",
+    "/",
+    "%",
+    "#",
+    "<",
+    ">",
+    "&",
+    "^",
+    "|",
+)
+"""Punctuators, longest first, their token type is the punctuator itself."""
+
+_HEX = "[_0-9a-fA-F]"
+_UNICODE_ESCAPE = rf"\\u(?:{_HEX}{{4}}|\{{{_HEX}+\}})"
+_EXPONENT = "[eE][+-]?[0-9_]+"
+_ESCAPE = rf"\\(?:[^0-9xu\r\n]|0|x{_HEX}{{2}}|{_UNICODE_ESCAPE[2:]}|[\r\n\u2028\u2029])"
+
+# Alternatives are tried in order, so the longer of the overlapping tokens come first. The group numbers are used by
+# `tokenize`.
+_TOKEN = re.compile(
+    "|".join(
+        (
+            r"([\t\x0b\x0c \xa0]+)",  # 1: whitespace
+            r"([\r\n\u2028\u2029])",  # 2: line terminator
+            r"(/\*[\s\S]*?\*/)",  # 3: multi-line comment
+            r"(//[^\r\n\u2028\u2029]*|<!--[\s\S]*?-->|<!\[CDATA\[[\s\S]*?\]\]>)",  # 4: other comments
+            rf"((?:[^\W\d]|\$|{_UNICODE_ESCAPE})(?:[\w$\u200c\u200d]|{_UNICODE_ESCAPE})*)",  # 5: identifier
+            rf"((?:0[xX]{_HEX}+|0[oO][0-7][_0-7]*|0[bB][01][_01]*|0|[1-9][0-9_]*)n)",  # 6: bigint
+            rf"(0[xX]{_HEX}+|0[oO][0-7][_0-7]*|0[bB][01][_01]*|0[0-7]+)",  # 7: integer
+            rf"((?:0|[1-9][0-9_]*)(?:\.[0-9][0-9_]*)?(?:{_EXPONENT})?|\.[0-9][0-9_]*(?:{_EXPONENT})?)",  # 8: number
+            rf"""("[^"\\\r\n]*(?:{_ESCAPE}[^"\\\r\n]*)*"|'[^'\\\r\n]*(?:{_ESCAPE}[^'\\\r\n]*)*')""",  # 9: string
+            "(" + "|".join(re.escape(p) for p in _PUNCTUATORS) + ")",  # 10: punctuator
+        )
+    )
+)
+
+_HASHBANG = re.compile(r"#![^\r\n\u2028\u2029]*")
+
+
+class Token:
+    """A token the parser sees.
+
+    `start` and `stop` are the offsets of the first and the last character, like in ANTLR tokens, so the token can be
+    passed to `nodes.SourceLocation.from_tokens`.
+    """
+
+    __slots__ = ("type", "text", "start", "stop", "newline_before", "after_newline")
+
+    def __init__(
+        self,
+        token_type: str,
+        text: str,
+        start: int,
+        stop: int,
+        newline_before: bool,
+        after_newline: bool,
+    ):
+        self.type = token_type
+        self.text = text
+        self.start = start
+        self.stop = stop
+        self.newline_before = newline_before
+        """Whether a line terminator precedes the token, see `JavaScriptBaseParser.lineTerminatorAhead`."""
+        self.after_newline = after_newline
+        """Whether the character right before the token is a line terminator, see
+        `JavaScriptBaseParser.notLineTerminator`. Unlike `newline_before`, it's false if there's whitespace or a comment
+        in between."""
+
+    def __repr__(self):
+        return f"Token({self.type!r}, {self.text!r}, {self.start})"
+
+
+def tokenize(text: str) -> List[Token]:
+    """Split the source into tokens.
+
+    Args:
+        text (str): The source text.
+
+    Returns:
+        The tokens, the last one is an `EOF` token.
+    """
+    tokens: List[Token] = []
+    append = tokens.append
+    match = _TOKEN.match
+    end = len(text)
+    pos = 0
+
+    # `lineTerminatorAhead` looks at the hidden token right before the current one, or at the one before it if that's
+    # whitespace. `breaks` is whether the last hidden token is or contains a line terminator. `notLineTerminator` only
+    # looks at the token right before.
+    newline = False
+    breaks = False
+    terminator = False
+
+    # Strict mode scopes, see `JavaScriptBaseLexer`
+    strict = False
+    scopes: List[bool] = []
+    last_type = None
+
+    while pos < end:
+        if last_type is None and text.startswith("#!", pos):
+            # Only allowed before any other token
+            m = _HASHBANG.match(text, pos)
+            append(Token(HASHBANG, m.group(), pos, m.end() - 1, newline, terminator))
+            last_type = HASHBANG
+            pos = m.end()
+            newline = breaks = terminator = False
+            continue
+
+        m = match(text, pos)
+        if m is None:
+            # `UnexpectedCharacter` goes to the error channel, so the parser never sees it
+            pos += 1
+            newline = breaks = terminator = False
+            continue
+
+        group = m.lastindex
+        value = m.group()
+        start = pos
+        pos = m.end()
+
+        if group == 1:
+            newline = breaks
+            breaks = terminator = False
+            continue
+        if group == 2:
+            newline = breaks = terminator = True
+            continue
+        if group == 3:
+            newline = breaks = "\n" in value or "\r" in value
+            terminator = False
+            continue
+        if group == 4:
+            newline = breaks = terminator = False
+            continue
+
+        if group == 5:
+            if value in KEYWORDS:
+                token_type = value
+            elif strict and value in STRICT_KEYWORDS:
+                token_type = value
+            else:
+                token_type = IDENTIFIER
+        elif group == 10:
+            token_type = value
+            if value == "{":
+                strict = bool(scopes and scopes[-1])
+                scopes.append(strict)
+            elif value == "}":
+                strict = scopes.pop() if scopes else False
+        elif group == 8:
+            token_type = NUMBER
+        elif group == 9:
+            token_type = STRING
+            if (last_type is None or last_type == "{") and value[1:-1] == "use strict":
+                if scopes:
+                    scopes.pop()
+                strict = True
+                scopes.append(strict)
+        elif group == 7:
+            if strict and value[1] not in "xXoObB":
+                # Legacy octal literals are not lexed in strict mode: ``017`` is ``0`` followed by ``17``
+                pos = start + 1
+                token_type, value = NUMBER, "0"
+            else:
+                token_type = INTEGER
+        else:
+            token_type = BIGINT
+
+        append(Token(token_type, value, start, pos - 1, newline, terminator))
+        last_type = token_type
+        newline = breaks = terminator = False
+
+    append(Token(EOF, "<EOF>", end, end - 1, newline, terminator))
+    return tokens
@@ -0,0 +1,49 @@
+import io
+import os
+
+import pytest
+
+from jasminesnake.ast import from_parse_tree, nodes, to_ascii_tree, write_ascii_tree
+from jasminesnake.js_stream import JSFileStream
+
+BASE_PATH = os.path.dirname(os.path.abspath(__file__))
+
+
+class CountingStream(io.StringIO):
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    def write(self, s):
+        self.writes += 1
+        return super().write(s)
+
+
+class TestASCIITree:
+    @pytest.mark.parametrize("ast_format", ["full", "short"])
+    def test_matches_wrapper(self, ast_format):
+        source = os.path.join(BASE_PATH, "expressions", "t", "assignments.js")
+        program = from_parse_tree(JSFileStream(source).parse())
+
+        stream = io.StringIO()
+        write_ascii_tree(program, stream, ast_format=ast_format)
+        assert stream.getvalue() == to_ascii_tree(program, ast_format=ast_format)
+
+    def test_writes_in_batches(self):
+        program = nodes.Program(
+            None,
+            "script",
+            [nodes.EmptyStatement(None) for _ in range(10_000)],
+        )
+
+        stream = CountingStream()
+        write_ascii_tree(program, stream)
+        assert 1 < stream.writes < 10
+        assert len(stream.getvalue().splitlines()) == 5 + 3 * 10_000
+
+    def test_prefix_and_level(self):
+        position = nodes.Position(1, 2)
+        assert to_ascii_tree(position, "start:", 2) == "|   +-- start: 1:2\n"
+
+        with pytest.raises(ValueError):
+            to_ascii_tree(position, nesting_lvl=-1)
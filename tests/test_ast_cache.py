@@ -0,0 +1,72 @@
+import os
+import pickle
+import zlib
+
+from jasminesnake.ast import to_ascii_tree
+from jasminesnake import ast_cache
+from jasminesnake.ast_cache import ASTCache
+
+BASE_PATH = os.path.dirname(os.path.abspath(__file__))
+SOURCE = os.path.join(BASE_PATH, "expressions", "t", "binary_ops.js")
+
+
+class TestASTCache:
+    def test_hit_after_miss(self, tmp_path):
+        cache = ASTCache(str(tmp_path))
+        first = cache.parse_file(SOURCE)
+        second = cache.parse_file(SOURCE)
+
+        assert (cache.hits, cache.misses) == (1, 1)
+        assert to_ascii_tree(first) == to_ascii_tree(second)
+
+    def test_persistence(self, tmp_path):
+        ASTCache(str(tmp_path)).parse_file(SOURCE)
+
+        cache = ASTCache(str(tmp_path))
+        assert len(cache) == 1
+        cache.parse_file(SOURCE)
+        assert (cache.hits, cache.misses) == (1, 0)
+
+    def test_lru_eviction(self, tmp_path):
+        sources = []
+        for i in range(3):
+            path = tmp_path / f"{i}.js"
+            path.write_text(f"a = {i};")
+            sources.append(str(path))
+
+        cache = ASTCache(str(tmp_path / "cache"))
+        cache.parse_file(sources[0])
+        cache.max_size = cache.size * 5 // 2
+
+        cache.parse_file(sources[1])
+        cache.parse_file(sources[0])  # Make the first entry the most recently used one
+        cache.parse_file(sources[2])
+
+        assert len(cache) == 2
+        assert cache.size <= cache.max_size
+
+        cache.parse_file(sources[0])
+        assert cache.hits == 2
+        cache.parse_file(sources[1])
+        assert cache.misses == 4
+
+    def test_format_version_in_key(self, monkeypatch):
+        key = ASTCache.key(b"a = 1;")
+        monkeypatch.setattr(ast_cache, "FORMAT_VERSION", ast_cache.FORMAT_VERSION + 1)
+        assert ASTCache.key(b"a = 1;") != key
+
+    def test_corrupted_entry(self, tmp_path):
+        cache = ASTCache(str(tmp_path))
+        cache.parse_file(SOURCE)
+        (key,) = cache._entries
+
+        # An entry of a module which doesn't exist anymore
+        payload = pickle.dumps(ASTCache, pickle.HIGHEST_PROTOCOL).replace(
+            b"jasminesnake.ast_cache", b"jasminesnake.ast_gone_"
+        )
+        (tmp_path / (key + ".ast")).write_bytes(zlib.compress(payload))
+
+        assert cache.get(key) is None
+        assert len(cache) == 0
+        cache.parse_file(SOURCE)
+        assert (cache.hits, cache.misses) == (0, 3)
@@ -0,0 +1,68 @@
+import functools
+import json
+
+import pytest
+
+from jasminesnake.__main__ import main
+from jasminesnake.ast import to_ascii_tree
+from jasminesnake.batch import collect_js_files, parse_many
+
+
+def _make_files(tmp_path):
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "a.js").write_text("a = 1;")
+    (tmp_path / "sub" / "b.js").write_text("let b = [a, 2];")
+    (tmp_path / "sub" / "bad.js").write_text("let = ;")
+    (tmp_path / "sub" / "notes.txt").write_text("not JS")
+    return collect_js_files([str(tmp_path)])
+
+
+class TestBatch:
+    def test_collect_js_files(self, tmp_path):
+        files = _make_files(tmp_path)
+        assert [f[len(str(tmp_path)) :] for f in files] == [
+            "/a.js",
+            "/sub/b.js",
+            "/sub/bad.js",
+        ]
+
+    def test_failure_does_not_stop_batch(self, tmp_path):
+        files = _make_files(tmp_path)
+        results = {r.path: r for r in parse_many(files, workers=2)}
+
+        assert set(results) == set(files)
+        assert results[files[0]].ok
+        assert results[files[0]].value.type == "Program"
+        assert results[files[1]].ok
+        assert not results[files[2]].ok
+        assert "JSSyntaxError: 1:6" in results[files[2]].error
+
+    def test_postprocess_in_process(self, tmp_path):
+        files = _make_files(tmp_path)[:2]
+        dump = functools.partial(to_ascii_tree, ast_format="short")
+        results = list(parse_many(files, workers=1, postprocess=dump))
+
+        assert [r.value.splitlines()[0] for r in results] == ["Program at 1:0"] * 2
+
+    @pytest.mark.parametrize("kwargs", [{"workers": 0}, {"backend": "yacc"}])
+    def test_arguments_are_validated_eagerly(self, kwargs):
+        with pytest.raises(ValueError):
+            parse_many([], **kwargs)
+
+    def test_entry_point_dispatches_subcommands(self, tmp_path, capsys):
+        files = _make_files(tmp_path)[:1]
+
+        with pytest.raises(SystemExit) as e:
+            main(["batch", "-j", "1", *files])
+
+        assert e.value.code == 0
+        assert json.loads(capsys.readouterr().out)["path"] == files[0]
+
+    def test_entry_point_parses_file(self, tmp_path, capsys):
+        files = _make_files(tmp_path)[:1]
+
+        with pytest.raises(SystemExit) as e:
+            main(["--ast", "json", files[0]])
+
+        assert e.value.code == 0
+        assert json.loads(capsys.readouterr().out)["type"] == "Program"
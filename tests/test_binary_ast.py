@@ -0,0 +1,94 @@
+import io
+import os
+import sys
+
+import pytest
+
+from jasminesnake.ast import binary, from_parse_tree, nodes, to_ascii_tree
+from jasminesnake.js_stream import JSFileStream, JSStringStream
+
+BASE_PATH = os.path.dirname(os.path.abspath(__file__))
+SOURCES = [
+    os.path.join(BASE_PATH, "expressions", "t", "assignments.js"),
+    os.path.join(BASE_PATH, "expressions", "t", "inc_dec.js"),
+    os.path.join(BASE_PATH, "statements", "t", "variable_decl.js"),
+    os.path.join(BASE_PATH, "literals", "t", "0004.js"),
+]
+
+
+@pytest.fixture(params=SOURCES, ids=os.path.basename)
+def program(request):
+    return from_parse_tree(JSFileStream(request.param).parse())
+
+
+class TestBinaryAST:
+    def test_round_trip(self, program):
+        data = binary.dumps(program)
+        assert to_ascii_tree(binary.loads(data)) == to_ascii_tree(program)
+
+        file = io.BytesIO()
+        binary.dump(program, file)
+        file.seek(0)
+        assert to_ascii_tree(binary.load(file)) == to_ascii_tree(program)
+
+    def test_without_locations(self, program):
+        data = binary.dumps(program, locations=False)
+        assert len(data) < len(binary.dumps(program))
+
+        loaded = binary.loads(data)
+        assert loaded.loc is None
+        assert binary.dumps(loaded, locations=False) == data
+
+    def test_values(self):
+        loc = nodes.SourceLocation("a.js", nodes.Position(1, 0), nodes.Position(2, 3))
+        values = [None, True, False, "ü\ud800", -(2**70), 0, 2.5, float("inf")]
+        program = nodes.Program(
+            loc,
+            "module",
+            [
+                nodes.ExpressionStatement(None, nodes.Literal(None, value))
+                for value in values
+            ],
+        )
+
+        loaded = binary.loads(binary.dumps(program))
+        assert str(loaded.loc) == "a.js:1:0" and str(loaded.loc.end) == "2:3"
+        assert loaded.source_type == "module"
+        assert [s.expression.value for s in loaded.body] == values
+        assert [type(s.expression.value) for s in loaded.body] == list(
+            map(type, values)
+        )
+
+    def test_deep_nesting(self):
+        loc = nodes.SourceLocation(None, nodes.Position(1, 0), nodes.Position(1, 1))
+        expression = nodes.Identifier(loc, "a")
+        for _ in range(sys.getrecursionlimit() * 2):
+            expression = nodes.UnaryMinusExpression(loc, expression)
+        program = nodes.Program(
+            loc, "script", [nodes.ExpressionStatement(loc, expression)]
+        )
+
+        data = binary.dumps(program)
+        assert binary.dumps(binary.loads(data)) == data
+
+    def test_reader(self, tmp_path):
+        program = from_parse_tree(JSStringStream("a = 1; b = 2; c = 3;").parse())
+        path = tmp_path / "ast.bin"
+        with open(path, "wb") as file:
+            binary.dump(program, file)
+
+        with binary.BinaryASTReader.open(str(path)) as reader:
+            assert len(reader) == 3
+            statement = reader.statement(1)
+            assert to_ascii_tree(statement) == to_ascii_tree(program.body[1])
+            with pytest.raises(IndexError):
+                reader.statement(3)
+
+    @pytest.mark.parametrize(
+        "data",
+        [b"", b"JSAST" + bytes(50), b"NOAST" + bytes(50)],
+        ids=["empty", "bad-version", "bad-magic"],
+    )
+    def test_invalid(self, data):
+        with pytest.raises(ValueError):
+            binary.loads(data)
@@ -0,0 +1,103 @@
+import os
+
+import pytest
+
+from jasminesnake.ast import from_parse_tree, nodes, to_ascii_tree
+from jasminesnake.ast.columnar import ColumnarAST
+from jasminesnake.js_stream import JSFileStream, JSStringStream
+
+BASE_PATH = os.path.dirname(os.path.abspath(__file__))
+SOURCES = [
+    os.path.join(BASE_PATH, "expressions", "t", "assignments.js"),
+    os.path.join(BASE_PATH, "statements", "t", "block_stmt.js"),
+    os.path.join(BASE_PATH, "literals", "t", "0004.js"),
+]
+
+
+def preorder(node):
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        yield node
+
+        children = []
+        for value in node.fields.values():
+            if isinstance(value, nodes.Node):
+                children.append(value)
+            elif isinstance(value, list):
+                children.extend(v for v in value if isinstance(v, nodes.Node))
+        stack.extend(reversed(children))
+
+
+@pytest.fixture(params=SOURCES, ids=os.path.basename)
+def program(request):
+    return from_parse_tree(JSFileStream(request.param).parse())
+
+
+class TestColumnarAST:
+    def test_round_trip(self, program):
+        tree = ColumnarAST.from_node(program)
+        assert to_ascii_tree(tree.to_node()) == to_ascii_tree(program)
+
+    def test_handles(self, program):
+        tree = ColumnarAST.from_node(program)
+        assert to_ascii_tree(tree[0]) == to_ascii_tree(program)
+
+    def test_walk(self, program):
+        tree = ColumnarAST.from_node(program)
+        types = [tree.node_type(index) for index in tree.walk()]
+        assert types == [node.type for node in preorder(program)]
+
+    def test_subtree(self):
+        program = from_parse_tree(JSStringStream("a = [b, ...c]; d;").parse())
+        tree = ColumnarAST.from_node(program)
+
+        array = next(tree.indices_of(nodes.ArrayExpression))
+        assert [tree.node_type(i) for i in tree.walk(array)] == [
+            "ArrayExpression",
+            "Identifier",
+            "SpreadElement",
+            "Identifier",
+        ]
+        assert [tree.node_type(i) for i in tree.children(array)] == [
+            "Identifier",
+            "SpreadElement",
+        ]
+
+        node = tree.to_node(array)
+        assert isinstance(node, nodes.ArrayExpression)
+        assert node.elements[1].argument.name == "c"
+
+    def test_handle_fields(self):
+        program = from_parse_tree(JSStringStream("x += 1;").parse())
+        tree = ColumnarAST.from_node(program)
+
+        handle = tree[0]
+        assert handle.source_type == handle.fields["sourceType"] == "script"
+        expression = handle.body[0].expression.expressions[0]
+        assert expression.node_class is nodes.AssignmentExpression
+        assert expression.operator is nodes.AssignmentOperator.ADD
+        assert expression.right.value == 1.0
+        assert str(expression.loc) == "1:0"
+
+        with pytest.raises(AttributeError):
+            expression.name
+        with pytest.raises(IndexError):
+            tree[len(tree)]
+
+    def test_constants_keep_types(self):
+        loc = nodes.SourceLocation(None, nodes.Position(1, 0), nodes.Position(1, 1))
+        program = nodes.Program(
+            None,
+            "script",
+            [
+                nodes.ExpressionStatement(loc, nodes.BooleanLiteral(loc, True)),
+                nodes.ExpressionStatement(loc, nodes.NumericLiteral(loc, 1.0)),
+            ],
+        )
+        tree = ColumnarAST.from_node(program)
+
+        assert tree[0].loc is None
+        values = [s.expression.value for s in tree.to_node().body]
+        assert values == [True, 1.0]
+        assert [type(v) for v in values] == [bool, float]
@@ -0,0 +1,56 @@
+import sys
+
+from antlr4.tree.Tree import TerminalNodeImpl
+
+from jasminesnake.ast import nodes, to_ascii_tree
+from jasminesnake.ast.builder import ASTBuilder
+from jasminesnake.js_stream import JSStringStream
+from jasminesnake.lex.JavaScriptParser import JavaScriptParser as JSP
+
+DEPTH = 100_000
+
+
+def deep_additive_expression(depth):
+    """Build the parse tree of `a + a + ... + a` with `depth` additions without parsing it."""
+    tree = JSStringStream("a + a;").parse()
+    additive = tree.sourceElements().sourceElement(0).statement()
+    additive = additive.expressionStatement().expressionSequence().singleExpression(0)
+    left, plus, right = additive.children
+
+    ctx = left
+    for _ in range(depth):
+        parent = JSP.AdditiveExpressionContext(None, JSP.SingleExpressionContext(None))
+        parent.start, parent.stop = left.start, right.stop
+        for child in (ctx, TerminalNodeImpl(plus.symbol), right):
+            parent.addChild(child)
+        ctx = parent
+
+    return ctx
+
+
+class TestDeepNesting:
+    def test_builder(self):
+        expression = ASTBuilder().visit(deep_additive_expression(DEPTH))
+
+        depth = 0
+        while isinstance(expression, nodes.AddArithmeticExpression):
+            assert expression.right.name == "a"
+            expression = expression.left
+            depth += 1
+
+        assert depth == DEPTH
+        assert expression.name == "a"
+
+    def test_ascii_tree(self):
+        # Every line is indented by the nesting level, so keep the output size sane
+        depth = sys.getrecursionlimit() * 2
+        loc = nodes.SourceLocation(None, nodes.Position(1, 0), nodes.Position(1, 1))
+
+        expression = nodes.Identifier(loc, "a")
+        for _ in range(depth):
+            expression = nodes.ArrayExpression(loc, [expression])
+
+        dump = to_ascii_tree(expression, ast_format="short")
+        lines = dump.splitlines()
+        assert len(lines) == 2 * depth + 2
+        assert lines[-1] == "|   " * (2 * depth) + "+-- name: a"
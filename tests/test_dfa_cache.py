@@ -0,0 +1,49 @@
+import os
+import pickle
+import zlib
+
+from jasminesnake.ast import from_parse_tree, to_ascii_tree
+from jasminesnake.js_stream import JSFileStream
+from jasminesnake.lex import load_dfa_cache, save_dfa_cache
+from jasminesnake.lex.DFACache import warm_up
+from jasminesnake.lex.JavaScriptParser import JavaScriptParser
+
+BASE_PATH = os.path.dirname(os.path.abspath(__file__))
+SOURCE = os.path.join(BASE_PATH, "expressions", "t", "binary_ops.js")
+
+
+def _dfa_state_count():
+    return sum(len(dfa.states) for dfa in JavaScriptParser.decisionsToDFA)
+
+
+class TestDFACache:
+    def test_round_trip(self, tmp_path):
+        path = str(tmp_path / "dfa.cache")
+        warm_up([SOURCE])
+        expected = to_ascii_tree(from_parse_tree(JSFileStream(SOURCE).parse()))
+        states = _dfa_state_count()
+        save_dfa_cache(path)
+
+        assert load_dfa_cache(path)
+        assert _dfa_state_count() == states
+        tree = from_parse_tree(JSFileStream(SOURCE).parse())
+        assert to_ascii_tree(tree) == expected
+        assert _dfa_state_count() == states  # Nothing new to learn
+
+    def test_missing(self, tmp_path):
+        assert not load_dfa_cache(str(tmp_path / "missing.cache"))
+
+    def test_stale(self, tmp_path):
+        path = tmp_path / "dfa.cache"
+        save_dfa_cache(str(path))
+        data = pickle.loads(zlib.decompress(path.read_bytes()))
+        data["grammar"] = "0" * 64
+        path.write_bytes(zlib.compress(pickle.dumps(data)))
+
+        assert not load_dfa_cache(str(path))
+
+    def test_corrupted(self, tmp_path):
+        path = tmp_path / "dfa.cache"
+        path.write_bytes(b"not a cache")
+
+        assert not load_dfa_cache(str(path))
@@ -0,0 +1,123 @@
+import io
+import json
+import os
+import sys
+
+import pytest
+
+from jasminesnake.ast import estree, from_parse_tree, nodes, to_ascii_tree
+from jasminesnake.js_stream import JSFileStream
+
+BASE_PATH = os.path.dirname(os.path.abspath(__file__))
+SOURCES = [
+    os.path.join(BASE_PATH, "expressions", "t", "assignments.js"),
+    os.path.join(BASE_PATH, "expressions", "t", "inc_dec.js"),
+    os.path.join(BASE_PATH, "statements", "t", "variable_decl.js"),
+    os.path.join(BASE_PATH, "literals", "t", "0004.js"),
+]
+
+
+@pytest.fixture(params=SOURCES, ids=os.path.basename)
+def program(request):
+    return from_parse_tree(JSFileStream(request.param).parse())
+
+
+def to_dict(value):
+    """Materialize the ESTree dict of a tree the straightforward way."""
+    if isinstance(value, list):
+        return [to_dict(item) for item in value]
+    if isinstance(value, nodes.Enum):
+        return value.value
+    if not isinstance(value, nodes.Node):
+        return value
+
+    result = {}
+    for name, field in value.fields.items():
+        if name == "loc" and field is not None:
+            field = {
+                "start": {"line": field.start.line, "column": field.start.column},
+                "end": {"line": field.end.line, "column": field.end.column},
+            }
+        result[name] = to_dict(field)
+    if value.range is not None:
+        result["range"] = list(value.range)
+    return result
+
+
+def walk_classes(node):
+    stack = [node]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, nodes.Node):
+            yield type(value)
+            stack.extend(value.fields.values())
+        elif isinstance(value, list):
+            stack.extend(value)
+
+
+class TestESTreeJSON:
+    def test_matches_materialized_dict(self, program):
+        assert json.loads(estree.dumps(program)) == to_dict(program)
+
+    @pytest.mark.parametrize("chunk_size", [1, 7, 65536])
+    def test_round_trip(self, program, chunk_size):
+        text = estree.dumps(program)
+        loaded = estree.load(io.StringIO(text), chunk_size)
+
+        assert to_ascii_tree(loaded) == to_ascii_tree(program)
+        assert list(walk_classes(loaded)) == list(walk_classes(program))
+        assert estree.dumps(loaded) == text
+
+    def test_without_locations(self, program):
+        text = estree.dumps(program, locations=False)
+        assert '"loc"' not in text
+
+        loaded = estree.loads(text)
+        assert loaded.loc is None
+        assert estree.dumps(loaded, locations=False) == text
+
+    def test_literals(self):
+        values = [None, True, False, 'a"\\\nü', -(2**70), 0, 2.5, 1e300]
+        program = nodes.Program(
+            None,
+            "script",
+            [
+                nodes.ExpressionStatement(None, nodes.Literal(None, value))
+                for value in values
+            ],
+        )
+
+        loaded = estree.loads(estree.dumps(program))
+        assert [s.expression.value for s in loaded.body] == values
+        assert [type(s.expression) for s in loaded.body] == [
+            nodes.NullLiteral,
+            nodes.BooleanLiteral,
+            nodes.BooleanLiteral,
+            nodes.StringLiteral,
+            nodes.NumericLiteral,
+            nodes.NumericLiteral,
+            nodes.NumericLiteral,
+            nodes.NumericLiteral,
+        ]
+
+    def test_deep_nesting(self):
+        depth = sys.getrecursionlimit() * 2
+        node = nodes.Identifier(None, "a")
+        for _ in range(depth):
+            node = nodes.ArrayExpression(None, [node])
+
+        text = estree.dumps(node)
+        assert text.startswith('{"type":"ArrayExpression","elements":[' * 2)
+
+        loaded = estree.loads(text)
+        for _ in range(depth):
+            loaded = loaded.elements[0]
+        assert loaded.name == "a"
+
+    @pytest.mark.parametrize(
+        "text",
+        ["", "{", '{"type":"Identifier",}', "[1 2]", '{"a" 1}', "[1]]", "nul"],
+    )
+    def test_invalid(self, text):
+        with pytest.raises(ValueError):
+            estree.loads(text)
@@ -0,0 +1,80 @@
+import logging
+
+from jasminesnake.js_stream import ParseMode, ParserSession
+from jasminesnake.lex.ErrorListeners import LogErrorListener
+from jasminesnake.lex.GrammarProfiler import ProfilingATNSimulator, profile_parser
+
+SOURCE = "let a = 1 + 2;\nclass C { get y() { return this.x; } }\n"
+
+
+def profile(source=SOURCE, mode=ParseMode.SLL_LL):
+    session = ParserSession(LogErrorListener(), mode)
+    grammar_profile = profile_parser(session.parser)
+    tree = session.parse_string(source)
+    return session, grammar_profile, tree
+
+
+class TestGrammarProfiler:
+    def test_decisions(self):
+        session, grammar_profile, _ = profile()
+        assert isinstance(session.parser._interp, ProfilingATNSimulator)
+
+        ranked = grammar_profile.ranked()
+        assert ranked
+        assert all(info.invocations > 0 and info.time_ns > 0 for info in ranked)
+        assert [info.time_ns for info in ranked] == sorted(
+            (info.time_ns for info in ranked), reverse=True
+        )
+        assert "statement" in [
+            grammar_profile.rule_name(info.decision) for info in ranked
+        ]
+
+        for info in ranked:
+            assert 1 <= info.sll_max_look <= info.sll_total_look
+
+    def test_same_tree(self):
+        session, _, tree = profile()
+        plain = ParserSession().parse_string(SOURCE)
+        assert tree.toStringTree(session.parser.ruleNames) == plain.toStringTree(
+            session.parser.ruleNames
+        )
+
+    def test_ll_fallbacks(self):
+        _, grammar_profile, _ = profile(mode=ParseMode.LL)
+        fallbacks = [info for info in grammar_profile.decisions if info.ll_fallbacks]
+        assert fallbacks
+        for info in fallbacks:
+            assert info.ll_max_look >= 1
+            assert grammar_profile.rule_name(info.decision) in [
+                "statement",
+                "singleExpression",
+                "methodDefinition",
+            ]
+
+        _, grammar_profile, _ = profile(mode=ParseMode.SLL)
+        assert not any(info.ll_fallbacks for info in grammar_profile.decisions)
+
+    def test_report(self):
+        _, grammar_profile, _ = profile()
+        lines = grammar_profile.report(3).splitlines()
+        assert len(lines) == 5
+        assert lines[0].split()[:3] == ["decision", "rule", "calls"]
+        assert lines[2].split()[1] == grammar_profile.rule_name(
+            grammar_profile.ranked()[0].decision
+        )
+
+
+class Unprintable:
+    def __str__(self):
+        raise AssertionError("Formatted with debug logging off")
+
+
+class TestLogErrorListener:
+    def test_lazy_debug_messages(self, caplog):
+        listener = LogErrorListener()
+        caplog.set_level(logging.INFO)
+        thing = Unprintable()
+
+        listener.reportAmbiguity(None, thing, 0, 1, True, thing, thing)
+        listener.reportAttemptingFullContext(None, thing, 0, 1, thing, thing)
+        listener.reportContextSensitivity(None, thing, 0, 1, 1, thing)
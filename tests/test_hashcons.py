@@ -0,0 +1,71 @@
+import sys
+
+from jasminesnake.ast import estree, from_parse_tree, nodes, to_ascii_tree
+from jasminesnake.ast.hashcons import Interner, structural_hash
+from jasminesnake.js_stream import JSStringStream
+
+
+def parse(source):
+    return from_parse_tree(JSStringStream(source).parse())
+
+
+class TestHashConsing:
+    def test_shares_equal_subtrees(self):
+        program = parse("x = a + 1;\nlet y = [a + 1, a];\n")
+        text = estree.dumps(program, locations=False)
+
+        interner = Interner()
+        interned = interner.intern(program)
+        assert estree.dumps(interned, locations=False) == text
+
+        first = interned.body[0].expression.expressions[0].right
+        second = interned.body[1].declarations[0].init.elements
+        assert second[0] is first
+        assert second[1] is first.left
+        assert first in interner
+
+    def test_does_not_change_tree(self):
+        program = parse("x = a + 1;\nlet y = [a + 1, a];\n")
+        text = to_ascii_tree(program)
+
+        Interner().intern(program)
+        assert to_ascii_tree(program) == text
+
+        structural_hash(program)
+        assert to_ascii_tree(program) == text
+
+    def test_ignores_locations(self):
+        interner = Interner()
+        first = interner.intern(parse("a  *  b;"))
+        second = interner.intern(parse("\n\n  a*b;"))
+        assert second is first
+        assert interner.digest(second) == interner.digest(first)
+
+    def test_distinguishes_values(self):
+        interner = Interner()
+        literals = [
+            nodes.Literal(None, value) for value in [True, 1, 1.0, "1", -0.0, 0.0]
+        ]
+        interned = [interner.intern(literal) for literal in literals]
+        assert interned == literals
+        assert len({interner.digest(node) for node in interned}) == len(literals)
+
+        assert interner.intern(nodes.Literal(None, 1)) is literals[1]
+        assert structural_hash(parse("a - b;")) != structural_hash(parse("b - a;"))
+
+    def test_stable_digest(self):
+        source = "let x = [1, 'a', y += 2];"
+        assert structural_hash(parse(source)) == structural_hash(parse(source))
+        assert (
+            structural_hash(parse(source)).hex() == "22c108aa52e79a4faccefe75f1947f8e"
+        )
+
+    def test_deep_nesting(self):
+        depth = sys.getrecursionlimit() * 2
+        node = nodes.Identifier(None, "a")
+        for _ in range(depth):
+            node = nodes.ArrayExpression(None, [node])
+
+        interner = Interner()
+        interner.intern(node)
+        assert len(interner) == depth + 1
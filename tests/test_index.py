@@ -0,0 +1,84 @@
+from jasminesnake.ast import ASTIndex, from_parse_tree, nodes
+from jasminesnake.ast.visitor import walk
+from jasminesnake.js_stream import JSStringStream
+
+SOURCE = "let a = [b, -c];\nx = a + 10 * b;\n"
+
+
+def build(source=SOURCE):
+    index = ASTIndex()
+    program = from_parse_tree(JSStringStream(source).parse(), index)
+    return program, index
+
+
+class TestASTIndex:
+    def test_built_with_tree(self):
+        program, index = build()
+        assert len(index) == len(list(walk(program)))
+        assert [node.name for node in index.of_type("Identifier")] == [
+            "a",
+            "b",
+            "c",
+            "x",
+            "a",
+            "b",
+        ]
+        assert index.of_type("CallExpression") == []
+
+        binary = index.instances(nodes.BinaryExpression)
+        assert [node.operator.value for node in binary] == ["+", "*"]
+
+    def test_matches_from_node(self):
+        program, index = build()
+        other = ASTIndex.from_node(program)
+        for node in walk(program):
+            assert index.parent(node) is other.parent(node)
+        assert index.of_type("Identifier") == other.of_type("Identifier")
+
+    def test_parents(self):
+        program, index = build()
+        assert index.parent(program) is None
+
+        minus = index.of_type("UnaryExpression")[0]
+        assert index.parent(minus) is program.body[0].declarations[0].init
+        assert list(index.ancestors(minus))[-1] is program
+        assert [type(node) for node in index.ancestors(minus)] == [
+            nodes.ArrayExpression,
+            nodes.VariableDeclarator,
+            nodes.VariableDeclaration,
+            nodes.Program,
+        ]
+
+    def test_node_at(self):
+        program, index = build()
+        assert index.node_at(SOURCE.index("c")).name == "c"
+        assert type(index.node_at(SOURCE.index("-"))) is nodes.UnaryMinusExpression
+        assert type(index.node_at(SOURCE.index("10"))) is nodes.NumericLiteral
+        assert (
+            type(index.node_at(SOURCE.index("*") - 1)) is nodes.MulArithmeticExpression
+        )
+        assert type(index.node_at(SOURCE.index("+"))) is nodes.AddArithmeticExpression
+        assert type(index.node_at(SOURCE.index(","))) is nodes.ArrayExpression
+        assert type(index.node_at(0)) is nodes.VariableDeclaration
+        assert index.node_at(-1) is None
+        assert index.node_at(len(SOURCE)) is None
+
+        # The innermost one of the nodes with the same range
+        assert type(index.node_at(SOURCE.index("x"))) is nodes.Identifier
+
+    def test_node_at_every_offset(self):
+        program, index = build()
+        for offset in range(len(SOURCE) - 1):
+            expected = None
+            for node in walk(program):
+                start, end = node.range
+                if start <= offset < end:
+                    expected = node  # Pre-order, so the last one is the innermost
+            assert index.node_at(offset) is expected, offset
+
+    def test_updated_after_add(self):
+        _, index = build("a;")
+        assert len(index.of_type("Identifier")) == 1
+
+        index.add(nodes.Identifier(None, "b"))
+        assert [node.name for node in index.of_type("Identifier")] == ["a", "b"]
@@ -0,0 +1,186 @@
+import threading
+
+import pytest
+from antlr4 import InputStream, Token
+from antlr4.error.ErrorListener import ErrorListener
+from antlr4.error.Errors import ParseCancellationException
+
+from jasminesnake.ast import from_parse_tree, nodes, to_ascii_tree
+from jasminesnake.char_streams import CompactInputStream, MappedFileStream
+from jasminesnake.js_stream import (
+    JSFileStream,
+    JSStringStream,
+    ParseMode,
+    ParserSession,
+)
+from jasminesnake.lex.ErrorListeners import (
+    JSSyntaxError,
+    LogErrorListener,
+    RaiseErrorListener,
+)
+
+
+class CountingErrorListener(ErrorListener):
+    def __init__(self):
+        super().__init__()
+        self.errors = 0
+
+    def syntaxError(self, recognizer, offendingSymbol, line, column, msg, e):
+        self.errors += 1
+
+
+class TestParseModes:
+    def test_sll_stage_by_default(self):
+        stream = JSStringStream("let a = 2 + 2 * 2;")
+        stream.parse()
+        assert stream.parse_stage is ParseMode.SLL
+
+    @pytest.mark.parametrize("mode", [ParseMode.SLL, ParseMode.LL])
+    def test_explicit_mode(self, mode):
+        stream = JSStringStream("a = 1;", parse_mode=mode)
+        stream.parse()
+        assert stream.parse_stage is mode
+
+    def test_fallback_reports_errors_once(self):
+        listener = CountingErrorListener()
+        stream = JSStringStream("let = = ;", listener)
+        stream.parse()
+        assert stream.parse_stage is ParseMode.LL
+        assert listener.errors > 0
+
+    def test_fallback_keeps_raising_listener(self):
+        stream = JSStringStream("let = = ;", LogErrorListener())
+        with pytest.raises(ParseCancellationException):
+            stream.parse()
+
+
+class TestParserSession:
+    SOURCES = [
+        "let a = [1, 2];",
+        "'use strict'; b = a + 3 * 4;",
+        "let = = ;",
+        "/re/g.test(c);",
+        "d = e / f / g;",
+    ]
+
+    def test_same_trees_as_fresh_streams(self):
+        session = ParserSession(CountingErrorListener())
+        for source in self.SOURCES * 2:
+            stream = JSStringStream(source, CountingErrorListener())
+            expected = stream.parse().toStringTree(stream.parser.ruleNames)
+
+            tree = session.parse_string(source)
+            assert tree.toStringTree(session.parser.ruleNames) == expected
+            assert session.parse_stage is stream.parse_stage
+
+    def test_recovers_after_raising_listener(self):
+        session = ParserSession(LogErrorListener())
+        with pytest.raises(ParseCancellationException):
+            session.parse_string("let = = ;")
+
+        session.parse_string("a = 1;")
+        assert session.parse_stage is ParseMode.SLL
+
+    def test_session_per_thread(self):
+        expected = JSStringStream(self.SOURCES[1]).parse().getText()
+        results = []
+
+        def work():
+            session = ParserSession()
+            results.extend(
+                session.parse_string(self.SOURCES[1]).getText() for _ in range(3)
+            )
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert results == [expected] * 12
+
+
+class TestCheck:
+    def test_valid(self):
+        stream = JSStringStream("let a = [1, 2];\nb = a + 3 * 4;")
+        assert stream.check()
+        assert stream.parse_stage is ParseMode.SLL
+
+    @pytest.mark.parametrize("mode", list(ParseMode))
+    def test_errors_are_reported(self, mode):
+        listener = CountingErrorListener()
+        assert not JSStringStream("let = = ;", listener, mode).check()
+        assert listener.errors > 0
+
+    def test_session_builds_trees_after_check(self):
+        session = ParserSession()
+        session.check(CompactInputStream("a = 1;"))
+        assert session.parse_string("a = 1;").getChildCount() > 0
+
+
+class TestIterStatements:
+    SOURCE = "#!/usr/bin/env node\nlet a = [1, 2];\n'use strict'; b = a + 3 * 4\n/re/g;\n;c = a\n/ b / 2;"
+
+    @pytest.mark.parametrize("mode", list(ParseMode))
+    def test_same_as_program_body(self, mode):
+        program = from_parse_tree(JSStringStream(self.SOURCE, parse_mode=mode).parse())
+        expected = [to_ascii_tree(stmt) for stmt in program.body]
+
+        stream = JSStringStream(self.SOURCE, parse_mode=mode)
+        assert [to_ascii_tree(stmt) for stmt in stream.iter_statements()] == expected
+
+    def test_tokens_are_dropped(self):
+        source = "a = 1;\n" * 20
+        session = ParserSession()
+        buffered = []
+        for _ in session.iter_statements(CompactInputStream(source)):
+            buffered.append(len(session.tokens.tokens))
+
+        assert len(buffered) == 20
+        assert max(buffered) < 16
+
+    def test_fallback_reports_errors(self):
+        session = ParserSession(RaiseErrorListener())
+        statements = session.iter_statements(CompactInputStream("a = 1; let = = ;"))
+
+        assert isinstance(next(statements), nodes.ExpressionStatement)
+        with pytest.raises(JSSyntaxError):
+            next(statements)
+        assert session.parse_stage is ParseMode.LL
+
+        assert len(list(session.iter_statements(CompactInputStream("a = 1;")))) == 1
+
+
+class TestCharStreams:
+    SOURCE = "let a = [1, 2];\nb = a + 3 * 4;"
+
+    def _assert_same(self, stream, reference):
+        assert stream.size == reference.size
+        for _ in range(reference.size + 1):
+            assert stream.LA(1) == reference.LA(1)
+            assert stream.LA(-1) == reference.LA(-1)
+            if reference.LA(1) != Token.EOF:
+                stream.consume()
+                reference.consume()
+        stream.seek(4)
+        reference.seek(4)
+        assert stream.LA(1) == reference.LA(1)
+        assert stream.getText(4, 9) == reference.getText(4, 9)
+        assert stream.getText(0, 10**6) == reference.getText(0, 10**6)
+
+    def test_compact_stream(self):
+        self._assert_same(CompactInputStream(self.SOURCE), InputStream(self.SOURCE))
+
+    @pytest.mark.parametrize("source", [SOURCE, 'let s = "привет";', ""])
+    def test_mapped_file_stream(self, tmp_path, source):
+        path = tmp_path / "test.js"
+        path.write_text(source, encoding="utf-8")
+        self._assert_same(MappedFileStream(str(path)), InputStream(source))
+
+    def test_file_stream_parses(self, tmp_path):
+        path = tmp_path / "test.js"
+        path.write_text(self.SOURCE)
+        tree = JSFileStream(str(path)).parse()
+        assert (
+            tree.getText() == self.SOURCE.replace(" ", "").replace("\n", "") + "<EOF>"
+        )
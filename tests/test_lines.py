@@ -0,0 +1,54 @@
+import pytest
+
+from jasminesnake.ast import from_parse_tree, nodes
+from jasminesnake.ast.lines import LineTable
+from jasminesnake.char_streams import CompactInputStream
+from jasminesnake.js_stream import JSFileStream, JSStringStream
+
+SOURCE = "let a = 1;\n\nb = [a,\n  'ü', c];\r\n  d;"
+
+
+class TestLineTable:
+    @pytest.mark.parametrize("text", [SOURCE, SOURCE.encode("utf-8")])
+    def test_positions(self, text):
+        lines = LineTable(text)
+        assert len(lines) == 5
+
+        assert str(lines.position(0)) == "1:0"
+        assert str(lines.position(10)) == "1:10"  # The newline belongs to its line
+        assert str(lines.position(11)) == "2:0"
+        assert str(lines.position(14)) == "3:2"
+
+    def test_matches_tokens(self):
+        stream = CompactInputStream(SOURCE)
+        lines = LineTable.from_stream(stream)
+
+        tokens = JSStringStream(SOURCE).parse().parser.getTokenStream().tokens
+        for token in tokens:
+            position = lines.position(token.start)
+            assert (position.line, position.column) == (token.line, token.column)
+
+
+class TestLazyLocations:
+    def test_locations(self):
+        program = from_parse_tree(JSStringStream(SOURCE).parse())
+        statement = program.body[1]
+
+        assert str(statement.loc.start) == "3:0"
+        assert str(statement.loc.end) == "4:10"
+        assert statement.range == (12, 30)
+        assert SOURCE[slice(*statement.range)] == "b = [a,\n  'ü', c];"
+
+    def test_mapped_file(self, tmp_path):
+        path = tmp_path / "source.js"
+        path.write_text(SOURCE.replace("ü", "u"))
+
+        program = from_parse_tree(JSFileStream(str(path)).parse())
+        assert str(program.body[2].loc.start) == "5:2"
+        assert program.body[2].range == (34, 36)
+
+    def test_eager_location(self):
+        start, end = nodes.Position(1, 0), nodes.Position(1, 1)
+        identifier = nodes.Identifier(nodes.SourceLocation(None, start, end), "a")
+        assert identifier.loc.start is start
+        assert identifier.range is None
@@ -0,0 +1,170 @@
+import glob
+import os
+import time
+
+import pytest
+
+from jasminesnake import native
+from jasminesnake.ast import estree, from_parse_tree
+from jasminesnake.batch import parse_many
+from jasminesnake.js_stream import JSStringStream
+from jasminesnake.lex.ErrorListeners import JSSyntaxError, RaiseErrorListener
+from jasminesnake.native import tokenizer
+
+BASE_PATH = os.path.dirname(os.path.abspath(__file__))
+CORPUS = sorted(glob.glob(os.path.join(BASE_PATH, "*", "t", "*.js")))
+
+SOURCES = [
+    "a + b * c - d / e % f ** g ** h;",
+    "x = y += a - b;\nx >>>= y <<= 1",
+    "a == b != c === d !== e < f > g <= h >= i << j >> k >>> l;",
+    "-a ** b + !c * typeof d - void 0 + delete x;",
+    "a = b += c;",
+    "let [a, , [b], ...c] = [1, , 'str', ...d], e;",
+    "const x = null, y = true;\nvar z = false",
+    "a\n+b\na\n-b\na\n++b",
+    "a\n++\nb",
+    "a++ + --b",
+    "{ a; { b } }\n;;",
+    "this; super; new.target",
+    "#!/usr/bin/env node\n1 + 2",
+    "a /* comment */ + b // comment\n<!-- html comment -->\nc",
+    "let\nx = 1",
+    "a\n[...b]",
+    "var b = false\n+[]\n*c",
+    "'use strict'\nlet = 1",
+    'a === a\n [b, []] , b , [] % "s"',
+    "a\n[b] c",
+    "{let\n let x;}",
+    "let\n[a]\n*1",
+    "a ++ \n ++ a",
+    "a[b];\nc d",
+    "if (a) b;\nc d",
+]
+
+
+def antlr_parse(source):
+    return from_parse_tree(JSStringStream(source, RaiseErrorListener()).parse())
+
+
+def outcome(parse, source):
+    try:
+        return estree.dumps(parse(source))
+    except JSSyntaxError:
+        return JSSyntaxError
+    except NotImplementedError:
+        return NotImplementedError
+
+
+class TestNativeParser:
+    @pytest.mark.parametrize("path", CORPUS, ids=os.path.basename)
+    def test_corpus(self, path):
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            source = f.read()
+
+        assert outcome(native.parse, source) == outcome(antlr_parse, source)
+
+    @pytest.mark.parametrize("source", SOURCES)
+    def test_same_ast(self, source):
+        assert outcome(native.parse, source) == outcome(antlr_parse, source)
+
+    @pytest.mark.parametrize(
+        "source,position",
+        [("a + ;", (1, 4)), ("let = ;", (1, 6)), ("a\n b c", (2, 3)), ("[a", (1, 2))],
+    )
+    def test_syntax_error(self, source, position):
+        with pytest.raises(JSSyntaxError) as e:
+            native.parse(source)
+
+        assert (e.value.line, e.value.column) == position
+
+    def test_asi_retry_is_bounded(self):
+        # Every line terminator is an automatic semicolon candidate, none of them ends the statement
+        source = "a" + "\n+x" * 40 + "\n+"
+        start = time.perf_counter()
+        with pytest.raises(JSSyntaxError):
+            native.parse(source)
+
+        assert time.perf_counter() - start < 1
+        assert outcome(antlr_parse, source) is JSSyntaxError
+
+    @pytest.mark.parametrize(
+        "source,name",
+        [
+            ("if (a) b;", "IfStatement"),
+            ("a[b];", "MemberIndexExpression"),
+            ("(a + b) * c;", "ParenthesizedExpression"),
+            ("x => x;", "FunctionExpression"),
+            ("let {a} = b;", "ObjectLiteral"),
+            ("1n;", "Bigint literals"),
+        ],
+    )
+    def test_not_implemented(self, source, name):
+        with pytest.raises(NotImplementedError, match=name):
+            native.parse(source)
+
+    def test_empty(self):
+        program = native.parse("// nothing here\n")
+        assert program.body == []
+
+    def test_batch(self, tmp_path):
+        good = tmp_path / "good.js"
+        good.write_text("let a = 1;")
+        bad = tmp_path / "bad.js"
+        bad.write_text("let = ;")
+
+        results = {
+            os.path.basename(result.path): result
+            for result in parse_many([str(good), str(bad)], 1, backend="native")
+        }
+
+        assert results["good.js"].ok
+        assert estree.dumps(results["good.js"].value) == estree.dumps(
+            antlr_parse("let a = 1;")
+        )
+        assert results["bad.js"].error.startswith("JSSyntaxError: 1:6")
+
+
+class TestTokenizer:
+    def test_strict_mode(self):
+        source = "let; { 'use strict'; let; } let"
+        types = [token.type for token in tokenizer.tokenize(source)]
+
+        # Like in `JavaScriptBaseLexer`, closing the block doesn't turn strict mode off
+        assert types == [
+            tokenizer.IDENTIFIER,
+            ";",
+            "{",
+            tokenizer.STRING,
+            ";",
+            "let",
+            ";",
+            "}",
+            "let",
+            tokenizer.EOF,
+        ]
+
+    def test_newlines(self):
+        tokens = tokenizer.tokenize("a\nb /*\n*/ c \n d /* */\ne")
+        assert [(t.text, t.newline_before, t.after_newline) for t in tokens] == [
+            ("a", False, False),
+            ("b", True, True),
+            ("c", True, False),
+            ("d", True, False),
+            ("e", True, True),
+            ("<EOF>", False, False),
+        ]
+
+    def test_unterminated_string_is_linear(self):
+        # Every run of characters between the escapes could be split in two ways, if the pattern allowed it
+        source = "x = '" + "ab\\n" * 5000
+        start = time.perf_counter()
+        tokens = tokenizer.tokenize(source)
+
+        assert time.perf_counter() - start < 1
+        # The quote and the backslashes are unexpected characters, lexing goes on right after them
+        assert [t.text for t in tokens[:4]] == ["x", "=", "ab", "nab"]
+
+    def test_offsets(self):
+        tokens = tokenizer.tokenize("ab += 'c'")
+        assert [(t.start, t.stop) for t in tokens] == [(0, 1), (3, 4), (6, 8), (9, 8)]
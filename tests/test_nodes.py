@@ -0,0 +1,52 @@
+import pickle
+
+import pytest
+
+from jasminesnake.ast import nodes, to_ascii_tree
+
+LOC = nodes.SourceLocation(None, nodes.Position(1, 0), nodes.Position(1, 1))
+
+
+def node_classes():
+    return [
+        value
+        for value in vars(nodes).values()
+        if isinstance(value, type) and issubclass(value, nodes.Node)
+    ]
+
+
+class TestNodeSchema:
+    @pytest.mark.parametrize("cls", node_classes(), ids=lambda cls: cls.__name__)
+    def test_no_instance_dict(self, cls):
+        assert cls.__dictoffset__ == 0
+
+    def test_field_order(self):
+        program = nodes.Program(LOC, "script", [])
+        assert list(program.fields) == ["type", "loc", "sourceType", "body"]
+
+        literal = nodes.BigIntLiteral(LOC, 1, "1")
+        assert list(literal.fields) == ["type", "loc", "value", "bigint"]
+
+        cls = nodes.ClassExpression(LOC, None, None, nodes.ClassBody(LOC, []))
+        assert list(cls.fields) == ["type", "loc", "id", "superClass", "body"]
+
+        assert list(LOC.fields) == ["start", "end"]
+
+    def test_fields_view(self):
+        identifier = nodes.Identifier(LOC, "a")
+        fields = identifier.fields
+        assert fields["name"] == "a"
+        assert len(fields) == 3
+
+        identifier.name = "b"
+        assert fields["name"] == "b"
+
+        with pytest.raises(KeyError):
+            fields["value"]
+
+    def test_pickle(self):
+        expression = nodes.AddArithmeticExpression(
+            LOC, nodes.Identifier(LOC, "a"), nodes.NumericLiteral(LOC, 1.0)
+        )
+        copy = pickle.loads(pickle.dumps(expression))
+        assert to_ascii_tree(copy) == to_ascii_tree(expression)
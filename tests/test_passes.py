@@ -0,0 +1,106 @@
+import sys
+
+import pytest
+
+from jasminesnake.ast import from_parse_tree, nodes
+from jasminesnake.ast.passes import Pass, PassManager
+from jasminesnake.js_stream import JSStringStream
+
+
+def parse(source):
+    return from_parse_tree(JSStringStream(source).parse())
+
+
+class Names(Pass):
+    def begin(self, program):
+        self.names = []
+
+    def visit_Identifier(self, node):
+        self.names.append(node.name)
+
+
+class Operators(Pass):
+    name = "operators"
+
+    def begin(self, program):
+        self.events = []
+
+    def visit_BinaryExpression(self, node):
+        self.events.append(("visit", node.operator.value))
+
+    def leave_BinaryExpression(self, node):
+        self.events.append(("leave", node.operator.value))
+
+    def finish(self, program):
+        self.events.append(("finish", None))
+
+
+class Everything(Pass):
+    def __init__(self):
+        self.count = 0
+
+    def visit_Node(self, node):
+        self.count += 1
+
+
+class TestPassManager:
+    def test_fused_run_matches_separate_runs(self):
+        program = parse("let a = b + c * d;\nx = -a;\n")
+
+        names, operators = Names(), Operators()
+        manager = PassManager([names, operators])
+        manager.run(program)
+
+        alone = Names()
+        alone.begin(program)
+        alone.visit(program)
+        assert names.names == alone.names == ["a", "b", "c", "d", "x", "a"]
+        assert operators.events == [
+            ("visit", "+"),
+            ("visit", "*"),
+            ("leave", "*"),
+            ("leave", "+"),
+            ("finish", None),
+        ]
+
+    def test_dispatch_by_subscription(self):
+        class Recorder(Pass):
+            def begin(self, program):
+                self.types = set()
+
+            def visit_Literal(self, node):
+                self.types.add(type(node))
+
+        recorder = Recorder()
+        PassManager([recorder]).run(parse("a = 1 + b;"))
+        assert recorder.types == {nodes.NumericLiteral}
+
+    def test_timings(self):
+        program = parse("a + b;")
+        everything = Everything()
+        manager = PassManager([Names(), Operators(), everything])
+        manager.run(program)
+        manager.run(program)
+
+        assert list(manager.timings) == ["Names", "operators", "Everything"]
+        assert all(seconds > 0 for seconds in manager.timings.values())
+        assert everything.count == 2 * 6
+
+        with pytest.raises(ValueError):
+            manager.add(Names())
+
+    def test_untimed(self):
+        manager = PassManager([Everything()], timed=False)
+        manager.run(parse("a;"))
+        assert manager.passes[0].count == 4
+
+    def test_deep_nesting(self):
+        depth = sys.getrecursionlimit() * 2
+        node = nodes.Identifier(None, "a")
+        for _ in range(depth):
+            node = nodes.ArrayExpression(None, [node])
+        program = nodes.Program(None, "script", [nodes.ExpressionStatement(None, node)])
+
+        everything = Everything()
+        PassManager([everything]).run(program)
+        assert everything.count == depth + 3
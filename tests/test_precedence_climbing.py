@@ -0,0 +1,113 @@
+import pytest
+from antlr4 import CommonTokenStream
+from antlr4.atn.PredictionMode import PredictionMode
+from antlr4.error.ErrorListener import ErrorListener
+from antlr4.tree.Tree import TerminalNode
+
+from jasminesnake.char_streams import CompactInputStream
+from jasminesnake.js_stream import ParserSession
+from jasminesnake.lex.GrammarProfiler import profile_parser
+from jasminesnake.lex.JavaScriptLexer import JavaScriptLexer
+from jasminesnake.lex.JavaScriptParser import JavaScriptParser
+from jasminesnake.lex.PrecedenceClimbing import PrecedenceClimbingParser
+
+SOURCES = [
+    "a + b * c - d / e % f ** g ** h;",
+    "x = y += a ?? b || c && d | e ^ f & g;",
+    "a == b != c === d !== e < f > g <= h >= i << j >> k >>> l;",
+    "let v = a ? b ? c : d : e ? f : g;",
+    "-a ** b + !c * typeof d - void 0;",
+    "o.p + q[r] * s.t(u, w + 1) - -z;",
+    "f(a + b, c * d)[e - f].g = h;",
+    "x = function () { return a + b; } + 1;",
+    "y = (p, q) => p * q + 1;",
+    "new a + b;\nnew a.b(c) * d;",
+    "this + 1;\n'a'.length + 1;\n1 + 2n;",
+    "for (a in b) c;\nfor (var k in o) k + 1;\nif (a in b) {}",
+    "a\n+b\na\n-b\na\n++b",
+    "class A { x = a\n*gen() {} }",
+    "a + b c",
+    "a + ;",
+    "f(a +)",
+    "a ? b;",
+    "a ? b, c;",
+    "1 ** x ? ? }",
+    "a ? ? b",
+    "- ! ?",
+    "( a ? : ) let !",
+    "a ? ** => ? => 1 ]",
+    "let = ] ? ) \n *",
+    "x = function () { return a + ; } + b * c;",
+    "x = a in b )",
+    "for await += a in b )",
+]
+
+
+class CountingErrorListener(ErrorListener):
+    def __init__(self):
+        super().__init__()
+        self.errors = []
+
+    def syntaxError(self, recognizer, offendingSymbol, line, column, msg, e):
+        self.errors.append((line, column, msg))
+
+
+def parse(parser_class, source, mode):
+    lexer = JavaScriptLexer(CompactInputStream(source))
+    lexer.removeErrorListeners()
+    parser = parser_class(CommonTokenStream(lexer))
+    parser.removeErrorListeners()
+    listener = CountingErrorListener()
+    parser.addErrorListener(listener)
+    parser._interp.predictionMode = mode
+    return parser, parser.program(), listener.errors
+
+
+def dump(node, result):
+    if isinstance(node, TerminalNode):
+        result.append(node.symbol.tokenIndex)
+        return
+
+    result.append(
+        (
+            type(node).__name__,
+            node.invokingState,
+            node.start.tokenIndex,
+            node.stop.tokenIndex if node.stop is not None else None,
+            node.exception is not None,
+        )
+    )
+    for child in node.getChildren():
+        assert child.parentCtx is node
+        dump(child, result)
+    result.append(None)
+    return result
+
+
+class TestPrecedenceClimbing:
+    @pytest.mark.parametrize("mode", [PredictionMode.SLL, PredictionMode.LL])
+    @pytest.mark.parametrize("source", SOURCES)
+    def test_same_tree(self, source, mode):
+        _, expected, expected_errors = parse(JavaScriptParser, source, mode)
+        _, tree, errors = parse(PrecedenceClimbingParser, source, mode)
+        assert dump(tree, []) == dump(expected, [])
+        assert errors == expected_errors
+
+    def test_no_predictions_for_simple_operands(self):
+        lexer = JavaScriptLexer(CompactInputStream("a = b + c * 2;"))
+        parser = PrecedenceClimbingParser(CommonTokenStream(lexer))
+        profile = profile_parser(parser)
+        parser.program()
+
+        rules = {
+            profile.rule_name(info.decision)
+            for info in profile.decisions
+            if info.invocations
+        }
+        assert "singleExpression" not in rules
+
+    def test_session_parser(self):
+        session = ParserSession()
+        assert isinstance(session.parser, PrecedenceClimbingParser)
+        tree = session.parse_string("a + b;")
+        assert tree.toStringTree(recog=session.parser).count("+") == 1
@@ -0,0 +1,55 @@
+import pytest
+from antlr4 import InputStream
+
+from jasminesnake.ast import from_parse_tree, nodes
+from jasminesnake.js_stream import JSStringStream
+from jasminesnake.lex.JavaScriptLexer import JavaScriptLexer
+
+
+def lex(source):
+    lexer = JavaScriptLexer(InputStream(source))
+    return lexer, lexer.getAllTokens()
+
+
+class TestLexerPredicates:
+    @pytest.mark.parametrize(
+        "source, possible",
+        [
+            ("", True),
+            ("a", False),
+            ("(", True),
+            (")", False),
+            ("x++", False),
+            ("x=", True),
+        ],
+    )
+    def test_regex_possible(self, source, possible):
+        lexer = JavaScriptLexer(InputStream(source + "\n"))
+        while lexer.nextToken().type != JavaScriptLexer.LineTerminator:
+            pass
+        assert lexer.isRegexPossible() is possible
+
+    def test_strict_mode(self):
+        lexer, _ = lex('"use strict"; let a;')
+        assert lexer.isStrictMode()
+
+        lexer, _ = lex('a; "use strict";')
+        assert not lexer.isStrictMode()
+
+    def test_strict_mode_keywords(self):
+        _, tokens = lex('"use strict"; let a;')
+        assert JavaScriptLexer.StrictLet in [token.type for token in tokens]
+
+
+class TestParserPredicates:
+    def test_line_terminator_in_comment(self):
+        program = from_parse_tree(JSStringStream("a /*\n*/b").parse())
+        assert len(program.body) == 2
+
+    def test_no_line_terminator(self):
+        program = from_parse_tree(JSStringStream("a\nb\n++c;").parse())
+        assert [type(stmt.expression.expressions[0]) for stmt in program.body] == [
+            nodes.Identifier,
+            nodes.Identifier,
+            nodes.PreIncrementExpression,
+        ]
@@ -0,0 +1,160 @@
+import glob
+import os
+
+import pytest
+from antlr4 import CommonTokenStream, Token
+
+from jasminesnake.ast import from_parse_tree, to_ascii_tree
+from jasminesnake.char_streams import CompactInputStream, MappedFileStream
+from jasminesnake.js_stream import ParseMode, ParserSession
+from jasminesnake.lex.JavaScriptLexer import JavaScriptLexer
+from jasminesnake.lex.JavaScriptParser import JavaScriptParser
+from jasminesnake.lex.RegexLexer import RegexLexer
+
+BASE_PATH = os.path.dirname(os.path.abspath(__file__))
+CORPUS = sorted(glob.glob(os.path.join(BASE_PATH, "*", "t", "*.js")))
+
+SOURCES = [
+    "#!/usr/bin/env node\nlet a = 1;",
+    "  #!not a hashbang\n#!",
+    "a #! b",
+    "let; { 'use strict'; let; static; 017; } let; implements",
+    '"use strict"; 017; 0o17; 0b101n; 0x1F_n; 017n; 08; 1_000.5e+3; .5; 1.',
+    "let; 017; 00n; 0x; 0o8; 1e; 1.5n",
+    "a\r\nb\rc d e\n\tf",
+    "/* multi\nline */ // single\n<!-- html\ncomment --> <![CDATA[ data\n]]> x",
+    "/* unterminated",
+    "'unterminated\n\"also\\",
+    r"'esc\'aped' \"escA\u{1F600}\x41\0\
+continued\" '\1'",
+    "a >>>= b >>> c >>= d >> e <<= f << g ** h **= i ?? j => k ... l",
+    "x / y /= z",
+    "ünïcode = über̀ + a\\u0062c + xé + \\x",
+    "a @ b ` c \\",
+    "a\xa0b c",
+    "",
+]
+
+
+def tokens(lexer):
+    result = []
+    while True:
+        token = lexer.nextToken()
+        result.append(
+            (
+                token.type,
+                token.channel,
+                token.start,
+                token.stop,
+                token.line,
+                token.column,
+                token.text,
+            )
+        )
+        if token.type == Token.EOF:
+            return result
+
+
+def generated_tokens(source, strict=False):
+    lexer = JavaScriptLexer(CompactInputStream(source))
+    lexer.removeErrorListeners()
+    lexer.setUseStrictDefault(strict)
+    return tokens(lexer)
+
+
+def regex_tokens(source, strict=False):
+    lexer = RegexLexer(CompactInputStream(source))
+    lexer.setUseStrictDefault(strict)
+    return tokens(lexer)
+
+
+class TestRegexLexer:
+    @pytest.mark.parametrize("path", CORPUS, ids=os.path.basename)
+    def test_corpus(self, path):
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            source = f.read()
+
+        assert regex_tokens(source) == generated_tokens(source)
+
+    @pytest.mark.parametrize("strict", [False, True])
+    @pytest.mark.parametrize("source", SOURCES)
+    def test_same_tokens(self, source, strict):
+        assert regex_tokens(source, strict) == generated_tokens(source, strict)
+
+    @pytest.mark.parametrize(
+        "source", [source for source in SOURCES if source.isascii()]
+    )
+    def test_mapped_file_stream(self, tmp_path, source):
+        path = tmp_path / "a.js"
+        path.write_bytes(source.encode())
+
+        stream = MappedFileStream(str(path))
+        lexer = RegexLexer(stream)
+        assert tokens(lexer) == generated_tokens(source)
+        assert lexer.getSourceName() == str(path)
+
+    def test_matches_buffer_in_place(self, tmp_path):
+        path = tmp_path / "a.js"
+        path.write_text("let a = 'b';")
+
+        stream = MappedFileStream(str(path))
+        lexer = RegexLexer(stream)
+        assert lexer._buffer is stream.buffer
+        assert not isinstance(lexer._buffer, str)
+
+        token = lexer.nextToken()
+        assert token._text is None
+        assert token.text == "let"
+
+    def test_reset(self):
+        lexer = RegexLexer(CompactInputStream("'use strict'; let"))
+        first = tokens(lexer)
+
+        lexer.inputStream = CompactInputStream("'use strict'; let")
+        assert tokens(lexer) == first
+
+        lexer.inputStream = CompactInputStream("let")
+        assert tokens(lexer)[0][0] == JavaScriptLexer.NonStrictLet
+
+    def test_parser(self):
+        source = "let a = [1, , ...b];\nc = a\n++b"
+        trees = []
+        for lexer in (
+            JavaScriptLexer(CompactInputStream(source)),
+            RegexLexer(CompactInputStream(source)),
+        ):
+            parser = JavaScriptParser(CommonTokenStream(lexer))
+            trees.append(parser.program().toStringTree(recog=parser))
+
+        assert trees[0] == trees[1]
+
+
+class TestParserSession:
+    @pytest.mark.parametrize("mode", list(ParseMode))
+    def test_same_ast(self, mode):
+        source = "let a = [1, 2, ...b], c;\n{ var d = a + c * 2; }\na += -c++ ** 2 >= --d;"
+        expected = from_parse_tree(ParserSession().parse_string(source, mode))
+
+        session = ParserSession(regex_lexer=True)
+        assert isinstance(session.lexer, RegexLexer)
+        assert to_ascii_tree(
+            from_parse_tree(session.parse_string(source, mode))
+        ) == to_ascii_tree(expected)
+
+    def test_iter_statements(self):
+        source = "a = 1;\nb = a\n++c;"
+        expected = ParserSession().parse_string(source)
+        statements = list(
+            ParserSession(regex_lexer=True).iter_statements(
+                CompactInputStream(source)
+            )
+        )
+
+        assert [to_ascii_tree(s) for s in statements] == [
+            to_ascii_tree(s) for s in from_parse_tree(expected).body
+        ]
+
+    def test_syntax_errors(self):
+        session = ParserSession(regex_lexer=True)
+        assert not session.check(CompactInputStream("let = @;"))
+        assert session.check(CompactInputStream("let a = 1;"))
@@ -0,0 +1,133 @@
+import sys
+
+from jasminesnake.ast import from_parse_tree, nodes
+from jasminesnake.ast.visitor import (
+    SKIP,
+    NodeTransformer,
+    NodeVisitor,
+    child_fields,
+    iter_child_nodes,
+    walk,
+)
+from jasminesnake.js_stream import JSStringStream
+
+
+def parse(source):
+    return from_parse_tree(JSStringStream(source).parse())
+
+
+class Recorder(NodeVisitor):
+    def __init__(self):
+        self.events = []
+
+    def visit_Node(self, node):
+        self.events.append(("visit", type(node).__name__))
+
+    def leave_BinaryExpression(self, node):
+        self.events.append(("leave", node.operator.value))
+
+    def visit_ArrayExpression(self, node):
+        self.events.append(("visit", "array"))
+        return SKIP
+
+
+class TestChildFields:
+    def test_skips_metadata_and_scalars(self):
+        assert child_fields(nodes.Program) == ("body",)
+        assert child_fields(nodes.Identifier) == ()
+        assert child_fields(nodes.AddArithmeticExpression) == ("left", "right")
+        assert child_fields(nodes.MemberExpression) == ("object", "property")
+        assert child_fields(nodes.VariableDeclarator) == ("id", "init")
+        assert child_fields(nodes.Property) == ("key", "value")
+
+    def test_walk(self):
+        program = parse("let a = [b, -c];")
+        assert [type(node).__name__ for node in walk(program)] == [
+            "Program",
+            "VariableDeclaration",
+            "VariableDeclarator",
+            "Identifier",
+            "ArrayExpression",
+            "Identifier",
+            "UnaryMinusExpression",
+            "Identifier",
+        ]
+        assert list(iter_child_nodes(program)) == program.body
+
+
+class TestNodeVisitor:
+    def test_order_and_dispatch(self):
+        recorder = Recorder()
+        recorder.visit(parse("a + b * c; [d + e];"))
+        assert recorder.events == [
+            ("visit", "Program"),
+            ("visit", "ExpressionStatement"),
+            ("visit", "SequenceExpression"),
+            ("visit", "AddArithmeticExpression"),
+            ("visit", "Identifier"),
+            ("visit", "MulArithmeticExpression"),
+            ("visit", "Identifier"),
+            ("visit", "Identifier"),
+            ("leave", "*"),
+            ("leave", "+"),
+            ("visit", "ExpressionStatement"),
+            ("visit", "SequenceExpression"),
+            ("visit", "array"),
+        ]
+
+    def test_deep_nesting(self):
+        depth = sys.getrecursionlimit() * 2
+        node = nodes.Identifier(None, "a")
+        for _ in range(depth):
+            node = nodes.ArrayExpression(None, [node])
+
+        class Counter(NodeVisitor):
+            count = 0
+
+            def leave_ArrayExpression(self, node):
+                self.count += 1
+
+        counter = Counter()
+        counter.visit(node)
+        assert counter.count == depth
+
+
+class TestNodeTransformer:
+    def test_replace_and_remove(self):
+        class Transformer(NodeTransformer):
+            def visit_Identifier(self, node):
+                return nodes.Identifier(node.loc, node.name.upper())
+
+            def visit_EmptyStatement(self, node):
+                return None
+
+            def leave_UnaryMinusExpression(self, node):
+                return node.argument
+
+            def visit_ArrayExpression(self, node):
+                return nodes.SequenceExpression(node.loc, node.elements)
+
+        program = parse("x = -a;\n;\nlet y = [b, c];")
+        assert Transformer().visit(program) is program
+        assert len(program.body) == 2
+
+        assignment = program.body[0].expression.expressions[0]
+        assert (assignment.left.name, assignment.right.name) == ("X", "A")
+
+        declarator = program.body[1].declarations[0]
+        assert declarator.id.name == "Y"
+        assert type(declarator.init) is nodes.SequenceExpression
+        assert [node.name for node in declarator.init.expressions] == ["B", "C"]
+
+    def test_splice(self):
+        class Duplicate(NodeTransformer):
+            def leave_ExpressionStatement(self, node):
+                return [node, nodes.EmptyStatement(None)]
+
+        program = Duplicate().visit(parse("a; b;"))
+        assert [type(node).__name__ for node in program.body] == [
+            "ExpressionStatement",
+            "EmptyStatement",
+            "ExpressionStatement",
+            "EmptyStatement",
+        ]